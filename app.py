@@ -3,20 +3,37 @@ Streamlit front-end for the Cost-Utility Calculator.
 """
 
 import json
-from pathlib import Path
+import os
+import time
+import uuid
+from concurrent.futures import wait
 
 import streamlit as st
-from cucal.curves import get_curves
-from cucal.optimizer import optimise_budget
+from cucal.background import BackgroundSolver, coarse_granularity, result_or_none
+from cucal.curves import get_curves, load_curves
 from cucal.hardware import load_hardware, calculate_energy, co2_equivalent
 from cucal.config import DEFAULT_CLUSTER_EFF
+from cucal.cost_utils import as_per_instance, inst_per_hour
 
 # -----------------------------  Layout & title  ----------------------------#
 st.set_page_config(page_title="Cost-Utility Calculator", page_icon="🚀")
 st.title("Cost-Utility Calculator 🚀")
 
+
+# ---------------------------  Cached resources  ---------------------------#
+# curves / hardware are served from memory by cucal.data and reloaded when
+# their files change, so they are not wrapped in st.cache_data (which would
+# pin the first version for the lifetime of the server).
+
+
+@st.cache_resource
+def _solver() -> BackgroundSolver:
+    """One worker pool + plan cache shared by every session on this server."""
+    return BackgroundSolver(max_workers=min(4, os.cpu_count() or 1))
+
+
 # -------------------------  Case-study selection  -------------------------#
-META = json.loads((Path("data") / "curves.json").read_text())
+META = load_curves()
 BASES = sorted({k.rsplit("-", 1)[0] for k in META})
 task = st.selectbox("Choose case study", BASES)
 
@@ -31,9 +48,17 @@ c1, c2, c3, c4 = st.columns(4)
 
 with c1:
     label_cost_hour = st.number_input("Labels $/h", min_value=0.0, value=8.0)
-    gamma = st.slider("γ (instances / hour)", 1, 30, 20)
+    # default γ comes from data/unit_conversions.csv, same as the CLI
+    # (it used to be a fixed 20/h for every case)
+    gamma = st.slider(
+        "γ (instances / hour)", 1, 30,
+        min(max(int(round(inst_per_hour(task))), 1), 30),
+        help="Annotation throughput. Defaults to the case's rate in "
+             "data/unit_conversions.csv (5/h when it has no row), "
+             "not the former fixed 20/h.",
+    )
     # Convert to per-instance cost for the optimiser
-    label_cost_instance = label_cost_hour / gamma if gamma > 0 else 0.0
+    label_cost_instance = as_per_instance(label_cost_hour, gamma)
 
 with c2:
     gpu_cost = st.number_input("GPU $/h", 0.10, value=3.00, step=0.10)
@@ -74,9 +99,11 @@ with col6:
     )
 
 # ---------------------------  Run optimisation  ---------------------------#
+# Runs off the script thread: a coarse grid answers at once, the full grid
+# refines it.  A rerun (any widget change) supersedes this session's jobs.
 curve_lbl, curve_gpu = get_curves(task)
 
-res = optimise_budget(
+params = dict(
     label_cost=label_cost_instance,
     gpu_cost=gpu_cost,
     budget=budget,
@@ -89,36 +116,35 @@ res = optimise_budget(
     cluster_efficiency_pct=efficiency_pct,
     target_accuracy=target_acc,
 )
-
-# ---------------------------  Display results  ----------------------------#
-if res is None:
-    st.warning("⚠️  No feasible allocation. Increase budget or relax caps.")
-    st.stop()
-
-# --- define values from the result dict ---
-mean = res["accuracy"]
-lo, hi = res["accuracy_ci"]
-label_hours = (res["labels"] / gamma) if gamma > 0 else 0.0
-
-# If user set a target, tell them whether we reach it (UI-only)
-if target_acc is not None:
-    if mean < target_acc:
-        st.warning(
-            f"⚠️  With budget ${budget:.0f}, best achievable accuracy is "
-            f"{mean:.3f}, below the target {target_acc:.3f}."
-        )
-    else:
-        st.success(f"Target {target_acc:.3f} is achievable (best ≈ {mean:.3f}).")
-
-st.metric(
-    "Expected accuracy",
-    f"{mean:.3f}",
-    help=f"95 % CI: {lo:.3f} – {hi:.3f}",
+owner = st.session_state.setdefault("solver_owner", uuid.uuid4().hex)
+coarse_job, fine_job = _solver().submit(
+    owner, params, (coarse_granularity(budget), 1)
 )
 
 
-st.markdown(
-    f"""
+def _render_plan(res: dict, preliminary: bool = False) -> None:
+    mean = res["accuracy"]
+    lo, hi = res["accuracy_ci"]
+    label_hours = (res["labels"] / gamma) if gamma > 0 else 0.0
+
+    # If user set a target, tell them whether we reach it (UI-only)
+    if target_acc is not None and not preliminary:
+        if mean < target_acc:
+            st.warning(
+                f"⚠️  With budget ${budget:.0f}, best achievable accuracy is "
+                f"{mean:.3f}, below the target {target_acc:.3f}."
+            )
+        else:
+            st.success(f"Target {target_acc:.3f} is achievable (best ≈ {mean:.3f}).")
+
+    st.metric(
+        "Expected accuracy" + (" (coarse grid, refining…)" if preliminary else ""),
+        f"{mean:.3f}",
+        help=f"95 % CI: {lo:.3f} – {hi:.3f}",
+    )
+
+    st.markdown(
+        f"""
 <div style='background:#1e1e1e;padding:1em;border-radius:8px;'>
 <ul style='list-style-type:none;padding-left:0;color:#ddd;font-size:0.95em;'>
 
@@ -133,12 +159,41 @@ st.markdown(
 </ul>
 </div>
 """,
-    unsafe_allow_html=True,
-)
+        unsafe_allow_html=True,
+    )
+
+
+# ---------------------------  Display results  ----------------------------#
+result_slot = st.empty()
+if not wait([fine_job], timeout=0.2).done:
+    status = st.empty()
+    started = time.monotonic()
+    preview_shown = False
+    while not fine_job.done():
+        # the coarse job has its own pool, but poll it too: never block here
+        if not preview_shown and coarse_job.done():
+            coarse = result_or_none(coarse_job)
+            if coarse is not None:
+                with result_slot.container():
+                    _render_plan(coarse, preliminary=True)
+            preview_shown = True
+        # touching an element lets Streamlit interrupt us on the next rerun
+        stage = "Refining on the full grid" if preview_shown else "Searching"
+        status.caption(f"⏳ {stage}… {time.monotonic() - started:.0f}s")
+        time.sleep(0.25)
+    status.empty()
+
+res = result_or_none(fine_job)
+if res is None:
+    result_slot.warning("⚠️  No feasible allocation. Increase budget or relax caps.")
+    st.stop()
+
+with result_slot.container():
+    _render_plan(res)
 
 st.download_button(
     "📋 Copy plan as JSON",
-    data=json.dumps(res, indent=2),
+    data=json.dumps(res.as_dict(), indent=2),
     file_name=f"{task.lower()}_plan.json",
     mime="application/json",
 )
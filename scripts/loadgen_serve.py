@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Load generator for ``python -m cucal.serve``.
+
+Usage:
+    python -m cucal.serve --port 8765 &
+    python scripts/loadgen_serve.py --port 8765 --concurrency 64 --duration 10
+
+Each virtual client keeps one keep-alive connection open and fires
+``/optimise`` requests back-to-back.  ``--distinct`` controls how many
+different budgets are drawn (fewer → more coalescing).  Prints throughput
+and latency percentiles.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+async def _client(host, port, deadline, make_body, latencies, errors) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            body = json.dumps(make_body()).encode()
+            t0 = time.perf_counter()
+            writer.write(
+                b"POST /optimise HTTP/1.1\r\nHost: loadgen\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            if status == 200:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def _run(args) -> None:
+    rng = random.Random(args.seed)
+    budgets = [rng.randint(args.min_budget, args.max_budget) for _ in range(args.distinct)]
+
+    def make_body():
+        return {
+            "case": args.case,
+            "label_cost": args.label_cost,
+            "gpu_cost": args.gpu_cost,
+            "budget": rng.choice(budgets),
+            "granularity": args.granularity,
+        }
+
+    latencies: list[float] = []
+    errors: dict[int, int] = {}
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*[
+        _client(args.host, args.port, deadline, make_body, latencies, errors)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return 1000 * latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    print(f"requests ok   : {len(latencies)}  errors: {errors or 0}")
+    print(f"throughput    : {len(latencies) / elapsed:,.1f} req/s")
+    if latencies:
+        print(f"latency (ms)  : p50 {pct(0.50):.1f}  p90 {pct(0.90):.1f}  "
+              f"p99 {pct(0.99):.1f}  max {1000 * latencies[-1]:.1f}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--concurrency", type=int, default=32, help="Open connections")
+    p.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    p.add_argument("--case", default="Dragut-2019")
+    p.add_argument("--label-cost", type=float, default=0.02)
+    p.add_argument("--gpu-cost", type=float, default=1.4)
+    p.add_argument("--min-budget", type=int, default=100)
+    p.add_argument("--max-budget", type=int, default=1500)
+    p.add_argument("--distinct", type=int, default=200, help="Distinct budgets")
+    p.add_argument("--granularity", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+    asyncio.run(_run(p.parse_args(argv)))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
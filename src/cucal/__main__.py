@@ -6,6 +6,7 @@ import argparse
 from cucal.optimizer import optimise_budget
 from cucal.curves import get_curves
 from cucal.config import DEFAULT_CLUSTER_EFF
+from cucal.cost_utils import as_per_instance, inst_per_hour
 
 
 def main() -> None:
@@ -15,23 +16,37 @@ def main() -> None:
     ap.add_argument("--eff", type=float, default=100 * DEFAULT_CLUSTER_EFF,
                     help="Cluster efficiency (percent, default 90)")
     ap.add_argument("--gpu_cap", type=float, help="Max GPU-h")
-    ap.add_argument("--label_cost", type=float, default=0.1)
+    ap.add_argument("--label_cost", type=float, default=0.1, help="$ per instance")
+    ap.add_argument("--label_cost_hour", type=float,
+                    help="Annotator $/h (overrides --label_cost, converted with γ)")
+    ap.add_argument("--gamma", type=float,
+                    help="Instances/hour (default: unit_conversions.csv for the case)")
     ap.add_argument("--gpu_cost", type=float, default=3.0)
     ap.add_argument("case", help="Case-study name, e.g. Dragut2019")
     args = ap.parse_args()
+    if args.gamma is not None and args.gamma <= 0:
+        ap.error("--gamma must be > 0")
+
+    gamma = args.gamma if args.gamma is not None else inst_per_hour(args.case)
+    label_cost = (
+        as_per_instance(args.label_cost_hour, gamma)
+        if args.label_cost_hour is not None
+        else args.label_cost
+    )
 
     curve_lbl, curve_gpu = get_curves(args.case)
     plan = optimise_budget(
-        label_cost=args.label_cost,
+        label_cost=label_cost,
         gpu_cost=args.gpu_cost,
         budget=args.budget,
         curve_label=curve_lbl,
         curve_gpu=curve_gpu,
+        gamma=gamma,
         max_gpu_hours=args.gpu_cap,
         wall_clock_limit_hours=args.time,
         cluster_efficiency_pct=args.eff,
     )
-    print(plan if plan else "No feasible plan.")
+    print(plan.as_dict() if plan else "No feasible plan.")
 
 
 if __name__ == "__main__":
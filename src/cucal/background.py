@@ -0,0 +1,174 @@
+"""
+Background execution of :func:`cucal.optimizer.optimise_budget`.
+
+Used by the Streamlit front-end so widget changes never block on a long
+grid search:
+
+* jobs run on shared thread pools, off the UI thread; coarse preview jobs
+  have a small pool of their own, so they are never queued behind other
+  sessions' full-grid searches;
+* every *owner* (e.g. one browser session) has one live generation of
+  jobs — submitting again releases the previous one, and a job nobody is
+  watching any more is cancelled cooperatively;
+* identical queries from different owners share one in-flight job, and
+  finished plans are kept in a bounded LRU cache.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+from .optimizer import OptimisationCancelled, optimise_budget
+
+__all__ = ["BackgroundSolver", "coarse_granularity", "result_or_none"]
+
+
+def coarse_granularity(budget: float, granularity: int = 1, steps: int = 50) -> int:
+    """Step size giving roughly *steps* grid points per axis (never finer)."""
+    return max(int(granularity), int(budget) // steps, 1)
+
+
+@dataclass(slots=True)
+class _Job:
+    future: Future
+    cancel: threading.Event = field(default_factory=threading.Event)
+    watchers: set = field(default_factory=set)
+
+
+class BackgroundSolver:
+    """Thread-pool runner for ``optimise_budget`` with sharing and cancellation."""
+
+    def __init__(
+        self, max_workers: int = 4, max_results: int = 512, preview_workers: int = 2
+    ) -> None:
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="cucal-opt")
+        self._preview_pool = ThreadPoolExecutor(preview_workers,
+                                                thread_name_prefix="cucal-preview")
+        self._lock = threading.RLock()   # done-callbacks may fire in-line
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._jobs: Dict[str, _Job] = {}
+        self._owned: Dict[Hashable, List[str]] = {}
+        self._max_results = max_results
+
+    # ------------------------------------------------------------------ API
+    def submit(
+        self,
+        owner: Hashable,
+        params: Dict[str, Any],
+        granularities: Sequence[int] = (1,),
+    ) -> List[Future]:
+        """
+        Start one ``optimise_budget(**params, granularity=g)`` per entry of
+        *granularities* (coarse first) and return their futures.  All but
+        the last (finest) entry run on the preview pool.
+
+        Jobs from *owner*'s previous call that are not requested again are
+        released (and cancelled when nobody else watches them).
+        """
+        keys = [self._key(params, g) for g in granularities]
+        last = len(keys) - 1
+        with self._lock:
+            futures = [
+                self._future_locked(owner, key, params, g,
+                                    self._pool if i == last else self._preview_pool)
+                for i, (key, g) in enumerate(zip(keys, granularities))
+            ]
+            stale = [k for k in self._owned.get(owner, ()) if k not in keys]
+            self._owned[owner] = keys
+            self._release_locked(owner, stale)
+            self._forget_idle_locked(owner)
+            return futures
+
+    def release(self, owner: Hashable) -> None:
+        """Drop *owner*'s interest in its jobs (e.g. when a session ends)."""
+        with self._lock:
+            self._release_locked(owner, self._owned.pop(owner, ()))
+
+    @property
+    def active_owners(self) -> int:
+        """Owners that still have unfinished jobs."""
+        with self._lock:
+            return len(self._owned)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._preview_pool.shutdown(wait=False, cancel_futures=True)
+
+    # -------------------------------------------------------------- helpers
+    @staticmethod
+    def _key(params: Dict[str, Any], granularity: int) -> str:
+        return json.dumps({**params, "granularity": granularity}, sort_keys=True,
+                          default=str)
+
+    def _future_locked(
+        self,
+        owner: Hashable,
+        key: str,
+        params: Dict[str, Any],
+        granularity: int,
+        pool: ThreadPoolExecutor,
+    ) -> Future:
+        if key in self._results:
+            self._results.move_to_end(key)
+            done: Future = Future()
+            done.set_result(self._results[key])
+            return done
+
+        job = self._jobs.get(key)
+        if job is None or job.cancel.is_set():
+            cancel = threading.Event()
+            future = pool.submit(
+                optimise_budget,
+                **params,
+                granularity=granularity,
+                should_stop=cancel.is_set,
+            )
+            job = _Job(future=future, cancel=cancel)
+            self._jobs[key] = job
+            future.add_done_callback(lambda f, k=key: self._finish(k, f))
+        job.watchers.add(owner)
+        return job.future
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.future is future:
+                del self._jobs[key]
+                for owner in job.watchers:
+                    self._forget_idle_locked(owner)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._results[key] = future.result()
+            self._results.move_to_end(key)
+            while len(self._results) > self._max_results:
+                self._results.popitem(last=False)
+
+    def _forget_idle_locked(self, owner: Hashable) -> None:
+        """Drop *owner*'s entry once none of its jobs is still running."""
+        if not any(key in self._jobs for key in self._owned.get(owner, ())):
+            self._owned.pop(owner, None)
+
+    def _release_locked(self, owner: Hashable, keys: Sequence[str]) -> None:
+        for key in keys:
+            job = self._jobs.get(key)
+            if job is None:
+                continue
+            job.watchers.discard(owner)
+            if not job.watchers:
+                job.cancel.set()
+                job.future.cancel()      # no-op once running
+
+
+def result_or_none(future: Future, timeout: Optional[float] = None) -> Any:
+    """``future.result()`` that maps cancellation to ``None``."""
+    try:
+        return future.result(timeout)
+    except (OptimisationCancelled, CancelledError):
+        return None
@@ -1,26 +1,190 @@
 # src/cucal/cost_utils.py
+"""
+Unit conversions between per-unit and hourly costs.
 
-from typing import Union
+Per-paper conversion factors live in ``data/unit_conversions.csv``::
+
+    paper,unit_original,conv_to_hour,notes
+    Dragut2019,instance,0.2,"Assumes 5 instances/hour"
+
+``conv_to_hour`` is the number of hours one ``unit_original`` takes, so
+``$/unit ÷ conv_to_hour = $/hour``.  Every helper accepts scalars *or*
+arrays, so whole cost columns are converted in one NumPy operation.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import re
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .data import DATA_DIR, watch
 
 __all__ = [
+    "DEFAULT_INST_PER_HOUR",
+    "ConversionTable",
     "as_hourly",
+    "as_per_instance",
+    "load_conversions",
+    "inst_per_hour",
+    "to_hourly",
+    "to_per_unit",
 ]
 
+ArrayLike = Union[int, float, Sequence[float], np.ndarray]
+
+# Throughput γ (instances / hour) used when a paper has no entry.
+DEFAULT_INST_PER_HOUR: int = 5
+
+_CONVERSIONS_PATH = DATA_DIR / "unit_conversions.csv"
+
+
+def _paper_key(name: str) -> str:
+    """'Dragut-2019' / 'dragut2019' / 'Dragut 2019' → 'dragut2019'."""
+    return re.sub(r"[^0-9a-z]", "", str(name).lower())
+
+
+def _scalar_or_array(values: np.ndarray, *inputs) -> Union[float, np.ndarray]:
+    """Return a plain float when every input was a scalar."""
+    if all(np.ndim(v) == 0 for v in inputs):
+        return float(values)
+    return values
+
+
+# ---------------------------------------------------------------------------#
+# Conversion table                                                           #
+# ---------------------------------------------------------------------------#
+@dataclass(frozen=True, slots=True)
+class ConversionTable:
+    """Hours-per-unit factors keyed by (normalised paper name, unit)."""
+    factors: Dict[Tuple[str, str], float]
+    notes: Dict[Tuple[str, str], str]
+
+    def hours_per_unit(
+        self,
+        papers: Union[str, Sequence[str], np.ndarray],
+        unit: str = "instance",
+        default: Optional[float] = 1.0 / DEFAULT_INST_PER_HOUR,
+    ) -> Union[float, np.ndarray]:
+        """
+        Look up ``conv_to_hour`` for one paper or a whole column of papers.
+
+        Each distinct paper is resolved once; the factors are then broadcast
+        back with a single fancy-indexing step.  Unknown papers get
+        *default* (with a ``UserWarning``), or raise ``KeyError`` when
+        *default* is ``None``.
+        """
+        if isinstance(papers, str):
+            return float(self._lookup(papers, unit, default))
+        uniq, inverse = np.unique(np.asarray(papers, dtype=str), return_inverse=True)
+        lut = np.array([self._lookup(p, unit, default) for p in uniq], dtype=float)
+        return lut[inverse]
+
+    def _lookup(self, paper: str, unit: str, default: Optional[float]) -> float:
+        try:
+            return self.factors[(_paper_key(paper), unit)]
+        except KeyError:
+            message = f"No '{unit}' conversion for paper '{paper}' in unit_conversions.csv"
+            if default is None:
+                raise KeyError(message) from None
+            warnings.warn(f"{message}; assuming {default:g} h per {unit}", stacklevel=4)
+            return default
+
+
+def _parse_conversions(raw: bytes) -> ConversionTable:
+    factors: Dict[Tuple[str, str], float] = {}
+    notes: Dict[Tuple[str, str], str] = {}
+    for row in csv.DictReader(io.StringIO(raw.decode("utf-8"), newline="")):
+        key = (_paper_key(row["paper"]), row["unit_original"].strip())
+        factors[key] = float(row["conv_to_hour"])
+        notes[key] = row.get("notes", "") or ""
+    return ConversionTable(factors=factors, notes=notes)
 
-def as_hourly(cost: Union[int, float], inst_per_hour: int = 5) -> float:
+
+_CONVERSIONS = watch(_CONVERSIONS_PATH, _parse_conversions, name="conversions")
+
+
+def load_conversions(path: Optional[Path] = None) -> ConversionTable:
+    """Parse ``unit_conversions.csv`` once; reparsed only when the file changes."""
+    if path is None:
+        return _CONVERSIONS.get()
+    return watch(path, _parse_conversions).get()
+
+
+# ---------------------------------------------------------------------------#
+# Converters                                                                 #
+# ---------------------------------------------------------------------------#
+def as_hourly(
+    cost: ArrayLike, inst_per_hour: ArrayLike = DEFAULT_INST_PER_HOUR
+) -> Union[float, np.ndarray]:
     """Convert a *per‑instance* cost into an hourly cost.
 
     Parameters
     ----------
-    cost : float | int
+    cost : float | array-like
         Dollar cost for a **single** instance.
-    inst_per_hour : int, default 5
+    inst_per_hour : float | array-like, default 5
         Throughput γ (instances processed per hour).
 
     Returns
     -------
-    float
-        Equivalent $/hour.
+    float | numpy.ndarray
+        Equivalent $/hour (an array when any input is an array).
+    """
+
+    out = np.asarray(cost, dtype=float) * np.asarray(inst_per_hour, dtype=float)
+    return _scalar_or_array(out, cost, inst_per_hour)
+
+
+def as_per_instance(
+    hourly_cost: ArrayLike, inst_per_hour: ArrayLike = DEFAULT_INST_PER_HOUR
+) -> Union[float, np.ndarray]:
+    """Inverse of :func:`as_hourly`: $/hour → $/instance (0 when γ ≤ 0)."""
+    cost = np.asarray(hourly_cost, dtype=float)
+    gamma = np.asarray(inst_per_hour, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(gamma > 0, cost / np.where(gamma > 0, gamma, 1.0), 0.0)
+    return _scalar_or_array(out, hourly_cost, inst_per_hour)
+
+
+def inst_per_hour(paper: str, default: float = DEFAULT_INST_PER_HOUR) -> float:
+    """
+    Throughput γ recorded for *paper* (instances / hour); papers without a
+    row get *default* and a ``UserWarning``.
     """
+    hours = load_conversions().hours_per_unit(paper, "instance", default=1.0 / default)
+    return 1.0 / hours
+
+
+def to_hourly(
+    costs: ArrayLike,
+    papers: Union[str, Sequence[str], np.ndarray],
+    unit: str = "instance",
+) -> Union[float, np.ndarray]:
+    """
+    Convert $/``unit`` costs into $/hour using each row's paper factor.
+
+    ``papers`` may be a single name (applied to every cost) or a column
+    aligned with ``costs``.  Raises ``KeyError`` for a paper without a
+    conversion row.
+    """
+    hours = load_conversions().hours_per_unit(papers, unit, default=None)
+    out = np.asarray(costs, dtype=float) / hours
+    return _scalar_or_array(out, costs, hours)
+
 
-    return float(cost) * inst_per_hour
+def to_per_unit(
+    hourly_costs: ArrayLike,
+    papers: Union[str, Sequence[str], np.ndarray],
+    unit: str = "instance",
+) -> Union[float, np.ndarray]:
+    """Inverse of :func:`to_hourly`: $/hour → $/``unit`` per paper."""
+    hours = load_conversions().hours_per_unit(papers, unit, default=None)
+    out = np.asarray(hourly_costs, dtype=float) * hours
+    return _scalar_or_array(out, hourly_costs, hours)
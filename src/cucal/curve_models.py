@@ -0,0 +1,274 @@
+"""
+Curve-model registry.
+
+Every curve dict (``curve_label`` / ``curve_gpu``, as stored in
+``data/curves.json``) may carry a ``"model"`` key naming how to evaluate
+it; without one it is the optimiser's historical ``saturating_exp``.
+
+========================  ============================================
+``saturating_exp``        a · (1 − e^(−b·x))          params ``a``, ``b``
+``log1p``                 a · log1p(b·x)              params ``a``, ``b``
+``piecewise_linear``      linear between measured     ``x``, ``y`` lists
+                          points, flat outside
+``pchip``                 monotone cubic (PCHIP)      ``x``, ``y`` lists
+                          through measured points,
+                          flat outside
+========================  ============================================
+
+All models evaluate NumPy arrays in one call and provide ``inverse``
+(units needed for an accuracy; ``inf`` when unreachable) and
+``derivative``.  Empirical models are monotone: ``piecewise_linear`` looks
+values up by binary search (O(log n)); ``pchip`` is tabulated once on a
+uniform grid and then answered by O(1) index arithmetic.
+
+New families can be added with :func:`register_model`.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, Mapping, Type
+
+import json
+import numpy as np
+
+__all__ = [
+    "CurveModel",
+    "SaturatingExp",
+    "Log1p",
+    "PiecewiseLinear",
+    "PchipTable",
+    "register_model",
+    "model_names",
+    "curve_model",
+    "DEFAULT_MODEL",
+]
+
+DEFAULT_MODEL = "saturating_exp"
+
+_REGISTRY: Dict[str, Type["CurveModel"]] = {}
+
+
+def register_model(name: str) -> Callable[[Type["CurveModel"]], Type["CurveModel"]]:
+    """Class decorator adding a model family under *name*."""
+    def deco(cls: Type["CurveModel"]) -> Type["CurveModel"]:
+        cls.name = name
+        _REGISTRY[name] = cls
+        return cls
+    return deco
+
+
+def model_names() -> tuple:
+    return tuple(_REGISTRY)
+
+
+class CurveModel(ABC):
+    """Interface of a curve family; instances are immutable."""
+    __slots__ = ()
+    name = ""
+    required: tuple = ()
+
+    @classmethod
+    @abstractmethod
+    def from_curve(cls, curve: Mapping) -> "CurveModel":
+        """Build the model from a curve dict holding the ``required`` keys."""
+
+    @abstractmethod
+    def evaluate(self, x):
+        """Accuracy at *x* units."""
+
+    @abstractmethod
+    def inverse(self, y):
+        """Fewest units reaching accuracy *y*; ``inf`` when unreachable."""
+
+    @abstractmethod
+    def derivative(self, x):
+        """d accuracy / d units at *x*."""
+
+
+# ---------------------------------------------------------------------------#
+# Parametric families                                                        #
+# ---------------------------------------------------------------------------#
+@register_model("saturating_exp")
+class SaturatingExp(CurveModel):
+    """a · (1 − e^(−b·x)) — the optimiser's historical curve."""
+    __slots__ = ("a", "b")
+    required = ("a", "b")
+
+    def __init__(self, a: float, b: float) -> None:
+        self.a, self.b = a, b
+
+    @classmethod
+    def from_curve(cls, curve: Mapping) -> "SaturatingExp":
+        return cls(curve["a"], curve["b"])
+
+    def evaluate(self, x):
+        # same expression as optimizer._eval_curve, so results are bit-identical
+        return self.a * (1.0 - np.exp(-self.b * x))
+
+    def inverse(self, y):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = -np.log1p(-np.asarray(y, dtype=float) / self.a) / self.b
+        return np.where(np.asarray(y) < self.a, np.maximum(x, 0.0), np.inf)
+
+    def derivative(self, x):
+        return self.a * self.b * np.exp(-self.b * x)
+
+
+@register_model("log1p")
+class Log1p(CurveModel):
+    """a · log1p(b·x) — the family :func:`cucal.curves.fit_log_curve` fits."""
+    __slots__ = ("a", "b")
+    required = ("a", "b")
+
+    def __init__(self, a: float, b: float) -> None:
+        self.a, self.b = a, b
+
+    @classmethod
+    def from_curve(cls, curve: Mapping) -> "Log1p":
+        return cls(curve["a"], curve["b"])
+
+    def evaluate(self, x):
+        return self.a * np.log1p(self.b * x)
+
+    def inverse(self, y):
+        return np.maximum(np.expm1(np.asarray(y, dtype=float) / self.a) / self.b, 0.0)
+
+    def derivative(self, x):
+        return self.a * self.b / (1.0 + self.b * x)
+
+
+# ---------------------------------------------------------------------------#
+# Empirical families                                                         #
+# ---------------------------------------------------------------------------#
+def _points(curve: Mapping):
+    x = np.asarray(curve["x"], dtype=float)
+    y = np.asarray(curve["y"], dtype=float)
+    if x.ndim != 1 or x.shape != y.shape or x.size < 2:
+        raise ValueError("empirical curves need equally long 'x' and 'y' lists (≥ 2 points)")
+    if np.any(np.diff(x) <= 0):
+        raise ValueError("'x' must be strictly increasing")
+    if np.any(np.diff(y) < 0):
+        raise ValueError("empirical curves must be non-decreasing in 'y'")
+    return x, y
+
+
+def _first_crossing(xs: np.ndarray, ys: np.ndarray, y):
+    """
+    Smallest x at which the piecewise-linear curve through (xs, ys) reaches
+    *y*: 0 at or below ``ys[0]``, ``inf`` above the running maximum.  The
+    segment is found by binary search on the running maximum, so plateaus
+    resolve to their left end.
+    """
+    y = np.asarray(y, dtype=float)
+    top = np.maximum.accumulate(ys)
+    j = np.searchsorted(top, y, side="left")
+    k = np.clip(j, 1, top.size - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = xs[k - 1] + (y - top[k - 1]) * (xs[k] - xs[k - 1]) / (top[k] - top[k - 1])
+    x = np.where(y <= top[0], 0.0, x)
+    return np.where(j >= top.size, np.inf, x)
+
+
+@register_model("piecewise_linear")
+class PiecewiseLinear(CurveModel):
+    """Linear interpolation of measured points; flat beyond both ends."""
+    __slots__ = ("x", "y", "slopes")
+    required = ("x", "y")
+
+    def __init__(self, x: np.ndarray, y: np.ndarray) -> None:
+        self.x, self.y = x, y
+        self.slopes = np.diff(y) / np.diff(x)
+
+    @classmethod
+    def from_curve(cls, curve: Mapping) -> "PiecewiseLinear":
+        return cls(*_points(curve))
+
+    def evaluate(self, x):
+        return np.interp(x, self.x, self.y)
+
+    def inverse(self, y):
+        return _first_crossing(self.x, self.y, y)
+
+    def derivative(self, x):
+        x = np.asarray(x, dtype=float)
+        seg = np.clip(np.searchsorted(self.x, x, side="right") - 1, 0, self.slopes.size - 1)
+        inside = (x >= self.x[0]) & (x < self.x[-1])
+        return np.where(inside, self.slopes[seg], 0.0)
+
+
+@register_model("pchip")
+class PchipTable(CurveModel):
+    """
+    Monotone cubic through measured points, tabulated on ``table_size``
+    uniform knots; evaluation is an O(1) index plus a linear blend.
+    """
+    __slots__ = ("x0", "x1", "step", "values", "slopes", "y")
+    required = ("x", "y")
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, table_size: int = 4096) -> None:
+        from scipy.interpolate import PchipInterpolator
+
+        interp = PchipInterpolator(x, y, extrapolate=False)
+        grid = np.linspace(x[0], x[-1], table_size)
+        self.x0, self.x1 = float(x[0]), float(x[-1])
+        self.step = (self.x1 - self.x0) / (table_size - 1)
+        # PCHIP is monotone for monotone data; accumulate to remove round-off dips
+        self.values = np.maximum.accumulate(interp(grid))
+        self.slopes = np.maximum(interp.derivative()(grid), 0.0)
+        self.y = y
+
+    @classmethod
+    def from_curve(cls, curve: Mapping) -> "PchipTable":
+        return cls(*_points(curve), table_size=int(curve.get("table_size", 4096)))
+
+    def _index(self, x):
+        pos = (np.clip(np.asarray(x, dtype=float), self.x0, self.x1) - self.x0) / self.step
+        i = np.minimum(pos.astype(np.int64), self.values.size - 2)
+        return i, pos - i
+
+    def evaluate(self, x):
+        i, frac = self._index(x)
+        v = self.values
+        return v[i] + frac * (v[i + 1] - v[i])
+
+    def inverse(self, y):
+        grid = self.x0 + self.step * np.arange(self.values.size)
+        return _first_crossing(grid, self.values, y)
+
+    def derivative(self, x):
+        x = np.asarray(x, dtype=float)
+        i, frac = self._index(x)
+        d = self.slopes[i] + frac * (self.slopes[i + 1] - self.slopes[i])
+        return np.where((x >= self.x0) & (x < self.x1), d, 0.0)
+
+
+# ---------------------------------------------------------------------------#
+# Lookup                                                                     #
+# ---------------------------------------------------------------------------#
+@lru_cache(maxsize=256)
+def _build(name: str, blob: str) -> CurveModel:
+    return _REGISTRY[name].from_curve(json.loads(blob))
+
+
+def curve_model(curve: Mapping) -> CurveModel:
+    """
+    Model object for a curve dict.  Built models are cached (keyed by the
+    dict's contents), so empirical tables are computed once.
+    """
+    name = curve.get("model", DEFAULT_MODEL)
+    cls = _REGISTRY.get(name)
+    if cls is None:
+        raise KeyError(f"unknown curve model {name!r}; known: {', '.join(_REGISTRY)}")
+    missing = [k for k in cls.required if k not in curve]
+    if missing:
+        raise KeyError(f"{name} curve is missing {', '.join(missing)}")
+    if cls in (SaturatingExp, Log1p):             # cheap: skip the cache key
+        return cls.from_curve(curve)
+    return _build(name, json.dumps(dict(curve), sort_keys=True, default=_jsonable))
+
+
+def _jsonable(obj):
+    if hasattr(obj, "tolist"):                    # NumPy arrays / scalars
+        return obj.tolist()
+    raise TypeError(f"not JSON serialisable: {type(obj).__name__}")
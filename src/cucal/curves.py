@@ -4,25 +4,36 @@ Curve utilities for the Cost-Utility Calculator
 -----------------------------------------------
 
 * Fit diminishing-returns log curves  y = a · log1p(b·x)
-* Load per-resource curves from data/curves.json
+  (how curves are *evaluated* is chosen per entry, see cucal.curve_models)
+* Update curve parameters online as new points stream in (OnlineCurveFit)
+* Load per-resource curves from data/curves.json (and write them back)
 * Return paired (label_curve, gpu_curve) for a base task name
 
 Schema assumed in curves.json
 -----------------------------
-<base>-label : { "label_curve": {a, b}, "rmse": …, "cost_per_unit": … }
-<base>-gpu   : { "gpu_curve"  : {a, b}, "rmse": …, "cost_per_unit": … }
+<base>-label : { "label_curve": {model, a, b}, "rmse": …, "cost_per_unit": … }
+<base>-gpu   : { "gpu_curve"  : {model, a, b}, "rmse": …, "cost_per_unit": … }
+
+Empirical models store measured ``x`` / ``y`` lists instead of ``a`` / ``b``.
 """
 
 from __future__ import annotations
 
-from functools import lru_cache
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 import json
+import math
+import os
+import tempfile
+import time
 import numpy as np
 from scipy.optimize import minimize
 
+from .data import DATA_DIR, invalidate, watch
+
 # ---------------------------------------------------------------------------#
 # Log-curve fitting                                                          #
 # ---------------------------------------------------------------------------#
@@ -34,7 +45,7 @@ def log_model(x: np.ndarray, a: float, b: float) -> np.ndarray:
 
 
 def fit_log_curve(x, y) -> Dict[str, float]:
-    """Return {'a':…, 'b':…, 'rmse':…} fitted to (x, y) numpy-like arrays."""
+    """Return {'model': 'log1p', 'a':…, 'b':…, 'rmse':…} fitted to (x, y)."""
     x, y = np.asarray(x, float), np.asarray(y, float)
 
     res = minimize(
@@ -44,30 +55,115 @@ def fit_log_curve(x, y) -> Dict[str, float]:
     )
     a, b = map(float, res.x)
     rmse = float(np.sqrt(np.mean((log_model(x, a, b) - y) ** 2)))
-    return {"a": a, "b": b, "rmse": rmse}
+    return {"model": "log1p", "a": a, "b": b, "rmse": rmse}
 
 
 # ---------------------------------------------------------------------------#
-# curves.json loader                                                         #
+# Online (recursive Gauss-Newton) fitting                                    #
 # ---------------------------------------------------------------------------#
-def _find_repo_root() -> Path:
+def _saturating_exp(x: float, a: float, b: float) -> Tuple[float, float, float]:
+    """a·(1 − e^(−b·x)) and its gradient w.r.t. (a, ln b)."""
+    e = math.exp(-b * x)
+    return a * (1.0 - e), 1.0 - e, a * b * x * e
+
+
+def _log1p(x: float, a: float, b: float) -> Tuple[float, float, float]:
+    """a·log1p(b·x) (the :func:`fit_log_curve` model) and its gradient."""
+    return a * math.log1p(b * x), math.log1p(b * x), a * b * x / (1.0 + b * x)
+
+
+_ONLINE_MODELS = {"saturating_exp": _saturating_exp, "log1p": _log1p}
+
+
+@dataclass(slots=True)
+class OnlineCurveFit:
     """
-    Walk upwards until we locate data/curves.json.
-    Allows this module to be imported from any working dir.
+    Recursive Gauss-Newton (extended RLS) estimate of a two-parameter curve.
+
+    The state is bounded — parameters ``(a, ln b)``, their 2×2 covariance
+    and two residual sums — so each :meth:`update` is O(1) however many
+    points have been seen.  ``forgetting`` < 1 discounts old points by
+    that factor per update (effective memory ≈ 1 / (1 − forgetting)).
+
+    The default ``saturating_exp`` model is the one the optimiser
+    evaluates; ``log1p`` matches :func:`fit_log_curve`.
+
+    >>> fit = OnlineCurveFit.from_curve(curve_label)     # warm start
+    >>> fit.update(2000, 0.81)
+    >>> fit.curve                                        # {'a', 'b', 'rmse'}
     """
-    here = Path(__file__).resolve()
-    for parent in [here] + list(here.parents):
-        if (parent / "data" / "curves.json").is_file():
-            return parent
-    raise FileNotFoundError("Could not locate data/curves.json in parent tree.")
+    a: float = 0.5
+    b: float = 0.01
+    forgetting: float = 1.0
+    model: str = "saturating_exp"
+    prior_var: float = 100.0        # initial variance of a and ln b
+    cov: np.ndarray = field(default=None)       # type: ignore[assignment]
+    sse: float = 0.0                # discounted Σ residual²
+    weight: float = 0.0             # discounted point count
+    n_points: int = 0
+
+    def __post_init__(self) -> None:
+        if self.model not in _ONLINE_MODELS:
+            raise ValueError(f"unknown model {self.model!r}")
+        if not 0.0 < self.forgetting <= 1.0:
+            raise ValueError("forgetting must be in (0, 1]")
+        if self.b <= 0:
+            raise ValueError("b must be > 0")
+        if self.cov is None:
+            self.cov = np.eye(2) * self.prior_var
+
+    @classmethod
+    def from_curve(cls, curve: Dict[str, float], **kwargs) -> "OnlineCurveFit":
+        """Warm-start from an existing ``{"a", "b"[, "model"]}`` dict."""
+        kwargs.setdefault("model", curve.get("model", "saturating_exp"))
+        return cls(a=float(curve["a"]), b=float(curve["b"]), **kwargs)
+
+    def update(self, x: float, y: float) -> None:
+        """Absorb one observation (one Gauss-Newton step, O(1))."""
+        lam = self.forgetting
+        f, ja, jb = _ONLINE_MODELS[self.model](float(x), self.a, self.b)
+        p = self.cov
+        pj0 = p[0, 0] * ja + p[0, 1] * jb
+        pj1 = p[1, 0] * ja + p[1, 1] * jb
+        gain = 1.0 / (lam + ja * pj0 + jb * pj1)
+        k0, k1 = pj0 * gain, pj1 * gain
+        resid = float(y) - f
+        self.a = max(self.a + k0 * resid, 0.0)
+        self.b = self.b * math.exp(k1 * resid)          # step taken in ln b
+        self.cov = (p - np.array([[k0 * pj0, k0 * pj1], [k1 * pj0, k1 * pj1]])) / lam
 
+        post = float(y) - _ONLINE_MODELS[self.model](float(x), self.a, self.b)[0]
+        self.sse = lam * self.sse + post * post
+        self.weight = lam * self.weight + 1.0
+        self.n_points += 1
 
-_CURVES_PATH = _find_repo_root() / "data" / "curves.json"
+    def update_many(self, xs: Iterable[float], ys: Iterable[float]) -> None:
+        for x, y in zip(xs, ys):
+            self.update(x, y)
 
+    @property
+    def rmse(self) -> float:
+        return math.sqrt(self.sse / self.weight) if self.weight else 0.0
 
-@lru_cache(maxsize=1)
-def _curves() -> Dict[str, Dict]:
-    return json.loads(_CURVES_PATH.read_text())
+    @property
+    def curve(self) -> Dict[str, float]:
+        return {"model": self.model, "a": self.a, "b": self.b, "rmse": self.rmse}
+
+
+# ---------------------------------------------------------------------------#
+# curves.json loader                                                         #
+# ---------------------------------------------------------------------------#
+_CURVES_PATH = DATA_DIR / "curves.json"
+_CURVES = watch(_CURVES_PATH, json.loads, name="curves")
+_LOCK_STALE = 30.0          # s; an update takes milliseconds, so the holder is gone
+
+
+def load_curves() -> Dict[str, Dict]:
+    """All of curves.json, served from memory and reloaded when the file changes."""
+    return _CURVES.get()
+
+
+_curves = load_curves
 
 
 # ---------------------------------------------------------------------------#
@@ -100,3 +196,80 @@ def get_curves(base_name: str) -> Tuple[Dict[str, float], Dict[str, float]]:
             f"Missing key {e} in curves.json. "
             "Ensure both '-label' and '-gpu' resources exist."
         ) from None
+
+
+def _dump_curves(data: Dict[str, Dict]) -> str:
+    """
+    curves.json in its hand-kept layout: one line per curve dict, the other
+    keys one per line, a blank line between cases.
+    """
+    def inline(obj: Dict) -> str:
+        return "{ " + ", ".join(f"{json.dumps(k)}: {json.dumps(v)}" for k, v in obj.items()) + " }"
+
+    blocks, prev_base = [], None
+    for resource, entry in data.items():
+        fields = ",\n".join(
+            f"    {json.dumps(k)}: {inline(v) if isinstance(v, dict) else json.dumps(v)}"
+            for k, v in entry.items()
+        )
+        base = resource.rsplit("-", 1)[0]
+        sep = "" if prev_base is None else ("\n" if base == prev_base else "\n\n")
+        blocks.append(f"{sep}  {json.dumps(resource)}: {{\n{fields}\n  }}")
+        prev_base = base
+    return "{\n" + ",".join(blocks) + "\n}\n"
+
+
+@contextmanager
+def _write_lock(path: Path, stale_after: float = _LOCK_STALE) -> Iterator[None]:
+    """Hold ``<path>.lock`` (created exclusively) while *path* is rewritten."""
+    lock = path.with_name(f"{path.name}.lock")
+    while True:
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime > stale_after:
+                    # holder died mid-update; only one breaker wins the rename
+                    os.replace(lock, lock.with_name(f"{lock.name}.stale-{os.getpid()}"))
+                    continue
+            except FileNotFoundError:
+                continue                          # released meanwhile – retry
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+def update_curve(
+    resource: str, fit: "OnlineCurveFit | Dict[str, float]", path: Optional[Path] = None
+) -> None:
+    """
+    Write new ``a``/``b`` (and ``rmse``) for *resource*, e.g.
+    ``"Dragut-2019-label"``, into curves.json and invalidate the cached
+    copy so the next :func:`get_curves` call sees them.  Concurrent writers
+    are serialised by a ``curves.json.lock`` file and the file is replaced
+    atomically; other entries, keys and the file's layout are left untouched.
+    """
+    curve = fit.curve if isinstance(fit, OnlineCurveFit) else fit
+    path = Path(path) if path is not None else _CURVES_PATH
+    with _write_lock(path):
+        data = json.loads(path.read_text())
+        entry = data[resource]
+        kind = "label_curve" if "label_curve" in entry else "gpu_curve"
+        if "model" in curve:
+            entry[kind]["model"] = curve["model"]
+        entry[kind]["a"], entry[kind]["b"] = float(curve["a"]), float(curve["b"])
+        if "rmse" in curve:
+            entry["rmse"] = float(curve["rmse"])
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(_dump_curves(data))
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    invalidate(path)
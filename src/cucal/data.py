@@ -0,0 +1,187 @@
+"""
+Shared access to the package's data files.
+
+Curves, hardware, resources and unit conversions are parsed once and then
+served from memory.  A :class:`DataFile` revalidates its file at most every
+``check_interval`` seconds (in between, :meth:`DataFile.get` does no I/O at
+all):
+
+1. ``os.stat`` – unchanged ``mtime``/size means the cached value stands;
+2. otherwise the bytes are read and hashed – an unchanged hash (e.g. a
+   ``touch``) only refreshes the stat;
+3. otherwise the new content is parsed and swapped in as one snapshot, and
+   :attr:`DataFile.version` goes up so dependent caches can key on it.
+
+A parse error leaves the previous snapshot in place (and is retried on the
+next check).  Values are shared between callers; treat them as read-only.
+
+>>> hw = watch(path, json.loads, name="hardware")
+>>> hw.get()          # parsed dict, reloaded when the file changes
+>>> versions()        # {"hardware": 1, ...}
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+__all__ = [
+    "CHECK_INTERVAL",
+    "DATA_DIR",
+    "DataFile",
+    "watch",
+    "invalidate",
+    "versions",
+    "load_resources",
+]
+
+# Seconds between revalidations of one file; 0 checks on every access.
+CHECK_INTERVAL: float = 1.0
+
+Parser = Callable[[bytes], Any]
+
+
+def _find_repo_root() -> Path:
+    """
+    Walk upwards until we locate data/curves.json.
+    Allows this module to be imported from any working dir.
+    """
+    here = Path(__file__).resolve()
+    for parent in [here] + list(here.parents):
+        if (parent / "data" / "curves.json").is_file():
+            return parent
+    raise FileNotFoundError("Could not locate data/curves.json in parent tree.")
+
+
+DATA_DIR = _find_repo_root() / "data"
+
+
+# ---------------------------------------------------------------------------#
+# Watched file                                                               #
+# ---------------------------------------------------------------------------#
+@dataclass(slots=True, frozen=True)
+class _Snapshot:
+    value: Any
+    version: int
+    stat: Optional[Tuple[int, int]]       # (mtime_ns, size); None forces a hash check
+    digest: str
+
+
+class DataFile:
+    """One data file, parsed with *parser* (bytes → value) and kept in memory."""
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        parser: Parser,
+        *,
+        check_interval: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.parser = parser
+        self.check_interval = check_interval
+        self._snap: Optional[_Snapshot] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Number of distinct contents loaded so far (0 before the first load)."""
+        self.get()
+        return self._snap.version
+
+    def get(self) -> Any:
+        """Current parsed value; revalidates the file when the interval is up."""
+        snap = self._snap
+        if snap is not None and time.monotonic() < self._next_check:
+            return snap.value
+        return self._revalidate()
+
+    def invalidate(self) -> None:
+        """Make the next :meth:`get` compare the file's hash, whatever its stat."""
+        with self._lock:
+            self._next_check = 0.0
+            if self._snap is not None:
+                self._snap = _Snapshot(self._snap.value, self._snap.version, None,
+                                       self._snap.digest)
+
+    def _revalidate(self) -> Any:
+        with self._lock:
+            snap = self._snap
+            if snap is not None and time.monotonic() < self._next_check:
+                return snap.value                 # another thread just checked
+            try:
+                st = os.stat(self.path)
+                stat = (st.st_mtime_ns, st.st_size)
+                if snap is None or stat != snap.stat:
+                    raw = self.path.read_bytes()
+                    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+                    if snap is None or digest != snap.digest:
+                        value = self.parser(raw)
+                        snap = _Snapshot(value, (snap.version if snap else 0) + 1,
+                                         stat, digest)
+                    else:
+                        snap = _Snapshot(snap.value, snap.version, stat, digest)
+                    self._snap = snap
+            except (OSError, ValueError):
+                if snap is None:                  # nothing to fall back on
+                    raise
+            interval = CHECK_INTERVAL if self.check_interval is None else self.check_interval
+            self._next_check = time.monotonic() + interval
+            return snap.value
+
+
+# ---------------------------------------------------------------------------#
+# Registry                                                                   #
+# ---------------------------------------------------------------------------#
+_FILES: Dict[Tuple[Path, Parser], DataFile] = {}
+_NAMES: Dict[str, DataFile] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def watch(
+    path: Union[str, os.PathLike], parser: Parser, *, name: Optional[str] = None
+) -> DataFile:
+    """
+    The shared :class:`DataFile` for *path* and *parser* (created on first
+    use); *name* lists it in :func:`versions`.
+    """
+    key = (Path(path).resolve(), parser)
+    with _REGISTRY_LOCK:
+        handle = _FILES.get(key)
+        if handle is None:
+            handle = _FILES[key] = DataFile(key[0], parser)
+        if name is not None:
+            _NAMES[name] = handle
+    return handle
+
+
+def invalidate(path: Optional[Union[str, os.PathLike]] = None) -> None:
+    """Force a recheck of every handle on *path* (all handles when ``None``)."""
+    target = None if path is None else Path(path).resolve()
+    with _REGISTRY_LOCK:
+        handles: List[DataFile] = [h for (p, _), h in _FILES.items()
+                                   if target is None or p == target]
+    for handle in handles:
+        handle.invalidate()
+
+
+def versions() -> Dict[str, int]:
+    """``{name: version}`` of the named data files."""
+    return {name: handle.version for name, handle in sorted(_NAMES.items())}
+
+
+# ---------------------------------------------------------------------------#
+# data/resources.json                                                        #
+# ---------------------------------------------------------------------------#
+_RESOURCES = watch(DATA_DIR / "resources.json", json.loads, name="resources")
+
+
+def load_resources() -> List[Dict[str, Any]]:
+    """Resource price list: ``[{"name", "unit", "cost_per_unit"}, ...]``."""
+    return _RESOURCES.get()
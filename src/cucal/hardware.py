@@ -7,14 +7,16 @@ import json
 from pathlib import Path
 from typing import Dict, Any
 
+from .data import watch
+
 # <repo_root>/src/resources/hardware.json
 _HARDWARE_PATH = Path(__file__).resolve().parent.parent / "resources" / "hardware.json"
+_HARDWARE = watch(_HARDWARE_PATH, json.loads, name="hardware")
 
 
 def load_hardware() -> Dict[str, Dict[str, Any]]:
-    """Zwraca słownik {nazwa_gpu: {"power": int}}."""
-    with _HARDWARE_PATH.open(encoding="utf-8") as f:
-        return json.load(f)
+    """Zwraca słownik {nazwa_gpu: {"power": int}} (z pamięci; przeładowywany po zmianie pliku)."""
+    return _HARDWARE.get()
 
 
 def calculate_energy(power_w: float, gpu_hours: float) -> float:
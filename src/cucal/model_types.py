@@ -1,7 +1,8 @@
 # src/cucal/model_types.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 
 @dataclass(slots=True)
@@ -19,7 +20,42 @@ class ResourceCurve:
 class AllocationPlan:
     per_resource: Dict[str, float]  # id → units
     total_cost: float
+    accuracy: Optional[float] = None   # not known to the cost-only allocator
+
+
+@dataclass(slots=True, eq=False)
+class BudgetPlan(Mapping):
+    """
+    Result of :func:`cucal.optimizer.optimise_budget`.
+
+    Slotted, but still reads like the dict it replaces
+    (``plan["accuracy"]``, ``dict(plan)``, ``==`` against a dict).
+    """
     accuracy: float
+    accuracy_ci: Tuple[float, float]
+    labels: float
+    gpu_hours: float
+    wall_clock_hours: float
+    label_dollars: float
+    gpu_dollars: float
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _BUDGET_PLAN_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_BUDGET_PLAN_KEYS)
+
+    def __len__(self) -> int:
+        return len(_BUDGET_PLAN_KEYS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain ``dict`` copy (e.g. for ``json.dumps``)."""
+        return {k: getattr(self, k) for k in _BUDGET_PLAN_KEYS}
+
+
+_BUDGET_PLAN_KEYS = tuple(f.name for f in fields(BudgetPlan))
 
 
 @dataclass(slots=True)
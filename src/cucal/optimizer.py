@@ -8,7 +8,7 @@ and GPU-compute dollars under
 """
 
 from collections.abc import Sequence, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional, Union
 
 import numpy as np
@@ -20,6 +20,10 @@ except ModuleNotFoundError:
 
 
 from .config import DEFAULT_CLUSTER_EFF
+from .curve_models import CurveModel, curve_model
+from .model_types import AllocationPlan, BudgetPlan
+from .plan_table import PlanTable
+from .wall_clock import WallClockModel
 
 # ---------------------------------------------------------------------------#
 # Helper functions                                                           #
@@ -39,13 +43,8 @@ def _combine(acc_lbl: float, acc_gpu: float) -> float:
     return 1.0 - (1.0 - acc_lbl) * (1.0 - acc_gpu)
 
 
-# ---------------------------------------------------------------------------#
-# Public dataclass for generic allocator                                     #
-# ---------------------------------------------------------------------------#
-@dataclass(slots=True)
-class AllocationPlan:
-    per_resource: dict[str, float]  # id → units allocated
-    total_cost: float
+class OptimisationCancelled(RuntimeError):
+    """Raised when a ``should_stop`` callback asks a running search to stop."""
 
 
 # ---------------------------------------------------------------------------#
@@ -63,95 +62,429 @@ def optimise_budget(
     max_gpu_hours: Optional[float] = None,
     wall_clock_limit_hours: Optional[float] = None,
     cluster_efficiency_pct: float = 100 * DEFAULT_CLUSTER_EFF,
+    wall_clock_model: Optional[WallClockModel] = None,
     granularity: int = 1,
     target_accuracy: float | None = None,   # NEW
-) -> Optional[Dict[str, float]]:
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Optional[BudgetPlan]:
     """
     Grid-search the $-space.
 
+    *wall_clock_model* (a :class:`~cucal.wall_clock.WallClockModel`)
+    replaces the sequential ``gpu_hours / efficiency + labels / γ`` time
+    formula, e.g. for parallel annotators, several GPUs or overlapped
+    stages; ``None`` keeps the built-in formula.  With sub-linear multi-GPU
+    scaling a GPU dollar buys less effective compute (``gpu_hours``), see
+    :mod:`cucal.wall_clock`.
+
+    The grid is evaluated in NumPy blocks of rows; ties are broken exactly
+    as a row-major scan would (higher accuracy, then more $ spent, then the
+    first cell).  *should_stop* is polled once per block; when it returns
+    ``True`` the search raises :class:`OptimisationCancelled`.
+
     Returns
     -------
-    dict | None
+    BudgetPlan | None
         {
           accuracy, accuracy_ci,
           labels, gpu_hours,
           wall_clock_hours,
           label_dollars, gpu_dollars
         }
-        or *None* when no split satisfies the caps.
+        (read-only mapping) or *None* when no split satisfies the caps.
     """
     assert gamma > 0, "γ must be > 0"
     budget = int(round(budget))
-    best: Optional[Dict[str, float]] = None
     efficiency = max(cluster_efficiency_pct, 1.0) / 100.0  # avoid /0
 
-    # -----------------------------------------------------------------------
-    # Grid-search     label_dollars ∈ [0 … budget]
-    #                 gpu_dollars   ∈ [0 … budget − label_dollars]
-    # -----------------------------------------------------------------------
-    for label_dollars in range(0, budget + 1, granularity):
-        for gpu_dollars in range(0, budget - label_dollars + 1, granularity):
-
-            spent = label_dollars + gpu_dollars            # NEW — total $
-
-            # ---------- convert dollars → units --------------------------------
-            labels = label_dollars / label_cost
-            label_hours = labels / gamma
-            gpu_hours = gpu_dollars / gpu_cost if gpu_cost else 0.0
-
-            # ---------- caps ----------------------------------------------------
-            if max_gpu_hours is not None and gpu_hours > max_gpu_hours:
-                continue
-
-            wall_clock = gpu_hours / efficiency + label_hours
-            if (
-                wall_clock_limit_hours is not None
-                and wall_clock > wall_clock_limit_hours
-            ):
-                continue
-
-            # ---------- accuracy ------------------------------------------------
-            acc = _combine(
-                _eval_curve(curve_label["a"], curve_label["b"], labels),
-                _eval_curve(curve_gpu["a"], curve_gpu["b"], gpu_hours),
+    problem = _GridProblem(
+        label_cost=label_cost,
+        gpu_cost=gpu_cost,
+        curve_label=curve_label,
+        curve_gpu=curve_gpu,
+        gamma=gamma,
+        max_gpu_hours=max_gpu_hours,
+        wall_clock_limit_hours=wall_clock_limit_hours,
+        efficiency=efficiency,
+        wall_clock_model=wall_clock_model,
+    )
+    best = _search_grid(
+        problem,
+        _grid_blocks(budget, granularity, problem.max_gpu_dollars()),
+        target_accuracy,
+        should_stop=should_stop,
+    )
+    if best is None:
+        return None
+    return _make_plan(problem, best[2], best[3], label_rmse)
+
+
+def budget_frontier(
+    budgets: Sequence[float],
+    *,
+    label_cost: float,
+    gpu_cost: float,
+    curve_label: Dict[str, float],
+    curve_gpu: Dict[str, float],
+    label_rmse: float = 0.0,
+    gamma: int = 5,
+    max_gpu_hours: Optional[float] = None,
+    wall_clock_limit_hours: Optional[float] = None,
+    cluster_efficiency_pct: float = 100 * DEFAULT_CLUSTER_EFF,
+    wall_clock_model: Optional[WallClockModel] = None,
+    granularity: int = 1,
+    target_accuracy: float | None = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> list[Optional[BudgetPlan]]:
+    """
+    ``[optimise_budget(budget=b, ...) for b in budgets]`` in a single pass.
+
+    The grid for the largest budget contains the grid of every smaller one,
+    so the best cell is kept per spent-dollar level and a prefix scan then
+    answers each budget.  Results are identical to separate calls.
+    """
+    problem, lab, gpu = _frontier_cells(
+        budgets, label_cost, gpu_cost, curve_label, curve_gpu, gamma, max_gpu_hours,
+        wall_clock_limit_hours, cluster_efficiency_pct, wall_clock_model, granularity,
+        target_accuracy, should_stop,
+    )
+    return [
+        None if k_lab < 0 else _make_plan(problem, int(k_lab), int(k_gpu), label_rmse)
+        for k_lab, k_gpu in zip(lab.tolist(), gpu.tolist())
+    ]
+
+
+def budget_frontier_table(
+    budgets: Sequence[float],
+    *,
+    label_cost: float,
+    gpu_cost: float,
+    curve_label: Dict[str, float],
+    curve_gpu: Dict[str, float],
+    label_rmse: float = 0.0,
+    gamma: int = 5,
+    max_gpu_hours: Optional[float] = None,
+    wall_clock_limit_hours: Optional[float] = None,
+    cluster_efficiency_pct: float = 100 * DEFAULT_CLUSTER_EFF,
+    wall_clock_model: Optional[WallClockModel] = None,
+    granularity: int = 1,
+    target_accuracy: float | None = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> PlanTable:
+    """
+    :func:`budget_frontier` as a :class:`~cucal.plan_table.PlanTable` with a
+    ``budget`` key column.  No per-plan Python objects are created.
+    """
+    problem, lab, gpu = _frontier_cells(
+        budgets, label_cost, gpu_cost, curve_label, curve_gpu, gamma, max_gpu_hours,
+        wall_clock_limit_hours, cluster_efficiency_pct, wall_clock_model, granularity,
+        target_accuracy, should_stop,
+    )
+    columns = _plan_columns(problem, lab, gpu, label_rmse)
+    columns["budget"] = np.asarray(budgets, dtype=float)
+    return PlanTable(columns)
+
+
+def _frontier_cells(
+    budgets, label_cost, gpu_cost, curve_label, curve_gpu, gamma, max_gpu_hours,
+    wall_clock_limit_hours, cluster_efficiency_pct, wall_clock_model, granularity,
+    target_accuracy, should_stop,
+):
+    """Shared search of the frontier functions: ``(problem, label$[], gpu$[])``
+    per budget, ``-1`` where nothing is feasible."""
+    assert gamma > 0, "γ must be > 0"
+    problem = _GridProblem(
+        label_cost=label_cost,
+        gpu_cost=gpu_cost,
+        curve_label=curve_label,
+        curve_gpu=curve_gpu,
+        gamma=gamma,
+        max_gpu_hours=max_gpu_hours,
+        wall_clock_limit_hours=wall_clock_limit_hours,
+        efficiency=max(cluster_efficiency_pct, 1.0) / 100.0,
+        wall_clock_model=wall_clock_model,
+    )
+    ints = np.rint(np.asarray(budgets, dtype=float)).astype(np.int64)
+    if ints.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return problem, empty, empty
+    top = max(int(ints.max()), 0)
+
+    n_levels = top // granularity + 1
+    lvl_acc = np.full(n_levels, -np.inf)
+    lvl_lab = np.full(n_levels, -1, dtype=np.int64)
+    lvl_gpu = np.full(n_levels, -1, dtype=np.int64)
+
+    for lab, gpu, in_budget in _grid_blocks(top, granularity, problem.max_gpu_dollars()):
+        if should_stop is not None and should_stop():
+            raise OptimisationCancelled("budget_frontier cancelled")
+        labels, gpu_hours, wall = problem.units(lab, gpu)
+        mask = in_budget & problem.feasible(gpu_hours, wall)
+        acc = problem.accuracy(labels, gpu_hours)
+        if target_accuracy is not None:
+            mask &= acc >= target_accuracy
+        rows, cols = np.nonzero(mask)              # row-major order
+        if rows.size == 0:
+            continue
+        f_acc = acc[rows, cols]
+        f_lab, f_gpu = lab[rows, 0], gpu[0, cols]
+        f_lvl = (f_lab + f_gpu) // granularity
+        if target_accuracy is None:
+            # best accuracy per level, first cell among equal accuracies
+            order = np.lexsort((np.arange(f_acc.size), -f_acc, f_lvl))
+        else:
+            order = np.arange(f_acc.size)
+        lvl, first = np.unique(f_lvl[order], return_index=True)
+        pick = order[first]
+        # strictly better only: earlier blocks win ties, as in a scan
+        upd = f_acc[pick] > lvl_acc[lvl] if target_accuracy is None else lvl_lab[lvl] < 0
+        lvl, pick = lvl[upd], pick[upd]
+        lvl_acc[lvl] = f_acc[pick]
+        lvl_lab[lvl] = f_lab[pick]
+        lvl_gpu[lvl] = f_gpu[pick]
+
+    idx = np.arange(n_levels)
+    if target_accuracy is None:
+        # highest accuracy so far; among equals the later (= more spent) level
+        run_max = np.maximum.accumulate(lvl_acc)
+        record = np.where((lvl_acc == run_max) & (lvl_lab >= 0), idx, -1)
+        chosen = np.maximum.accumulate(record)
+    else:
+        hits = np.flatnonzero(lvl_lab >= 0)
+        first_hit = int(hits[0]) if hits.size else n_levels
+        chosen = np.where(idx >= first_hit, first_hit, -1)
+
+    # negative budgets afford nothing (and must not wrap around the index)
+    k = np.where(ints < 0, -1, chosen[np.maximum(ints, 0) // granularity])
+    safe = np.maximum(k, 0)
+    return (
+        problem,
+        np.where(k < 0, -1, lvl_lab[safe]),
+        np.where(k < 0, -1, lvl_gpu[safe]),
+    )
+
+
+# ---------------------------------------------------------------------------#
+# Vectorised grid search                                                     #
+# ---------------------------------------------------------------------------#
+_CHUNK_CELLS = 1 << 20          # grid cells evaluated per NumPy pass
+
+
+@dataclass(slots=True)
+class _GridProblem:
+    """Everything except budget/granularity/objective that defines the grid."""
+    label_cost: float
+    gpu_cost: float
+    curve_label: Dict[str, float]
+    curve_gpu: Dict[str, float]
+    gamma: float
+    max_gpu_hours: Optional[float]
+    wall_clock_limit_hours: Optional[float]
+    efficiency: float
+    wall_clock_model: Optional[WallClockModel] = None
+    label_model: CurveModel = field(init=False, repr=False)
+    gpu_model: CurveModel = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # resolved once per search; see cucal.curve_models for the families
+        self.label_model = curve_model(self.curve_label)
+        self.gpu_model = curve_model(self.curve_gpu)
+
+    def units(self, label_dollars, gpu_dollars):
+        """Dollars → (labels, gpu_hours, wall_clock); scalars or arrays."""
+        labels = label_dollars / self.label_cost
+        if self.gpu_cost:
+            gpu_hours = gpu_dollars / self.gpu_cost
+        else:
+            gpu_hours = gpu_dollars * 0.0
+        share = self._compute_share()
+        if share != 1.0:                  # billed device-hours → effective compute
+            gpu_hours = gpu_hours * share
+        if self.wall_clock_model is not None:
+            wall_clock = self.wall_clock_model.hours(
+                labels, gpu_hours, self.gamma, self.efficiency
             )
+        else:
+            wall_clock = gpu_hours / self.efficiency + labels / self.gamma
+        return labels, gpu_hours, wall_clock
+
+    def feasible(self, gpu_hours, wall_clock):
+        ok = np.ones(np.broadcast(gpu_hours, wall_clock).shape, dtype=bool)
+        if self.max_gpu_hours is not None:
+            ok &= ~np.greater(gpu_hours, self.max_gpu_hours)
+        if self.wall_clock_limit_hours is not None:
+            ok &= ~np.greater(wall_clock, self.wall_clock_limit_hours)
+        return ok
+
+    def accuracy(self, labels, gpu_hours):
+        return _combine(
+            self.label_model.evaluate(labels),
+            self.gpu_model.evaluate(gpu_hours),
+        )
 
-            # ---------- pick “better” plan --------------------------------------
-            if target_accuracy is None:                         # maximise acc
-                better = (
-                    best is None
-                    or acc > best["accuracy"]
-                    or (acc == best["accuracy"] and spent > best["spent"])
-                )
-            else:                                               # hit target
-                meets_target = acc >= target_accuracy
-                better = (
-                    meets_target
-                    and (best is None or spent < best["spent"])
-                )
-
-            if not better:
-                continue
-
-            # ---------- confidence interval -------------------------------------
-            rmse = (label_rmse**2 + curve_gpu.get("rmse", 0.0) ** 2) ** 0.5
-            ci_lo = max(0.0, acc - 1.96 * rmse)
-            ci_hi = min(1.0, acc + 1.96 * rmse)
-
-            best = {
-                "accuracy": acc,
-                "accuracy_ci": (ci_lo, ci_hi),
-                "labels": labels,
-                "gpu_hours": gpu_hours,
-                "wall_clock_hours": wall_clock,
-                "label_dollars": label_dollars,
-                "gpu_dollars": gpu_dollars,
-                "spent": spent,                     # <- tie-break helper
-            }
+    def _compute_share(self) -> float:
+        model = self.wall_clock_model
+        return 1.0 if model is None else model.compute_share()
 
+    def max_gpu_dollars(self) -> Optional[float]:
+        """Upper bound on useful GPU dollars implied by the GPU-hour cap."""
+        if self.max_gpu_hours is None or not self.gpu_cost:
+            return None
+        return self.max_gpu_hours * self.gpu_cost / self._compute_share()
+
+
+def _grid_blocks(
+    budget: int, granularity: int, gpu_limit: Optional[float] = None
+):
+    """
+    Yield ``(label_dollars[:, None], gpu_dollars[None, :], in_budget)`` row
+    blocks of the grid, in the same row-major order as a nested loop
+    ``for label_dollars: for gpu_dollars``.
+    """
+    steps = np.arange(0, budget + 1, granularity, dtype=np.int64)
+    if steps.size == 0:                 # negative budget: no cell is affordable
+        return
+    rows = max(1, _CHUNK_CELLS // steps.size)
+    for r0 in range(0, steps.size, rows):
+        lab = steps[r0:r0 + rows, None]
+        top = budget - int(steps[r0])
+        if gpu_limit is not None:       # +granularity: exact check happens later
+            top = min(top, int(gpu_limit) + granularity)
+        gpu = steps[None, :np.searchsorted(steps, top, side="right")]
+        yield lab, gpu, gpu <= budget - lab
+
+
+def _band_blocks(spent_lo: int, spent_hi: int, granularity: int):
+    """
+    Like :func:`_grid_blocks` but only cells with ``spent_lo < spent ≤
+    spent_hi`` — a diagonal band, so the cost is rows × band width rather
+    than the whole triangle.  ``gpu_dollars`` is 2-D here.
+    """
+    labs = np.arange(0, spent_hi + 1, granularity, dtype=np.int64)
+    first = np.maximum((spent_lo - labs) // granularity + 1, 0)
+    last = (spent_hi - labs) // granularity
+    width = int((last - first).max()) + 1 if labs.size else 0
+    if width <= 0:
+        return
+    rows = max(1, _CHUNK_CELLS // width)
+    k = np.arange(width, dtype=np.int64)[None, :]
+    for r0 in range(0, labs.size, rows):
+        sl = slice(r0, r0 + rows)
+        idx = first[sl, None] + k
+        yield labs[sl, None], idx * granularity, idx <= last[sl, None]
+
+
+def _better(cand, best, target_accuracy) -> bool:
+    """Same preference order as the original scalar loop."""
+    if best is None:
+        return True
+    if target_accuracy is None:
+        return cand[0] > best[0] or (cand[0] == best[0] and cand[1] > best[1])
+    return cand[1] < best[1]
+
+
+def _block_best(lab, gpu, acc, mask, target_accuracy):
+    """First (row-major) best cell of a block as (acc, spent, lab$, gpu$)."""
+    spent = lab + gpu
+    if target_accuracy is None:
+        score = np.where(mask, acc, -np.inf)
+        top = score.max()
+        if np.isnan(top):
+            return None
+        ties = np.where(score == top, spent, -1)
+        flat = int(np.argmax(ties == ties.max()))
+    else:
+        hit = mask & (acc >= target_accuracy)
+        if not hit.any():
+            return None
+        flat = int(np.argmin(np.where(hit, spent, np.iinfo(np.int64).max)))
+    i, j = np.unravel_index(flat, acc.shape)
+    return (float(acc[i, j]), int(spent[i, j]), int(lab[i, 0]), int(spent[i, j] - lab[i, 0]))
+
+
+def _search_grid(
+    problem: _GridProblem,
+    blocks,
+    target_accuracy: Optional[float],
+    *,
+    region: Optional[Callable] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+):
+    """
+    Evaluate grid *blocks* (see :func:`_grid_blocks`) with NumPy.
+
+    Row blocks broadcast ``labels[:, None]`` against ``gpu_hours[None, :]``,
+    so the curves are evaluated once per row and per column and only the
+    combination runs over the full block.  *region*, when given, is called
+    as ``region(lab, gpu, gpu_hours, wall_clock)`` and returns an extra
+    boolean mask restricting the search.
+    Returns ``(acc, spent, label_dollars, gpu_dollars)`` or ``None``.
+    """
+    best = None
+    for lab, gpu, valid in blocks:
+        if should_stop is not None and should_stop():
+            raise OptimisationCancelled("optimise_budget cancelled")
+        labels, gpu_hours, wall = problem.units(lab, gpu)
+        mask = valid & problem.feasible(gpu_hours, wall)
+        if region is not None:
+            mask &= region(lab, gpu, gpu_hours, wall)
+        if not mask.any():
+            continue
+        acc = np.broadcast_to(problem.accuracy(labels, gpu_hours), mask.shape)
+        cand = _block_best(lab, gpu, acc, mask, target_accuracy)
+        if cand is not None and _better(cand, best, target_accuracy):
+            best = cand
     return best
 
 
+def _make_plan(
+    problem: _GridProblem, label_dollars: int, gpu_dollars: int, label_rmse: float
+) -> BudgetPlan:
+    """Build the public result for one grid cell (scalar arithmetic)."""
+    labels, gpu_hours, wall_clock = problem.units(label_dollars, gpu_dollars)
+    acc = problem.accuracy(labels, gpu_hours)
+
+    # ---------- confidence interval -------------------------------------
+    rmse = (label_rmse**2 + problem.curve_gpu.get("rmse", 0.0) ** 2) ** 0.5
+    ci_lo = max(0.0, acc - 1.96 * rmse)
+    ci_hi = min(1.0, acc + 1.96 * rmse)
+
+    return BudgetPlan(
+        accuracy=acc,
+        accuracy_ci=(ci_lo, ci_hi),
+        labels=labels,
+        gpu_hours=gpu_hours,
+        wall_clock_hours=wall_clock,
+        label_dollars=label_dollars,
+        gpu_dollars=gpu_dollars,
+    )
+
+
+def _plan_columns(
+    problem: _GridProblem, label_dollars: np.ndarray, gpu_dollars: np.ndarray,
+    label_rmse: float,
+) -> Dict[str, np.ndarray]:
+    """:func:`_make_plan` for many cells at once (``-1`` marks "no plan")."""
+    feasible = label_dollars >= 0
+    lab = np.where(feasible, label_dollars, 0).astype(float)
+    gpu = np.where(feasible, gpu_dollars, 0).astype(float)
+    labels, gpu_hours, wall_clock = problem.units(lab, gpu)
+    acc = problem.accuracy(labels, gpu_hours)
+    rmse = (label_rmse**2 + problem.curve_gpu.get("rmse", 0.0) ** 2) ** 0.5
+    nan = np.nan
+    return {
+        "accuracy": np.where(feasible, acc, nan),
+        "ci_lo": np.where(feasible, np.maximum(0.0, acc - 1.96 * rmse), nan),
+        "ci_hi": np.where(feasible, np.minimum(1.0, acc + 1.96 * rmse), nan),
+        "labels": np.where(feasible, labels, nan),
+        "gpu_hours": np.where(feasible, gpu_hours, nan),
+        "wall_clock_hours": np.where(feasible, wall_clock, nan),
+        "label_dollars": np.where(feasible, lab, nan),
+        "gpu_dollars": np.where(feasible, gpu, nan),
+        "feasible": feasible,
+    }
+
+
 # ---------------------------------------------------------------------------#
 # Generic k-resource allocator (unchanged, but imported by other modules)    #
 # ---------------------------------------------------------------------------#
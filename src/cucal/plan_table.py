@@ -0,0 +1,180 @@
+"""
+Columnar container for many :class:`~cucal.model_types.BudgetPlan` rows.
+
+Sweeps produce millions of plans; as Python objects each one costs a few
+hundred bytes, as columns it costs eight bytes per number.  A
+:class:`PlanTable` is a dict of equally long 1-D NumPy arrays — the plan
+fields plus any key columns (``budget``, ``case``, …) — so
+
+* ``to_pandas()`` wraps the arrays without copying,
+* ``to_arrow()`` builds a ``pyarrow.Table`` zero-copy for numeric columns,
+* :class:`ParquetPlanWriter` streams tables to one Parquet file as row
+  groups, so a sweep never has to hold its full result in memory.
+
+``pandas`` and ``pyarrow`` are optional and only imported when used.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .model_types import BudgetPlan
+
+__all__ = ["PLAN_COLUMNS", "PlanTable", "ParquetPlanWriter"]
+
+PLAN_COLUMNS = (
+    "accuracy",
+    "ci_lo",
+    "ci_hi",
+    "labels",
+    "gpu_hours",
+    "wall_clock_hours",
+    "label_dollars",
+    "gpu_dollars",
+)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ImportError("Arrow/Parquet export needs the optional 'pyarrow' package") from exc
+    return pyarrow
+
+
+class PlanTable:
+    """
+    Plans as columns.  Infeasible rows have ``feasible == False`` and NaN in
+    every plan column.
+
+    >>> t = PlanTable.from_plans([plan_a, None], budget=[100, 5])
+    >>> t["accuracy"], len(t), t[0]            # column, rows, BudgetPlan
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Mapping[str, Any]) -> None:
+        cols = {name: np.asarray(values) for name, values in columns.items()}
+        missing = [c for c in (*PLAN_COLUMNS, "feasible") if c not in cols]
+        if missing:
+            raise ValueError(f"missing column(s): {', '.join(missing)}")
+        lengths = {v.shape for v in cols.values()}
+        if len(lengths) != 1 or len(next(iter(lengths))) != 1:
+            raise ValueError("columns must be 1-D arrays of equal length")
+        self.columns: Dict[str, np.ndarray] = cols
+
+    # ----------------------------------------------------------- building
+    @classmethod
+    def from_plans(
+        cls, plans: Sequence[Optional[Mapping[str, Any]]], **keys: Sequence[Any]
+    ) -> "PlanTable":
+        """Collect scalar plans (``None`` = infeasible) plus key columns."""
+        n = len(plans)
+        cols: Dict[str, Any] = {c: np.full(n, np.nan) for c in PLAN_COLUMNS}
+        cols["feasible"] = np.zeros(n, dtype=bool)
+        for i, plan in enumerate(plans):
+            if plan is None:
+                continue
+            cols["feasible"][i] = True
+            cols["ci_lo"][i], cols["ci_hi"][i] = plan["accuracy_ci"]
+            for c in PLAN_COLUMNS[3:] + ("accuracy",):
+                cols[c][i] = plan[c]
+        cols.update(keys)
+        return cls(cols)
+
+    @classmethod
+    def concat(cls, tables: Iterable["PlanTable"]) -> "PlanTable":
+        tables = list(tables)
+        if not tables:
+            raise ValueError("nothing to concatenate")
+        names = list(tables[0].columns)
+        return cls({n: np.concatenate([t.columns[n] for t in tables]) for n in names})
+
+    # ------------------------------------------------------------- access
+    def __len__(self) -> int:
+        return len(self.columns["feasible"])
+
+    def __getitem__(self, key: Union[str, int]):
+        """Column by name, or row *i* as a :class:`BudgetPlan` (``None`` if infeasible)."""
+        if isinstance(key, str):
+            return self.columns[key]
+        if not self.columns["feasible"][key]:
+            return None
+        c = self.columns
+        return BudgetPlan(
+            accuracy=float(c["accuracy"][key]),
+            accuracy_ci=(float(c["ci_lo"][key]), float(c["ci_hi"][key])),
+            labels=float(c["labels"][key]),
+            gpu_hours=float(c["gpu_hours"][key]),
+            wall_clock_hours=float(c["wall_clock_hours"][key]),
+            label_dollars=float(c["label_dollars"][key]),
+            gpu_dollars=float(c["gpu_dollars"][key]),
+        )
+
+    def __iter__(self) -> Iterator[Optional[BudgetPlan]]:
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"PlanTable({len(self)} rows; {', '.join(self.columns)})"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self.columns.values())
+
+    # ------------------------------------------------------------- export
+    def records(self) -> List[Dict[str, Any]]:
+        """Row dicts (plan fields and key columns) — for small tables / JSON."""
+        names = list(self.columns)
+        arrays = [self.columns[n].tolist() for n in names]
+        return [dict(zip(names, row)) for row in zip(*arrays)]
+
+    def to_pandas(self):
+        """``DataFrame`` sharing memory with the column arrays."""
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, copy=False)
+
+    def to_arrow(self):
+        """``pyarrow.Table``; numeric columns are wrapped without copying."""
+        pa = _require_pyarrow()
+        return pa.table({name: pa.array(values) for name, values in self.columns.items()})
+
+    def to_parquet(self, path, **writer_opts: Any) -> None:
+        with ParquetPlanWriter(path, **writer_opts) as writer:
+            writer.write(self)
+
+
+class ParquetPlanWriter:
+    """
+    Stream :class:`PlanTable` chunks into one Parquet file, one row group
+    per :meth:`write`; the schema is fixed by the first chunk.
+    """
+
+    def __init__(self, path, **writer_opts: Any) -> None:
+        self._pa = _require_pyarrow()
+        self._path = path
+        self._opts = writer_opts
+        self._writer = None
+        self.rows = 0
+
+    def write(self, table: PlanTable) -> None:
+        arrow = table.to_arrow()
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(
+                self._path, arrow.schema, **self._opts
+            )
+        self._writer.write_table(arrow)
+        self.rows += len(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ParquetPlanWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
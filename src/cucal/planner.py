@@ -0,0 +1,186 @@
+"""
+Stateful, incremental front-end to :func:`cucal.optimizer.optimise_budget`.
+
+Interactive sessions change one knob at a time.  :class:`Planner` keeps
+the previous optimum and the constraints it was found under, and on each
+:meth:`Planner.solve` picks the cheapest way to the new exact answer:
+
+* **reuse** – only reporting inputs changed (``label_rmse``; ``gamma``,
+  cluster efficiency or the wall-clock model without a wall-clock cap), or
+  constraints were tightened and the old optimum is still feasible (it is
+  then still the best point of the smaller feasible set);
+* **incremental** – constraints were only relaxed: search just the newly
+  feasible cells (a diagonal band for a budget increase) and compare with
+  the old optimum;
+* **full** – anything else (costs, curves, granularity, mixed moves, …).
+
+Results are identical to calling ``optimise_budget`` with the same
+arguments.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from .config import DEFAULT_CLUSTER_EFF
+from .model_types import BudgetPlan
+from .optimizer import (
+    _band_blocks,
+    _better,
+    _grid_blocks,
+    _GridProblem,
+    _make_plan,
+    _search_grid,
+)
+
+__all__ = ["Planner"]
+
+_DEFAULTS: Dict[str, Any] = {
+    "label_rmse": 0.0,
+    "gamma": 5,
+    "max_gpu_hours": None,
+    "wall_clock_limit_hours": None,
+    "cluster_efficiency_pct": 100 * DEFAULT_CLUSTER_EFF,
+    "wall_clock_model": None,
+    "granularity": 1,
+    "target_accuracy": None,
+}
+_REQUIRED = ("label_cost", "gpu_cost", "budget", "curve_label", "curve_gpu")
+_CAPS = ("budget", "max_gpu_hours", "wall_clock_limit_hours")
+
+Cell = Tuple[float, int, int, int]          # (acc, spent, label$, gpu$)
+
+
+def _cap(value: Optional[float]) -> float:
+    return float("inf") if value is None else float(value)
+
+
+class Planner:
+    """
+    Remember the last solution and re-solve incrementally.
+
+    >>> planner = Planner(label_cost=0.05, gpu_cost=1.0, budget=100,
+    ...                   curve_label={"a": 0.7, "b": 0.5},
+    ...                   curve_gpu={"a": 0.7, "b": 0.4})
+    >>> plan = planner.solve()               # full solve
+    >>> plan = planner.solve(budget=120)     # band search only
+    >>> planner.last_mode
+    'incremental'
+    """
+
+    def __init__(self, **params: Any) -> None:
+        missing = [k for k in _REQUIRED if k not in params]
+        if missing:
+            raise TypeError(f"missing parameter(s): {', '.join(missing)}")
+        self._params: Dict[str, Any] = {**_DEFAULTS, **params}
+        self._solved: Optional[Dict[str, Any]] = None   # params of last solve
+        self._cell: Optional[Cell] = None
+        self.last_mode: Optional[str] = None
+        self.stats = {"full": 0, "incremental": 0, "reuse": 0}
+
+    # ------------------------------------------------------------------ API
+    @property
+    def params(self) -> Dict[str, Any]:
+        return dict(self._params)
+
+    def update(self, **changes: Any) -> None:
+        """Change parameters without solving yet."""
+        unknown = set(changes) - set(self._params)
+        if unknown:
+            raise TypeError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+        self._params.update(changes)
+
+    def solve(self, **changes: Any) -> Optional[BudgetPlan]:
+        """Apply *changes* and return the optimal plan (or ``None``)."""
+        self.update(**changes)
+        new = dict(self._params)
+        new["budget"] = int(round(new["budget"]))
+        assert new["gamma"] > 0, "γ must be > 0"
+        problem = self._problem(new)
+
+        mode, cell = self._resolve(self._solved, new, problem)
+        self._solved, self._cell, self.last_mode = new, cell, mode
+        self.stats[mode] += 1
+        if cell is None:
+            return None
+        return _make_plan(problem, cell[2], cell[3], new["label_rmse"])
+
+    # -------------------------------------------------------------- helpers
+    @staticmethod
+    def _problem(p: Dict[str, Any]) -> _GridProblem:
+        return _GridProblem(
+            label_cost=p["label_cost"],
+            gpu_cost=p["gpu_cost"],
+            curve_label=p["curve_label"],
+            curve_gpu=p["curve_gpu"],
+            gamma=p["gamma"],
+            max_gpu_hours=p["max_gpu_hours"],
+            wall_clock_limit_hours=p["wall_clock_limit_hours"],
+            efficiency=max(p["cluster_efficiency_pct"], 1.0) / 100.0,
+            wall_clock_model=p["wall_clock_model"],
+        )
+
+    def _full(self, p: Dict[str, Any], problem: _GridProblem) -> Tuple[str, Optional[Cell]]:
+        blocks = _grid_blocks(p["budget"], p["granularity"], problem.max_gpu_dollars())
+        return "full", _search_grid(problem, blocks, p["target_accuracy"])
+
+    def _resolve(
+        self, old: Optional[Dict[str, Any]], new: Dict[str, Any], problem: _GridProblem
+    ) -> Tuple[str, Optional[Cell]]:
+        if old is None:
+            return self._full(new, problem)
+        changed = {k for k in new if new[k] != old[k]}
+        if new["wall_clock_limit_hours"] is None and old["wall_clock_limit_hours"] is None:
+            # without a time cap the time model only affects the reported hours
+            changed -= {"gamma", "cluster_efficiency_pct", "wall_clock_model"}
+        changed.discard("label_rmse")
+        if not changed:
+            return "reuse", self._cell
+        if changed - set(_CAPS):
+            return self._full(new, problem)
+
+        direction = {_cap(new[k]) > _cap(old[k]) for k in changed}
+        if direction == {False}:                                  # tightened
+            if self._cell is None:
+                return "reuse", None
+            if self._still_feasible(new, problem):
+                return "reuse", self._cell
+            return self._full(new, problem)
+        if direction == {True}:                                   # relaxed
+            return "incremental", self._relaxed(old, new, problem)
+        return self._full(new, problem)
+
+    def _still_feasible(self, p: Dict[str, Any], problem: _GridProblem) -> bool:
+        _, spent, lab, gpu = self._cell                          # type: ignore[misc]
+        _, gpu_hours, wall = problem.units(lab, gpu)
+        return spent <= p["budget"] and bool(problem.feasible(gpu_hours, wall))
+
+    def _relaxed(
+        self, old: Dict[str, Any], new: Dict[str, Any], problem: _GridProblem
+    ) -> Optional[Cell]:
+        target = new["target_accuracy"]
+        if set(k for k in _CAPS if new[k] != old[k]) == {"budget"}:
+            # only the budget grew: new cells form the band old < spent ≤ new
+            blocks = _band_blocks(old["budget"], new["budget"], new["granularity"])
+            cand = _search_grid(problem, blocks, target)
+        else:
+            old_problem = self._problem(old)
+
+            def newly_feasible(lab, gpu, gpu_hours, wall):
+                was_ok = old_problem.feasible(gpu_hours, wall)
+                return ~(was_ok & (lab + gpu <= old["budget"]))
+
+            blocks = _grid_blocks(new["budget"], new["granularity"],
+                                  problem.max_gpu_dollars())
+            cand = _search_grid(problem, blocks, target, region=newly_feasible)
+        return _pick(cand, self._cell, target)
+
+
+def _pick(cand: Optional[Cell], best: Optional[Cell], target) -> Optional[Cell]:
+    """Merge two optima; exact ties go to the earlier cell in scan order."""
+    if cand is None:
+        return best
+    if best is None or _better(cand, best, target):
+        return cand
+    if _better(best, cand, target):
+        return best
+    return min(cand, best, key=lambda c: (c[2], c[3]))
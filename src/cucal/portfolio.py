@@ -0,0 +1,233 @@
+"""
+Portfolio optimiser: split one shared budget across many case studies.
+
+Each project has its own label/GPU curves and prices, exactly as for
+:func:`cucal.optimizer.optimise_budget`.  :func:`optimise_portfolio`
+hands out the global budget in ``step``-dollar increments, always to the
+single (project, resource) move with the largest weighted accuracy gain —
+a marginal-gain priority queue.  With the saturating curves used here the
+per-resource gains are diminishing, so greedy allocation is close to the
+Lagrangian optimum, and it costs O(moves · log n) instead of nested grid
+searches.  An optional global GPU-hour pool and the per-project GPU-hour
+and wall-clock caps are respected move by move.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .config import DEFAULT_CLUSTER_EFF
+from .curve_models import DEFAULT_MODEL
+from .curves import _curves
+from .optimizer import _combine, _eval_curve
+
+__all__ = ["Project", "PortfolioResult", "optimise_portfolio", "projects_from_cases"]
+
+_LABEL, _GPU = 0, 1
+
+
+@dataclass(slots=True)
+class Project:
+    """One case study competing for the shared budget."""
+    name: str
+    curve_label: Dict[str, float]
+    curve_gpu: Dict[str, float]
+    label_cost: float                      # $ per instance
+    gpu_cost: float                        # $ per GPU-hour
+    weight: float = 1.0
+    gamma: float = 5
+    max_gpu_hours: Optional[float] = None
+    wall_clock_limit_hours: Optional[float] = None
+    cluster_efficiency_pct: float = 100 * DEFAULT_CLUSTER_EFF
+
+
+@dataclass(slots=True)
+class PortfolioResult:
+    """Per-project allocation (arrays aligned with ``names``) plus totals."""
+    names: List[str]
+    label_dollars: np.ndarray
+    gpu_dollars: np.ndarray
+    labels: np.ndarray
+    gpu_hours: np.ndarray
+    wall_clock_hours: np.ndarray
+    accuracy: np.ndarray
+    weights: np.ndarray
+    step: float
+    objective: float = field(init=False)
+    spent: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.objective = float(np.dot(self.weights, self.accuracy))
+        self.spent = float(self.label_dollars.sum() + self.gpu_dollars.sum())
+
+    def records(self) -> List[Dict[str, float]]:
+        """One dict per project, in the shape ``optimise_budget`` reports."""
+        return [
+            {
+                "project": name,
+                "accuracy": float(self.accuracy[i]),
+                "labels": float(self.labels[i]),
+                "gpu_hours": float(self.gpu_hours[i]),
+                "wall_clock_hours": float(self.wall_clock_hours[i]),
+                "label_dollars": float(self.label_dollars[i]),
+                "gpu_dollars": float(self.gpu_dollars[i]),
+            }
+            for i, name in enumerate(self.names)
+        ]
+
+
+def projects_from_cases(
+    cases: Iterable[str],
+    *,
+    weights: Optional[Sequence[float]] = None,
+    **overrides,
+) -> List[Project]:
+    """Build :class:`Project` s from ``curves.json`` (prices included)."""
+    curves = _curves()
+    projects = []
+    for i, case in enumerate(cases):
+        lbl, gpu = curves[f"{case}-label"], curves[f"{case}-gpu"]
+        kwargs = {
+            "curve_label": lbl["label_curve"],
+            "curve_gpu": gpu["gpu_curve"],
+            "label_cost": lbl["cost_per_unit"],
+            "gpu_cost": gpu["cost_per_unit"],
+            **overrides,
+        }
+        if weights is not None:
+            kwargs["weight"] = weights[i]
+        projects.append(Project(name=case, **kwargs))
+    return projects
+
+
+def optimise_portfolio(
+    projects: Sequence[Project],
+    budget: float,
+    *,
+    gpu_hour_pool: Optional[float] = None,
+    step: Optional[float] = None,
+) -> PortfolioResult:
+    """
+    Allocate *budget* dollars across *projects* to maximise
+    ``Σ weight_i · accuracy_i``.
+
+    Parameters
+    ----------
+    projects
+        Case studies; see :class:`Project`.
+    budget
+        Global $ pool.
+    gpu_hour_pool
+        Optional global cap on GPU-hours summed over all projects.
+    step
+        Dollar increment per move (default: ``budget / (40·n)``, i.e. about
+        forty moves per project).  Less than one step may stay unspent.
+    """
+    n = len(projects)
+    if n == 0:
+        raise ValueError("need at least one project")
+    for p in projects:
+        if {p.curve_label.get("model", DEFAULT_MODEL),
+                p.curve_gpu.get("model", DEFAULT_MODEL)} != {DEFAULT_MODEL}:
+            raise ValueError(f"{p.name}: the portfolio optimiser supports "
+                             f"'{DEFAULT_MODEL}' curves only")
+    step = float(step) if step else budget / (40.0 * n)
+    if step <= 0:
+        raise ValueError("step must be > 0")
+
+    al = [p.curve_label["a"] for p in projects]
+    bl = [p.curve_label["b"] for p in projects]
+    ag = [p.curve_gpu["a"] for p in projects]
+    bg = [p.curve_gpu["b"] for p in projects]
+    w = [float(p.weight) for p in projects]
+    labels_per_dollar = [1.0 / p.label_cost for p in projects]
+    label_h_per_dollar = [1.0 / (p.label_cost * p.gamma) for p in projects]
+    gpu_h_per_dollar = [1.0 / p.gpu_cost if p.gpu_cost else 0.0 for p in projects]
+    eff = [max(p.cluster_efficiency_pct, 1.0) / 100.0 for p in projects]
+    gpu_cap = [math.inf if p.max_gpu_hours is None else p.max_gpu_hours for p in projects]
+    wall_cap = [
+        math.inf if p.wall_clock_limit_hours is None else p.wall_clock_limit_hours
+        for p in projects
+    ]
+
+    lab = [0.0] * n                  # $ given to labels / GPUs so far
+    gpu = [0.0] * n
+    fl = [0.0] * n                   # current per-resource accuracies
+    fg = [0.0] * n
+    version = [0] * n                # invalidates older heap entries
+    pool = math.inf if gpu_hour_pool is None else float(gpu_hour_pool)
+    exp = math.exp
+
+    def moves(i: int):
+        """Heap entries for project *i*'s two possible next moves."""
+        out = []
+        lh = lab[i] * label_h_per_dollar[i]
+        gh = gpu[i] * gpu_h_per_dollar[i]
+        if lh + step * label_h_per_dollar[i] + gh / eff[i] <= wall_cap[i]:
+            nxt = al[i] * (1.0 - exp(-bl[i] * (lab[i] + step) * labels_per_dollar[i]))
+            out.append((-w[i] * (1.0 - fg[i]) * (nxt - fl[i]), i, _LABEL, version[i]))
+        new_gh = gh + step * gpu_h_per_dollar[i]
+        if new_gh <= gpu_cap[i] and lh + new_gh / eff[i] <= wall_cap[i]:
+            nxt = ag[i] * (1.0 - exp(-bg[i] * new_gh))
+            out.append((-w[i] * (1.0 - fl[i]) * (nxt - fg[i]), i, _GPU, version[i]))
+        return out
+
+    heap = [entry for i in range(n) for entry in moves(i)]
+    heapq.heapify(heap)
+    remaining = float(budget)
+    pop, push = heapq.heappop, heapq.heappush
+
+    while heap and remaining >= step:
+        neg_gain, i, kind, ver = pop(heap)
+        if ver != version[i]:
+            continue                                  # stale entry
+        if neg_gain >= 0.0:
+            break                                     # nothing improves any more
+        if kind == _GPU:
+            hours = step * gpu_h_per_dollar[i]
+            if hours > pool:
+                continue                              # the pool never grows back
+            pool -= hours
+            gpu[i] += step
+            fg[i] = ag[i] * (1.0 - exp(-bg[i] * gpu[i] * gpu_h_per_dollar[i]))
+        else:
+            lab[i] += step
+            fl[i] = al[i] * (1.0 - exp(-bl[i] * lab[i] * labels_per_dollar[i]))
+        remaining -= step
+        version[i] += 1
+        for entry in moves(i):
+            push(heap, entry)
+
+    return _result(projects, np.array(lab), np.array(gpu), step)
+
+
+def _result(
+    projects: Sequence[Project], lab: np.ndarray, gpu: np.ndarray, step: float
+) -> PortfolioResult:
+    label_cost = np.array([p.label_cost for p in projects])
+    gpu_cost = np.array([p.gpu_cost for p in projects])
+    gamma = np.array([p.gamma for p in projects], dtype=float)
+    eff = np.array([max(p.cluster_efficiency_pct, 1.0) / 100.0 for p in projects])
+    labels = lab / label_cost
+    gpu_hours = np.divide(gpu, gpu_cost, out=np.zeros_like(gpu), where=gpu_cost != 0)
+    acc = _combine(
+        _eval_curve(np.array([p.curve_label["a"] for p in projects]),
+                    np.array([p.curve_label["b"] for p in projects]), labels),
+        _eval_curve(np.array([p.curve_gpu["a"] for p in projects]),
+                    np.array([p.curve_gpu["b"] for p in projects]), gpu_hours),
+    )
+    return PortfolioResult(
+        names=[p.name for p in projects],
+        label_dollars=lab,
+        gpu_dollars=gpu,
+        labels=labels,
+        gpu_hours=gpu_hours,
+        wall_clock_hours=gpu_hours / eff + labels / gamma,
+        accuracy=acc,
+        weights=np.array([float(p.weight) for p in projects]),
+        step=step,
+    )
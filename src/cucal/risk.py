@@ -0,0 +1,286 @@
+"""
+Monte Carlo risk analysis for budget plans.
+
+``optimise_budget`` treats ``label_cost``, ``gamma``, ``gpu_cost`` and
+``cluster_efficiency_pct`` as exact.  Here each of them may be a
+:class:`Dist`; a plan fixes *what is bought* (labels and GPU-hours at the
+nominal prices) and the simulator draws what it then *costs* and how long
+it *takes*:
+
+    cost = labels · label_cost + gpu_hours · gpu_cost
+    wall = gpu_hours / efficiency + labels / gamma
+
+Draws are generated in NumPy batches from one seeded
+:class:`numpy.random.Generator`, and every candidate plan sees the same
+draws (common random numbers), so comparisons between plans are not
+swamped by sampling noise.
+
+* :func:`simulate_plan` – risk of one plan (10⁶ draws ≈ a fraction of a second);
+* :func:`simulate_plans` – the same for many plans at once;
+* :func:`risk_adjusted_plan` – scan a coarse plan grid and return the
+  plan with the best risk-adjusted accuracy.
+
+"Expected shortfall" is reported as the expected overrun beyond each cap
+(``E[max(cost − budget, 0)]``, in $ and in hours).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .config import DEFAULT_CLUSTER_EFF
+from .optimizer import _grid_blocks, _GridProblem
+
+__all__ = ["Dist", "RiskReport", "simulate_plan", "simulate_plans", "risk_adjusted_plan"]
+
+_BATCH = 1 << 17                 # draws per NumPy pass
+
+
+# ---------------------------------------------------------------------------#
+# Input distributions                                                        #
+# ---------------------------------------------------------------------------#
+@dataclass(slots=True, frozen=True)
+class Dist:
+    """
+    Distribution of one uncertain input.
+
+    ``Dist.normal(0.05, 0.01)``, ``Dist.lognormal(median=5, sigma=0.4)``,
+    ``Dist.uniform(60, 95)``, ``Dist.triangular(3, 5, 9)`` or
+    ``Dist.fixed(1.4)``; plain numbers are treated as fixed.
+    """
+    kind: str
+    params: tuple
+
+    @classmethod
+    def fixed(cls, value: float) -> "Dist":
+        return cls("fixed", (float(value),))
+
+    @classmethod
+    def normal(cls, mean: float, sd: float) -> "Dist":
+        return cls("normal", (float(mean), float(sd)))
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "Dist":
+        return cls("lognormal", (float(median), float(sigma)))
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "Dist":
+        return cls("uniform", (float(low), float(high)))
+
+    @classmethod
+    def triangular(cls, low: float, mode: float, high: float) -> "Dist":
+        return cls("triangular", (float(low), float(mode), float(high)))
+
+    @property
+    def nominal(self) -> float:
+        """Value used to turn plan dollars into quantities."""
+        if self.kind in ("fixed", "normal", "lognormal"):
+            return self.params[0]
+        if self.kind == "uniform":
+            return 0.5 * (self.params[0] + self.params[1])
+        return self.params[1]
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        p = self.params
+        if self.kind == "fixed":
+            return np.full(n, p[0])
+        if self.kind == "normal":
+            return rng.normal(p[0], p[1], n)
+        if self.kind == "lognormal":
+            return p[0] * np.exp(rng.normal(0.0, p[1], n))
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1], n)
+        if self.kind == "triangular":
+            return rng.triangular(p[0], p[1], p[2], n)
+        raise ValueError(f"unknown distribution {self.kind!r}")
+
+
+DistLike = Union[float, Dist, Mapping[str, Any]]
+
+
+def _as_dist(value: DistLike) -> Dist:
+    if isinstance(value, Dist):
+        return value
+    if isinstance(value, Mapping):               # e.g. from JSON: {"normal": [m, sd]}
+        (kind, params), = value.items()
+        return Dist(kind, tuple(float(v) for v in params))
+    return Dist.fixed(value)
+
+
+# ---------------------------------------------------------------------------#
+# Simulation                                                                 #
+# ---------------------------------------------------------------------------#
+@dataclass(slots=True)
+class RiskReport:
+    """Per-plan risk estimates (arrays; length 1 for :func:`simulate_plan`)."""
+    p_over_budget: np.ndarray
+    p_over_time: np.ndarray
+    p_over_any: np.ndarray
+    expected_cost_overrun: np.ndarray       # $, E[max(cost − budget, 0)]
+    expected_time_overrun: np.ndarray       # h,  E[max(wall − limit, 0)]
+    mean_cost: np.ndarray
+    mean_wall_clock_hours: np.ndarray
+    draws: int
+
+    def row(self, i: int = 0) -> Dict[str, float]:
+        return {
+            name: float(getattr(self, name)[i])
+            for name in ("p_over_budget", "p_over_time", "p_over_any",
+                         "expected_cost_overrun", "expected_time_overrun",
+                         "mean_cost", "mean_wall_clock_hours")
+        }
+
+
+def simulate_plans(
+    labels: Sequence[float],
+    gpu_hours: Sequence[float],
+    *,
+    label_cost: DistLike,
+    gpu_cost: DistLike,
+    gamma: DistLike = 5,
+    cluster_efficiency_pct: DistLike = 100 * DEFAULT_CLUSTER_EFF,
+    budget: float,
+    wall_clock_limit_hours: Optional[float] = None,
+    draws: int = 1_000_000,
+    seed: Optional[int] = 0,
+    batch: int = _BATCH,
+) -> RiskReport:
+    """
+    Risk of buying ``labels[k]`` instances and ``gpu_hours[k]`` GPU-hours,
+    for every plan *k*, under the input distributions.
+    """
+    lab = np.asarray(labels, dtype=float)[:, None]
+    gph = np.asarray(gpu_hours, dtype=float)[:, None]
+    k = lab.shape[0]
+    dists = [_as_dist(d) for d in (label_cost, gpu_cost, gamma, cluster_efficiency_pct)]
+    limit = np.inf if wall_clock_limit_hours is None else float(wall_clock_limit_hours)
+    rng = np.random.default_rng(seed)
+    # keep the (plans × batch) work matrices around a few million cells
+    batch = max(1, min(batch, (1 << 22) // max(k, 1)))
+
+    acc = {n: np.zeros(k) for n in ("ob", "ot", "oa", "cost_over", "time_over", "cost",
+                                    "wall")}
+    done = 0
+    while done < draws:
+        n = min(batch, draws - done)
+        lc, gc, gam, eff = (d.sample(rng, n) for d in dists)
+        lc, gc = np.maximum(lc, 0.0), np.maximum(gc, 0.0)
+        gam = np.maximum(gam, 1e-9)
+        eff = np.clip(eff, 1.0, 100.0) / 100.0
+
+        cost = lab * lc + gph * gc                       # (plans, n)
+        wall = gph * (1.0 / eff) + lab * (1.0 / gam)
+        cost_over = np.maximum(cost - budget, 0.0)
+        time_over = np.maximum(wall - limit, 0.0)
+        acc["ob"] += np.count_nonzero(cost_over > 0, axis=1)
+        acc["ot"] += np.count_nonzero(time_over > 0, axis=1)
+        acc["oa"] += np.count_nonzero((cost_over > 0) | (time_over > 0), axis=1)
+        acc["cost_over"] += cost_over.sum(axis=1)
+        acc["time_over"] += time_over.sum(axis=1)
+        acc["cost"] += cost.sum(axis=1)
+        acc["wall"] += wall.sum(axis=1)
+        done += n
+
+    return RiskReport(
+        p_over_budget=acc["ob"] / draws,
+        p_over_time=acc["ot"] / draws,
+        p_over_any=acc["oa"] / draws,
+        expected_cost_overrun=acc["cost_over"] / draws,
+        expected_time_overrun=acc["time_over"] / draws,
+        mean_cost=acc["cost"] / draws,
+        mean_wall_clock_hours=acc["wall"] / draws,
+        draws=draws,
+    )
+
+
+def simulate_plan(plan: Mapping[str, float], **kwargs) -> Dict[str, float]:
+    """
+    Risk of one plan as returned by ``optimise_budget`` (uses its
+    ``labels`` and ``gpu_hours``); keyword arguments as for
+    :func:`simulate_plans`.
+    """
+    report = simulate_plans([plan["labels"]], [plan["gpu_hours"]], **kwargs)
+    return report.row(0)
+
+
+# ---------------------------------------------------------------------------#
+# Risk-adjusted choice                                                       #
+# ---------------------------------------------------------------------------#
+def risk_adjusted_plan(
+    *,
+    label_cost: DistLike,
+    gpu_cost: DistLike,
+    budget: float,
+    curve_label: Dict[str, float],
+    curve_gpu: Dict[str, float],
+    gamma: DistLike = 5,
+    cluster_efficiency_pct: DistLike = 100 * DEFAULT_CLUSTER_EFF,
+    max_gpu_hours: Optional[float] = None,
+    wall_clock_limit_hours: Optional[float] = None,
+    max_exceed_prob: Optional[float] = None,
+    granularity: Optional[int] = None,
+    draws: int = 20_000,
+    seed: Optional[int] = 0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Pick the plan with the best risk-adjusted accuracy.
+
+    Candidates are the grid cells within *budget* at nominal prices (step
+    *granularity*, default ``budget // 40``).  With *max_exceed_prob* the
+    most accurate plan whose probability of breaking any cap is at most
+    that value wins; otherwise the one maximising
+    ``accuracy · (1 − P[over budget or over time])``.  Returns the plan
+    fields plus its risk row and ``score``, or ``None``.
+    """
+    nominal = {name: _as_dist(d).nominal for name, d in
+               (("label_cost", label_cost), ("gpu_cost", gpu_cost), ("gamma", gamma),
+                ("eff", cluster_efficiency_pct))}
+    problem = _GridProblem(
+        label_cost=nominal["label_cost"],
+        gpu_cost=nominal["gpu_cost"],
+        curve_label=curve_label,
+        curve_gpu=curve_gpu,
+        gamma=nominal["gamma"],
+        max_gpu_hours=max_gpu_hours,
+        wall_clock_limit_hours=None,            # handled stochastically
+        efficiency=max(nominal["eff"], 1.0) / 100.0,
+    )
+    budget = int(round(budget))
+    step = granularity or max(1, budget // 40)
+    cells = []
+    for lab, gpu, in_budget in _grid_blocks(budget, step, problem.max_gpu_dollars()):
+        labels, gpu_hours, wall = problem.units(lab, gpu)
+        mask = in_budget & problem.feasible(gpu_hours, wall)
+        rows, cols = np.nonzero(mask)
+        cells.append((lab[rows, 0], gpu[0, cols]))
+    if not cells:                                # negative budget: nothing to buy
+        return None
+    lab_d = np.concatenate([c[0] for c in cells]).astype(float)
+    gpu_d = np.concatenate([c[1] for c in cells]).astype(float)
+    labels, gpu_hours, _ = problem.units(lab_d, gpu_d)
+    accuracy = problem.accuracy(labels, gpu_hours)
+
+    report = simulate_plans(
+        labels, gpu_hours,
+        label_cost=label_cost, gpu_cost=gpu_cost, gamma=gamma,
+        cluster_efficiency_pct=cluster_efficiency_pct, budget=budget,
+        wall_clock_limit_hours=wall_clock_limit_hours, draws=draws, seed=seed,
+    )
+    if max_exceed_prob is not None:
+        score = np.where(report.p_over_any <= max_exceed_prob, accuracy, -np.inf)
+    else:
+        score = accuracy * (1.0 - report.p_over_any)
+    best = int(np.argmax(score))
+    if not np.isfinite(score[best]):
+        return None
+    return {
+        "accuracy": float(accuracy[best]),
+        "labels": float(labels[best]),
+        "gpu_hours": float(gpu_hours[best]),
+        "label_dollars": float(lab_d[best]),
+        "gpu_dollars": float(gpu_d[best]),
+        "score": float(score[best]),
+        **report.row(best),
+    }
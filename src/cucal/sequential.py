@@ -0,0 +1,193 @@
+"""
+Multi-round (label → train → label → …) planning by dynamic programming.
+
+:func:`cucal.optimizer.optimise_budget` picks one static split.  When a
+project runs several active-learning style rounds, each round buys some
+more labels and some more GPU time, and the model is evaluated after every
+round.  :func:`plan_rounds` chooses the per-round spend that maximises
+
+    Σ_r  round_weight_r · accuracy(cumulative labels_r, cumulative GPU-h_r)
+
+under the overall budget, GPU-hour and wall-clock caps, and optional
+per-round spending caps.
+
+The DP state is the cumulative (label $, GPU $) spent so far on a
+``step``-dollar lattice — equivalently (remaining $, remaining hours),
+since both follow from it.  Each backward step is a window maximum of the
+next round's value array (a reversed running maximum, or a separable
+sliding-window maximum when per-round caps apply), so a round costs a few
+NumPy passes over the lattice instead of nested loops over transitions.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import DEFAULT_CLUSTER_EFF
+from .optimizer import _GridProblem
+
+__all__ = ["SequentialPlan", "plan_rounds"]
+
+
+@dataclass(slots=True)
+class SequentialPlan:
+    """Per-round schedule returned by :func:`plan_rounds`."""
+    rounds: List[Dict[str, float]]          # one dict per round, see plan_rounds
+    objective: float                        # Σ weight · accuracy after each round
+    step: float                             # $ lattice spacing used
+
+    @property
+    def final(self) -> Dict[str, float]:
+        """Cumulative state after the last round."""
+        return self.rounds[-1]
+
+
+# ---------------------------------------------------------------------------#
+# Window maxima                                                              #
+# ---------------------------------------------------------------------------#
+def _forward_max(values: np.ndarray, axis: int, width: Optional[int]) -> np.ndarray:
+    """
+    ``out[i] = max(values[i : i + width + 1])`` along *axis* (``-inf``
+    padded); ``width=None`` means "to the end" (reversed running maximum).
+    """
+    if width is None:
+        flipped = np.flip(values, axis)
+        return np.flip(np.maximum.accumulate(flipped, axis=axis), axis)
+    out = values.copy()
+    size = values.shape[axis]
+    span = 1                                   # out[i] = max(values[i:i+span])
+    while span < width + 1:
+        shift = min(span, width + 1 - span)
+        if shift >= size:
+            break
+        head = [slice(None)] * values.ndim
+        tail = [slice(None)] * values.ndim
+        head[axis] = slice(0, size - shift)
+        tail[axis] = slice(shift, size)
+        np.maximum(out[tuple(head)], out[tuple(tail)], out=out[tuple(head)])
+        span += shift
+    return out
+
+
+def _window_max(values: np.ndarray, wl: Optional[int], wg: Optional[int]) -> np.ndarray:
+    """Maximum over the (label, GPU) window reachable from each state."""
+    return _forward_max(_forward_max(values, 0, wl), 1, wg)
+
+
+# ---------------------------------------------------------------------------#
+# Planner                                                                    #
+# ---------------------------------------------------------------------------#
+def plan_rounds(
+    *,
+    label_cost: float,
+    gpu_cost: float,
+    budget: float,
+    curve_label: Dict[str, float],
+    curve_gpu: Dict[str, float],
+    rounds: int,
+    round_weights: Optional[Sequence[float]] = None,
+    gamma: float = 5,
+    max_gpu_hours: Optional[float] = None,
+    wall_clock_limit_hours: Optional[float] = None,
+    cluster_efficiency_pct: float = 100 * DEFAULT_CLUSTER_EFF,
+    max_label_dollars_per_round: Optional[float] = None,
+    max_gpu_dollars_per_round: Optional[float] = None,
+    step: Optional[float] = None,
+) -> SequentialPlan:
+    """
+    Split *budget* over *rounds* label-then-train rounds.
+
+    Parameters
+    ----------
+    label_cost, gpu_cost, curve_label, curve_gpu, gamma, max_gpu_hours,
+    wall_clock_limit_hours, cluster_efficiency_pct
+        As for :func:`cucal.optimizer.optimise_budget`; the caps apply to
+        the cumulative totals.
+    rounds
+        Number of rounds (≥ 1).
+    round_weights
+        Weight of the accuracy measured after each round (default: all 1,
+        i.e. the area under the learning curve).  ``[0, …, 0, 1]`` only
+        scores the final model.
+    max_label_dollars_per_round, max_gpu_dollars_per_round
+        Optional per-round spending caps.
+    step
+        Lattice spacing in $ (default ``budget / 200``; a zero budget
+        yields the plan that spends nothing in every round).
+
+    Returns
+    -------
+    SequentialPlan
+        ``rounds[r]`` holds the round's spend (``label_dollars``,
+        ``gpu_dollars``) and the cumulative state after it
+        (``cum_label_dollars``, ``cum_gpu_dollars``, ``labels``,
+        ``gpu_hours``, ``wall_clock_hours``, ``accuracy``).
+    """
+    assert gamma > 0, "γ must be > 0"
+    if rounds < 1:
+        raise ValueError("rounds must be >= 1")
+    weights = np.ones(rounds) if round_weights is None else np.asarray(round_weights, float)
+    if weights.shape != (rounds,):
+        raise ValueError("round_weights must have one entry per round")
+    if budget < 0:
+        raise ValueError("budget must be >= 0")
+    if not step:
+        # a zero budget is a one-cell lattice: every round spends nothing
+        step = budget / 200.0 if budget > 0 else 1.0
+    step = float(step)
+    if step <= 0:
+        raise ValueError("step must be > 0")
+
+    problem = _GridProblem(
+        label_cost=label_cost,
+        gpu_cost=gpu_cost,
+        curve_label=curve_label,
+        curve_gpu=curve_gpu,
+        gamma=gamma,
+        max_gpu_hours=max_gpu_hours,
+        wall_clock_limit_hours=wall_clock_limit_hours,
+        efficiency=max(cluster_efficiency_pct, 1.0) / 100.0,
+    )
+    n = int(np.floor(budget / step + 1e-9))
+    dollars = np.arange(n + 1) * step
+    lab, gpu = dollars[:, None], dollars[None, :]
+    labels, gpu_hours, wall = problem.units(lab, gpu)
+    idx = np.arange(n + 1)
+    ok = (idx[:, None] + idx[None, :] <= n) & problem.feasible(gpu_hours, wall)
+    acc = np.broadcast_to(problem.accuracy(labels, gpu_hours), ok.shape)
+
+    def width(cap: Optional[float]) -> Optional[int]:
+        return None if cap is None else int(np.floor(cap / step + 1e-9))
+
+    wl, wg = width(max_label_dollars_per_round), width(max_gpu_dollars_per_round)
+
+    # backward pass: value[r][s] = best score of rounds r.. when round r ends in s
+    value: List[np.ndarray] = [None] * rounds            # type: ignore[list-item]
+    value[-1] = np.where(ok, weights[-1] * acc, -np.inf)
+    for r in range(rounds - 2, -1, -1):
+        value[r] = np.where(ok, weights[r] * acc, -np.inf) + _window_max(value[r + 1], wl, wg)
+
+    # forward pass: follow the arg-max windows from the empty state
+    out: List[Dict[str, float]] = []
+    i = j = 0
+    for r in range(rounds):
+        window = value[r][i:i + (n + 1 if wl is None else wl + 1),
+                          j:j + (n + 1 if wg is None else wg + 1)]
+        di, dj = np.unravel_index(int(np.argmax(window)), window.shape)
+        ni, nj = i + int(di), j + int(dj)
+        out.append({
+            "round": r + 1,
+            "label_dollars": (ni - i) * step,
+            "gpu_dollars": (nj - j) * step,
+            "cum_label_dollars": ni * step,
+            "cum_gpu_dollars": nj * step,
+            "labels": float(labels[ni, 0]),
+            "gpu_hours": float(gpu_hours[0, nj]),
+            "wall_clock_hours": float(wall[ni, nj]),
+            "accuracy": float(acc[ni, nj]),
+        })
+        i, j = ni, nj
+    objective = float(np.dot(weights, [row["accuracy"] for row in out]))
+    return SequentialPlan(rounds=out, objective=objective, step=step)
@@ -0,0 +1,462 @@
+"""
+Local HTTP planning service.
+
+    python -m cucal.serve --port 8765 --workers 4
+
+JSON in, JSON out::
+
+    POST /optimise   optimise_budget kwargs; "case" may replace the curves
+    POST /frontier   the same plus "budgets": [...]
+    POST /allocate   {"demand", "resource_ids", "capacities": {id: units}}
+    GET  /health     liveness + batching counters
+
+Malformed requests (bad JSON, unknown or missing fields) get ``400``
+before anything is queued; a failure while computing an answer is ``500``.
+
+Concurrent requests are collected for ``--window-ms`` into micro-batches
+and run on a process pool.  Identical in-flight queries are coalesced onto
+one computation, ``/optimise`` requests that differ only in budget are
+answered by a single :func:`budget_frontier` pass, and once
+``--max-pending`` distinct queries are waiting new ones get ``503``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from collections.abc import Mapping
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .curves import get_curves
+from .optimizer import budget_frontier, optimise_allocation, optimise_budget
+from .wall_clock import as_wall_clock_model
+
+__all__ = ["ExecutionError", "MicroBatcher", "Overloaded", "PlanningServer", "main"]
+
+_log = logging.getLogger(__name__)
+
+_BUDGET_PARAMS = {
+    name for name in inspect.signature(optimise_budget).parameters
+    if name != "should_stop"
+}
+_BUDGET_REQUIRED = {
+    name for name, p in inspect.signature(optimise_budget).parameters.items()
+    if p.default is inspect.Parameter.empty
+}
+# numeric optimise_budget fields: (integer?, may be null?, lower bound, bound inclusive?)
+_NUMBERS = {
+    "label_cost": (False, False, 0.0, False),
+    "gpu_cost": (False, False, 0.0, True),
+    "budget": (False, False, None, True),
+    "label_rmse": (False, False, 0.0, True),
+    "gamma": (False, False, 0.0, False),
+    "max_gpu_hours": (False, True, 0.0, True),
+    "wall_clock_limit_hours": (False, True, 0.0, True),
+    "cluster_efficiency_pct": (False, False, 0.0, False),
+    "granularity": (True, False, 1.0, True),
+    "target_accuracy": (False, True, None, True),
+}
+_MAX_BODY = 1 << 20
+
+
+class Overloaded(RuntimeError):
+    """Raised when the pending-query queue is full (HTTP 503)."""
+
+
+class ExecutionError(RuntimeError):
+    """A query failed while being computed (HTTP 500)."""
+
+
+# ---------------------------------------------------------------------------#
+# Request normalisation (main process)                                       #
+# ---------------------------------------------------------------------------#
+def _number(name: str, value: Any, integer: bool = False) -> float:
+    """JSON number (or numeric string) → float / int; ``ValueError`` otherwise."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"'{name}' must be a number")
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"'{name}' must be finite")
+    if integer:
+        if number != int(number):
+            raise ValueError(f"'{name}' must be an integer")
+        return int(number)
+    return number
+
+
+def _check_numbers(payload: Dict[str, Any]) -> None:
+    for name, (integer, nullable, low, inclusive) in _NUMBERS.items():
+        if name not in payload or (nullable and payload[name] is None):
+            continue
+        value = payload[name] = _number(name, payload[name], integer)
+        if low is not None and (value < low or (value == low and not inclusive)):
+            raise ValueError(f"'{name}' must be {'>=' if inclusive else '>'} {low:g}")
+    for name in ("curve_label", "curve_gpu"):
+        if name in payload and not isinstance(payload[name], dict):
+            raise ValueError(f"'{name}' must be an object")
+
+
+def _budget_kwargs(
+    payload: Dict[str, Any], extra: Tuple[str, ...] = (), required: set = _BUDGET_REQUIRED
+) -> Dict[str, Any]:
+    payload = dict(payload)
+    case = payload.pop("case", None)
+    if case is not None:
+        payload["curve_label"], payload["curve_gpu"] = get_curves(case)
+    unknown = set(payload) - _BUDGET_PARAMS - set(extra)
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(sorted(unknown))}")
+    missing = set(required) - set(payload)
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(sorted(missing))}")
+    _check_numbers(payload)
+    if payload.get("wall_clock_model") is not None:
+        payload["wall_clock_model"] = as_wall_clock_model(payload["wall_clock_model"])
+    return payload
+
+
+def normalise(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a request body and resolve ``case`` into curve dicts."""
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+    if kind == "optimise":
+        return _budget_kwargs(payload)
+    if kind == "frontier":
+        out = _budget_kwargs(payload, extra=("budgets",),
+                             required=(_BUDGET_REQUIRED - {"budget"}) | {"budgets"})
+        out.pop("budget", None)
+        if not isinstance(out["budgets"], list):
+            raise ValueError("'budgets' must be a list")
+        out["budgets"] = [_number("budgets", b) for b in out["budgets"]]
+        return out
+    if kind == "allocate":
+        missing = {"demand", "resource_ids", "capacities"} - set(payload)
+        if missing:
+            raise ValueError(f"missing field(s): {', '.join(sorted(missing))}")
+        out = dict(payload)
+        out["demand"] = _number("demand", out["demand"])
+        ids = out["resource_ids"]
+        ids = [ids] if isinstance(ids, str) else ids
+        if not isinstance(ids, list) or not all(isinstance(r, str) for r in ids):
+            raise ValueError("'resource_ids' must be a string or a list of strings")
+        if not isinstance(out["capacities"], dict):
+            raise ValueError("'capacities' must be an object")
+        out["capacities"] = {rid: _number("capacities", cap)
+                             for rid, cap in out["capacities"].items()}
+        unknown = set(ids) - set(out["capacities"])
+        if unknown:
+            raise ValueError(f"no capacity for resource(s): {', '.join(sorted(unknown))}")
+        return out
+    raise KeyError(kind)
+
+
+# ---------------------------------------------------------------------------#
+# Batch execution (worker processes)                                         #
+# ---------------------------------------------------------------------------#
+def _run_one(kind: str, params: Dict[str, Any]) -> Any:
+    if kind == "optimise":
+        return optimise_budget(**params)
+    if kind == "frontier":
+        budgets = params.pop("budgets")
+        return budget_frontier(budgets, **params)
+    caps = params["capacities"]
+    plan = optimise_allocation(
+        demand=params["demand"],
+        resource_ids=params["resource_ids"],
+        capacity_for=lambda rid: caps[rid],
+    )
+    return asdict(plan)
+
+
+def run_batch(items: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+    """
+    Execute one micro-batch; returns ``(ok, result_or_error)`` per item.
+
+    ``/optimise`` items sharing everything but the budget are answered
+    together by one :func:`budget_frontier` call.
+    """
+    out: List[Optional[Tuple[bool, Any]]] = [None] * len(items)
+    groups: Dict[str, List[int]] = {}
+    for i, (kind, params) in enumerate(items):
+        if kind == "optimise" and "budget" in params:
+            rest = {k: v for k, v in params.items() if k != "budget"}
+            groups.setdefault(json.dumps(rest, sort_keys=True, default=str), []).append(i)
+
+    for idx in groups.values():
+        if len(idx) < 2:
+            continue
+        params = {k: v for k, v in items[idx[0]][1].items() if k != "budget"}
+        try:
+            plans = budget_frontier([items[i][1]["budget"] for i in idx], **params)
+            for i, plan in zip(idx, plans):
+                out[i] = (True, plan)
+        except Exception:                   # answered one-by-one below
+            _log.warning("grouped frontier for %d queries failed; solving them singly",
+                         len(idx), exc_info=True)
+
+    for i, (kind, params) in enumerate(items):
+        if out[i] is not None:
+            continue
+        try:
+            out[i] = (True, _run_one(kind, dict(params)))
+        except Exception as exc:
+            out[i] = (False, f"{type(exc).__name__}: {exc}")
+    return out  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------#
+# Micro-batcher (event loop)                                                 #
+# ---------------------------------------------------------------------------#
+class MicroBatcher:
+    """Collect queries for *window* seconds, coalesce duplicates, run in a pool."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        *,
+        window: float = 0.005,
+        max_batch: int = 64,
+        max_pending: int = 1024,
+        max_inflight_batches: int = 8,
+    ) -> None:
+        self._executor = executor
+        self._window = window
+        self._max_batch = max_batch
+        self._max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_inflight_batches)
+        self._queue: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.stats = {"requests": 0, "coalesced": 0, "batches": 0, "rejected": 0}
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Any:
+        self.stats["requests"] += 1
+        key = kind + json.dumps(params, sort_keys=True, default=str)
+        fut = self._waiters.get(key)
+        if fut is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if len(self._waiters) >= self._max_pending:
+                self.stats["rejected"] += 1
+                raise Overloaded("too many pending queries")
+            loop = asyncio.get_running_loop()
+            fut = loop.create_future()
+            self._waiters[key] = fut
+            self._queue.append((key, kind, params))
+            if len(self._queue) >= self._max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self._window, self._flush)
+        # shield: one client going away must not cancel a shared computation
+        return await asyncio.shield(fut)
+
+    @property
+    def pending(self) -> int:
+        return len(self._waiters)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        async with self._slots:
+            self.stats["batches"] += 1
+            items = [(kind, params) for _, kind, params in batch]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, run_batch, items
+                )
+            except Exception as exc:                       # pool died, pickling …
+                results = [(False, f"{type(exc).__name__}: {exc}")] * len(batch)
+        for (key, _, _), (ok, value) in zip(batch, results):
+            fut = self._waiters.pop(key)
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(ExecutionError(value))
+
+
+# ---------------------------------------------------------------------------#
+# HTTP front-end                                                             #
+# ---------------------------------------------------------------------------#
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 431: "Request Header Fields Too Large",
+            500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+def _to_json(obj: Any) -> bytes:
+    def default(o):
+        if hasattr(o, "item"):          # NumPy scalars
+            return o.item()
+        if isinstance(o, Mapping):      # BudgetPlan
+            return dict(o)
+        raise TypeError(f"not JSON serialisable: {type(o).__name__}")
+    return json.dumps(obj, default=default).encode()
+
+
+class PlanningServer:
+    """Minimal HTTP/1.1 (keep-alive) server in front of a :class:`MicroBatcher`."""
+
+    def __init__(self, batcher: MicroBatcher) -> None:
+        self.batcher = batcher
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/health":
+            return 200, {"status": "ok", "pending": self.batcher.pending,
+                         **self.batcher.stats}
+        kind = path.strip("/")
+        if kind not in ("optimise", "frontier", "allocate"):
+            return 404, {"error": f"no route {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            params = normalise(kind, json.loads(body or b"{}"))
+        except (ValueError, KeyError) as exc:
+            return 400, {"error": str(exc)}
+        try:
+            return 200, await self.batcher.submit(kind, params)
+        except Overloaded as exc:
+            return 503, {"error": str(exc)}
+        except ExecutionError as exc:
+            _log.error("%s %s failed: %s", method, path, exc)
+            return 500, {"error": str(exc)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:           # request line longer than the stream limit
+                    await self._reply(writer, 400, {"error": "request line too long"}, False)
+                    break
+                if not line:
+                    break
+                try:
+                    method, path, version = line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers: Dict[str, str] = {}
+                oversized = False
+                while True:
+                    try:
+                        h = await reader.readline()
+                    except ValueError:       # header line over the limit
+                        oversized = True
+                        break
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if oversized:
+                    await self._reply(writer, 431, {"error": "header line too long"}, False)
+                    break
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # the body cannot be framed, so the connection cannot be reused
+                    status, payload = 400, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > _MAX_BODY:
+                    status, payload = 413, {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.route(method.upper(), path, body)
+                    keep_alive = (
+                        version == "HTTP/1.1"
+                        and headers.get("connection", "").lower() != "close"
+                    )
+
+                await self._reply(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _reply(
+        writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool
+    ) -> None:
+        data = _to_json(payload)
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            + ("Retry-After: 1\r\n" if status == 503 else "")
+            + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+async def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    *,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+    **batch_opts: Any,
+) -> Tuple[asyncio.AbstractServer, PlanningServer]:
+    """Start listening; returns the asyncio server and the app object."""
+    executor = executor or ProcessPoolExecutor(max_workers=workers)
+    app = PlanningServer(MicroBatcher(executor, **batch_opts))
+    server = await asyncio.start_server(app.handle, host, port, limit=_MAX_BODY)
+    return server, app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Cost-Utility planning service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, help="Process-pool size (default: CPUs)")
+    ap.add_argument("--window-ms", type=float, default=5.0,
+                    help="Micro-batch collection window")
+    ap.add_argument("--max-batch", type=int, default=64)
+    ap.add_argument("--max-pending", type=int, default=1024,
+                    help="Distinct queued/in-flight queries before 503")
+    args = ap.parse_args(argv)
+
+    async def _serve() -> None:
+        server, _ = await start_server(
+            args.host,
+            args.port,
+            workers=args.workers,
+            window=args.window_ms / 1000.0,
+            max_batch=args.max_batch,
+            max_pending=args.max_pending,
+        )
+        print(f"cucal.serve listening on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
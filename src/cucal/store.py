@@ -0,0 +1,328 @@
+"""
+Partitioned, memory-mapped store for optimiser results.
+
+Layout (one directory per partition, one directory per written part)::
+
+    root/
+      case=Dragut-2019/
+        bucket=0/         # budgets in [0, budget_bucket)
+          part-<uuid>/
+            accuracy.npy  wall_clock_hours.npy  budget.npy  …
+            stats.json    # rows, exact budget range, column dtypes, min/max
+
+Rows are partitioned by case and by ``budget`` bucket when they are
+appended, and each part is written to a temporary directory that is then
+renamed into place.  A query
+
+* skips partitions whose case cannot match,
+* skips parts whose min/max statistics (``budget`` included) rule the
+  predicates out,
+* memory-maps only the columns it filters on or returns, and scans them in
+  fixed-size row chunks.
+
+So memory use depends on the chunk size and the selected rows, not on the
+size of the store.
+
+Parts may have different columns (e.g. plain plan tables next to sweep
+shards with their axis columns): a column a part lacks reads as NaN (``""``
+for text columns), so predicates on it never match there except ``!=``.
+
+>>> store = ResultStore("results/")
+>>> store.append(table, case="Dragut-2019")          # PlanTable or dict of arrays
+>>> store.best_per_case(where=[("wall_clock_hours", "<", 48), ("accuracy", ">", 0.8)])
+"""
+from __future__ import annotations
+
+import json
+import operator
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .plan_table import PlanTable
+
+__all__ = ["ResultStore", "ingest_sweep"]
+
+Predicate = Tuple[str, str, float]
+
+_OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+_CHUNK_ROWS = 1 << 21
+
+
+def _may_match(op: str, value: float, lo: float, hi: float) -> bool:
+    """Can any x in [lo, hi] satisfy ``x <op> value``?"""
+    if op == "<":
+        return lo < value
+    if op == "<=":
+        return lo <= value
+    if op == ">":
+        return hi > value
+    if op == ">=":
+        return hi >= value
+    if op == "==":
+        return lo <= value <= hi
+    return not (lo == hi == value)                 # "!="
+
+
+def _safe_name(case: str) -> str:
+    if not case or "/" in case or case in (".", ".."):
+        raise ValueError(f"invalid case name {case!r}")
+    return case
+
+
+@dataclass(slots=True, frozen=True)
+class _Part:
+    case: str
+    path: Path
+    rows: int
+    dtypes: Dict[str, str]
+    lo: Dict[str, float]
+    hi: Dict[str, float]
+
+    def may_match(self, where: Sequence[Predicate]) -> bool:
+        for col, op, value in where:
+            if col not in self.dtypes:              # all NaN here
+                if op != "!=":
+                    return False
+                continue
+            if col not in self.lo:                  # no stats (e.g. all-NaN column)
+                continue
+            if not _may_match(op, value, self.lo[col], self.hi[col]):
+                return False
+        return True
+
+    def column(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    def take(self, name: str, rows: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """``column(name)[rows]``, or fill values when this part lacks it."""
+        if name in self.dtypes:
+            return np.asarray(self.column(name)[rows])
+        return np.full(len(rows), "" if dtype.kind == "U" else np.nan)
+
+
+class ResultStore:
+    """Append-only columnar store partitioned by case and budget range."""
+
+    def __init__(self, root: Union[str, os.PathLike], *, budget_bucket: float = 1000.0) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget_bucket = float(budget_bucket)
+        self._parts: Optional[List[_Part]] = None
+
+    # ---------------------------------------------------------------- write
+    def append(
+        self,
+        table: Union[PlanTable, Mapping[str, Any]],
+        *,
+        case: Optional[str] = None,
+    ) -> int:
+        """
+        Add rows; *table* needs a ``budget`` column and either a ``case``
+        string column or the *case* argument.  Returns rows written.
+        """
+        cols = {k: np.asarray(v) for k, v in
+                (table.columns if isinstance(table, PlanTable) else table).items()}
+        if "budget" not in cols:
+            raise ValueError("results need a 'budget' column to be partitioned")
+        n = len(cols["budget"])
+        cases = cols.pop("case", None)
+        if cases is None:
+            if case is None:
+                raise ValueError("give case= or a 'case' column")
+            cases = np.full(n, case)
+        bucket = np.floor(cols["budget"].astype(float) / self.budget_bucket)
+
+        written = 0
+        for name in np.unique(cases):
+            for b in np.unique(bucket[cases == name]):
+                rows = np.flatnonzero((cases == name) & (bucket == b))
+                self._write_part(str(name), float(b), {k: v[rows] for k, v in cols.items()})
+                written += rows.size
+        self._parts = None
+        return written
+
+    def _write_part(self, case: str, bucket: float, cols: Dict[str, np.ndarray]) -> None:
+        part_dir = self.root / f"case={_safe_name(case)}" / f"bucket={int(bucket)}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        tmp = part_dir / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            stats: Dict[str, Any] = {
+                "rows": int(len(cols["budget"])),
+                "budget_lo": bucket * self.budget_bucket,
+                "budget_hi": (bucket + 1) * self.budget_bucket,
+                "columns": {name: values.dtype.str for name, values in cols.items()},
+                "min": {},
+                "max": {},
+            }
+            for name, values in cols.items():
+                if values.dtype.kind in "biuf" and values.size:
+                    finite = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+                    if finite.size:
+                        stats["min"][name] = float(finite.min())
+                        stats["max"][name] = float(finite.max())
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(values), allow_pickle=False)
+            (tmp / "stats.json").write_text(json.dumps(stats))
+            os.replace(tmp, part_dir / f"part-{uuid.uuid4().hex}")
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    # ---------------------------------------------------------- catalogue
+    def parts(self) -> List[_Part]:
+        """All committed parts (cached until the next append/refresh)."""
+        if self._parts is None:
+            parts = []
+            for case_dir in sorted(self.root.glob("case=*")):
+                case = case_dir.name[len("case="):]
+                for part in sorted(case_dir.glob("bucket=*/part-*")):
+                    stats = json.loads((part / "stats.json").read_text())
+                    parts.append(_Part(case, part, stats["rows"], stats["columns"],
+                                       stats["min"], stats["max"]))
+            self._parts = parts
+        return self._parts
+
+    def refresh(self) -> None:
+        self._parts = None
+
+    def __len__(self) -> int:
+        return sum(p.rows for p in self.parts())
+
+    def cases(self) -> List[str]:
+        return sorted({p.case for p in self.parts()})
+
+    def _candidates(self, where: Sequence[Predicate], cases: Optional[Iterable[str]]):
+        for col, op, _ in where:
+            if op not in _OPS:
+                raise ValueError(f"unsupported operator {op!r} for {col!r}")
+        wanted = None if cases is None else set(cases)
+        for part in self.parts():
+            if wanted is not None and part.case not in wanted:
+                continue
+            if part.may_match(where):
+                yield part
+
+    def _columns(self, columns: Optional[Sequence[str]]) -> Dict[str, np.dtype]:
+        """``{name: stored dtype}`` to return: *columns*, or every stored column."""
+        dtypes: Dict[str, np.dtype] = {}
+        for part in self.parts():
+            for name, dtype in part.dtypes.items():
+                dtypes.setdefault(name, np.dtype(dtype))
+        if columns is None:
+            return dtypes
+        unknown = [name for name in columns if name not in dtypes]
+        if unknown:
+            raise ValueError(f"no stored part has column(s) {', '.join(unknown)}")
+        return {name: dtypes[name] for name in columns}
+
+    # ---------------------------------------------------------------- read
+    def _scan(
+        self, where: Sequence[Predicate], cases: Optional[Iterable[str]], chunk_rows: int
+    ) -> Iterator[Tuple[_Part, int, np.ndarray]]:
+        """Yield ``(part, chunk_start, matching_row_offsets)`` per chunk."""
+        for part in self._candidates(where, cases):
+            # _candidates only lets through missing columns under "!=", which NaN passes
+            filters = [(part.column(col), _OPS[op], value) for col, op, value in where
+                       if col in part.dtypes]
+            for start in range(0, part.rows, chunk_rows):
+                stop = min(start + chunk_rows, part.rows)
+                mask = np.ones(stop - start, dtype=bool)
+                for values, op, value in filters:
+                    mask &= op(values[start:stop], value)
+                hits = np.flatnonzero(mask)
+                if hits.size:
+                    yield part, start, hits
+
+    def query(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        where: Sequence[Predicate] = (),
+        *,
+        cases: Optional[Iterable[str]] = None,
+        chunk_rows: int = _CHUNK_ROWS,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rows matching every ``(column, op, value)`` in *where* (ops ``< <=
+        > >= == !=``), restricted to *cases*; returns the requested
+        *columns* (default: every stored column) plus ``case``, all of the
+        same length (zero-length arrays of the stored dtypes when nothing
+        matches).  Raises ``ValueError`` for a column no part has.
+        """
+        dtypes = self._columns(columns)
+        out: Dict[str, List[np.ndarray]] = {name: [] for name in (*dtypes, "case")}
+        for part, start, hits in self._scan(list(where), cases, chunk_rows):
+            for name, dtype in dtypes.items():
+                out[name].append(part.take(name, start + hits, dtype))
+            out["case"].append(np.full(hits.size, part.case))
+        if not out["case"]:
+            return {**{name: np.empty(0, dtype) for name, dtype in dtypes.items()},
+                    "case": np.empty(0, dtype=str)}
+        return {k: np.concatenate(v) for k, v in out.items()}
+
+    def count(self, where: Sequence[Predicate] = (), *, cases=None) -> int:
+        return sum(h.size for _, _, h in self._scan(list(where), cases, _CHUNK_ROWS))
+
+    def best_per_case(
+        self,
+        where: Sequence[Predicate] = (),
+        *,
+        by: str = "accuracy",
+        columns: Optional[Sequence[str]] = None,
+        cases: Optional[Iterable[str]] = None,
+        chunk_rows: int = _CHUNK_ROWS,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        ``{case: row}`` with the largest *by* among matching rows; only the
+        winning row of each chunk is materialised.
+        """
+        dtypes = self._columns(columns)
+        self._columns([by])
+        best: Dict[str, Tuple[float, _Part, int]] = {}
+        for part, start, hits in self._scan(list(where), cases, chunk_rows):
+            if by not in part.dtypes:
+                continue
+            values = np.asarray(part.column(by)[start + hits], dtype=float)
+            if np.all(np.isnan(values)):
+                continue
+            i = int(np.nanargmax(values))
+            if part.case not in best or values[i] > best[part.case][0]:
+                best[part.case] = (float(values[i]), part, start + int(hits[i]))
+        result = {}
+        for case, (_, part, row) in sorted(best.items()):
+            result[case] = {name: part.take(name, np.array([row]), dtype)[0].item()
+                            for name, dtype in dtypes.items()}
+        return result
+
+
+def ingest_sweep(
+    sweep_dir: Union[str, os.PathLike], store: ResultStore, *, case: Optional[str] = None
+) -> int:
+    """
+    Append every finished shard of a :mod:`cucal.sweep` run to *store*.
+    ``budget`` and ``case`` come from the shard columns when they are sweep
+    axes, otherwise from the spec's base parameters (or *case*).
+    """
+    from .sweep import SweepSpec, _read_manifest, iter_shards
+
+    base = SweepSpec.from_json(_read_manifest(Path(sweep_dir))["spec"]).base
+    case = case if case is not None else base.get("case")
+    rows = 0
+    for table in iter_shards(sweep_dir, allow_partial=True):
+        cols = dict(table.columns)
+        if "budget" not in cols:
+            cols["budget"] = np.full(len(cols["scenario"]), float(base["budget"]))
+        rows += store.append(cols, case=case)
+    return rows
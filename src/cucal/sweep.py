@@ -0,0 +1,457 @@
+"""
+Checkpointed, resumable parameter sweeps over ``optimise_budget``.
+
+    python -m cucal.sweep run   spec.json /shared/sweep-42      # on every host
+    python -m cucal.sweep status /shared/sweep-42
+    python -m cucal.sweep merge /shared/sweep-42 results.parquet
+
+A :class:`SweepSpec` is a set of base ``optimise_budget`` kwargs plus named
+axes; the scenario space is their Cartesian product (last axis fastest)
+cut into fixed-size shards, so shard *k* is the same scenarios on every
+host and every restart.  The checkpoint directory holds
+
+* ``manifest.json`` – the spec and its hash; a different spec pointed at the
+  same directory is refused;
+* ``locks/shard-NNNNN.lock`` – claimed with ``O_CREAT | O_EXCL`` and
+  touched by a background thread every ``stale_after / 4`` seconds while
+  the shard runs (however long one frontier pass takes); a lock older than
+  ``stale_after`` seconds (pre-empted host) is broken with an atomic rename
+  and the shard is claimed again.  Each lock holds a random owner token, and
+  a worker only refreshes or releases a lock that still holds its own
+  token, so a stalled worker cannot extend or delete its successor's lock;
+* ``shards/shard-NNNNN.npz`` – one :class:`~cucal.plan_table.PlanTable` per
+  finished shard, written to a temporary file and ``os.replace``-d into
+  place, so a shard is either completely there or not at all.
+
+Only a shared POSIX-ish filesystem is needed; there is no queue service.
+Within a shard, scenarios that differ only in ``budget`` are answered by
+one :func:`~cucal.optimizer.budget_frontier_table` pass.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import math
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .curves import get_curves
+from .optimizer import budget_frontier_table, optimise_budget
+from .plan_table import ParquetPlanWriter, PlanTable
+from .wall_clock import as_wall_clock_model
+
+__all__ = ["SweepSpec", "run_sweep", "sweep_status", "iter_shards", "merge_sweep", "main"]
+
+PathLike = Union[str, os.PathLike]
+
+_PARAMS = {
+    name for name in inspect.signature(optimise_budget).parameters if name != "should_stop"
+} | {"case"}
+
+
+# ---------------------------------------------------------------------------#
+# Scenario space                                                             #
+# ---------------------------------------------------------------------------#
+@dataclass(slots=True, frozen=True)
+class SweepSpec:
+    """
+    ``base`` – fixed ``optimise_budget`` kwargs (``"case"`` may replace the
+    curves); ``axes`` – name → list of scalar values to sweep.
+    """
+    base: Dict[str, Any]
+    axes: Dict[str, Sequence[Any]]
+    shard_size: int = 256
+    _sizes: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        unknown = (set(self.base) | set(self.axes)) - _PARAMS
+        if unknown:
+            raise ValueError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+        if "budget" not in self.base and "budget" not in self.axes:
+            raise ValueError("'budget' must be given in base or as an axis")
+        if self.shard_size < 1:
+            raise ValueError("shard_size must be >= 1")
+        for name, values in self.axes.items():
+            if not values:
+                raise ValueError(f"axis {name!r} is empty")
+            if any(isinstance(v, (dict, list, tuple)) for v in values):
+                raise ValueError(f"axis {name!r} must hold scalar values")
+        object.__setattr__(self, "_sizes", tuple(len(v) for v in self.axes.values()))
+
+    # ------------------------------------------------------------- layout
+    @property
+    def size(self) -> int:
+        return math.prod(self._sizes)
+
+    @property
+    def n_shards(self) -> int:
+        return -(-self.size // self.shard_size)
+
+    def shard_range(self, k: int) -> range:
+        return range(k * self.shard_size, min((k + 1) * self.shard_size, self.size))
+
+    def scenario(self, i: int) -> Dict[str, Any]:
+        """Axis values of scenario *i* (mixed-radix decode, last axis fastest)."""
+        out: Dict[str, Any] = {}
+        for (name, values), n in zip(reversed(self.axes.items()), reversed(self._sizes)):
+            i, r = divmod(i, n)
+            out[name] = values[r]
+        return dict(reversed(out.items()))
+
+    # -------------------------------------------------------- persistence
+    def to_json(self) -> Dict[str, Any]:
+        return {"base": self.base, "axes": {k: list(v) for k, v in self.axes.items()},
+                "shard_size": self.shard_size}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SweepSpec":
+        return cls(base=data["base"], axes=data["axes"],
+                   shard_size=data.get("shard_size", 256))
+
+    def digest(self) -> str:
+        blob = json.dumps(self.to_json(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------#
+# Shard evaluation                                                           #
+# ---------------------------------------------------------------------------#
+def _key_column(values: List[Any]) -> np.ndarray:
+    """Numbers (``None`` → NaN) as float64, anything else as unicode."""
+    if all(v is None or isinstance(v, (int, float)) for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    return np.array([str(v) for v in values])
+
+
+def _solve_shard(spec: SweepSpec, k: int) -> PlanTable:
+    rows = spec.shard_range(k)
+    scenarios = [spec.scenario(i) for i in rows]
+    groups: Dict[str, List[int]] = {}
+    for pos, sc in enumerate(scenarios):
+        rest = {name: v for name, v in sc.items() if name != "budget"}
+        groups.setdefault(json.dumps(rest, sort_keys=True, default=str), []).append(pos)
+
+    columns: Dict[str, np.ndarray] = {}
+    for positions in groups.values():
+        params = {**spec.base, **scenarios[positions[0]]}
+        params.pop("budget", None)
+        budgets = [scenarios[p].get("budget", spec.base.get("budget")) for p in positions]
+        case = params.pop("case", None)
+        if case is not None:
+            params["curve_label"], params["curve_gpu"] = get_curves(case)
+        if params.get("wall_clock_model") is not None:
+            params["wall_clock_model"] = as_wall_clock_model(params["wall_clock_model"])
+        table = budget_frontier_table(budgets, **params)
+        for name, values in table.columns.items():
+            if name == "budget":
+                continue
+            if name not in columns:
+                columns[name] = np.empty(len(rows), dtype=values.dtype)
+            columns[name][positions] = values
+
+    columns["scenario"] = np.arange(rows.start, rows.stop, dtype=np.int64)
+    for name in spec.axes:
+        columns[name] = _key_column([sc[name] for sc in scenarios])
+    return PlanTable(columns)
+
+
+# ---------------------------------------------------------------------------#
+# Checkpoint directory                                                       #
+# ---------------------------------------------------------------------------#
+def _shard_path(root: Path, k: int) -> Path:
+    return root / "shards" / f"shard-{k:05d}.npz"
+
+
+def _lock_path(root: Path, k: int) -> Path:
+    return root / "locks" / f"shard-{k:05d}.lock"
+
+
+def _init_dir(spec: SweepSpec, root: Path) -> None:
+    (root / "shards").mkdir(parents=True, exist_ok=True)
+    (root / "locks").mkdir(exist_ok=True)
+    manifest = {"digest": spec.digest(), "n_shards": spec.n_shards, "size": spec.size,
+                "spec": spec.to_json()}
+    path = root / "manifest.json"
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        existing = _read_manifest(root)
+        if existing["digest"] != manifest["digest"]:
+            raise ValueError(f"{root} holds a different sweep (spec hash mismatch)")
+        return
+    with os.fdopen(fd, "w") as fh:
+        json.dump(manifest, fh, indent=2)
+
+
+def _read_manifest(root: Path) -> Dict[str, Any]:
+    for _ in range(50):                       # another host may be mid-write
+        try:
+            return json.loads((root / "manifest.json").read_text())
+        except json.JSONDecodeError:
+            time.sleep(0.1)
+    raise ValueError(f"{root / 'manifest.json'} is unreadable")
+
+
+def _try_claim(lock: Path, owner: str, stale_after: float) -> Optional[str]:
+    """
+    Create *lock* exclusively (breaking it first if its holder went quiet);
+    returns the token written into it, or ``None`` if the shard is taken.
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            try:
+                age = time.time() - lock.stat().st_mtime
+            except FileNotFoundError:
+                continue                      # released meanwhile – retry
+            if age < stale_after:
+                return None
+            # exactly one breaker wins the rename; the others see ENOENT
+            broken = lock.with_name(f"{lock.name}.stale-{owner}")
+            try:
+                os.replace(lock, broken)
+            except FileNotFoundError:
+                return None
+            if time.time() - broken.stat().st_mtime < stale_after:
+                # lost a race and grabbed a fresh lock: hand it back
+                try:
+                    os.link(broken, lock)
+                except FileExistsError:
+                    pass
+                broken.unlink(missing_ok=True)
+                return None
+            broken.unlink(missing_ok=True)
+            continue
+        token = f"{owner} {uuid.uuid4().hex}\n"
+        with os.fdopen(fd, "w") as fh:
+            fh.write(token)
+        return token
+    return None
+
+
+def _owns(lock: Path, token: str) -> bool:
+    try:
+        return lock.read_text() == token
+    except FileNotFoundError:
+        return False
+
+
+def _touch(lock: Path, token: str) -> bool:
+    """Refresh *lock* if it is still ours; ``False`` once it was broken."""
+    if not _owns(lock, token):
+        return False
+    try:
+        os.utime(lock)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _release(lock: Path, token: str) -> None:
+    """
+    Delete *lock* only if it still holds *token*: move it to a private name
+    first, so a lock another worker took over meanwhile is handed back
+    instead of deleted.
+    """
+    private = lock.with_name(f"{lock.name}.release-{uuid.uuid4().hex}")
+    try:
+        os.replace(lock, private)
+    except FileNotFoundError:
+        return
+    if private.read_text() != token:
+        try:
+            os.link(private, lock)
+        except FileExistsError:
+            pass
+    private.unlink(missing_ok=True)
+
+
+class _Heartbeat:
+    """
+    Touch *lock* every *interval* seconds from a daemon thread while active;
+    stops (and sets :attr:`lost`) once the lock no longer holds *token*.
+    """
+
+    def __init__(self, lock: Path, token: str, interval: float) -> None:
+        self._lock = lock
+        self._token = token
+        self._interval = interval
+        self._stop = threading.Event()
+        self.lost = False
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{lock.name}",
+                                        daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            if not _touch(self._lock, self._token):
+                self.lost = True
+                return
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _write_shard(path: Path, table: PlanTable) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **table.columns)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _load_shard(path: Path) -> PlanTable:
+    with np.load(path, allow_pickle=False) as data:
+        return PlanTable({name: data[name] for name in data.files})
+
+
+# ---------------------------------------------------------------------------#
+# Public API                                                                 #
+# ---------------------------------------------------------------------------#
+def run_sweep(
+    spec: SweepSpec,
+    directory: PathLike,
+    *,
+    worker_id: Optional[str] = None,
+    stale_after: float = 3600.0,
+    max_shards: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Work through the unfinished shards of *spec* in *directory*.
+
+    Safe to run concurrently from many processes/hosts sharing the
+    directory, and to re-run after a crash.  Returns the number of shards
+    this call completed.
+    """
+    root = Path(directory)
+    _init_dir(spec, root)
+    owner = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    done = 0
+    for k in range(spec.n_shards):
+        if max_shards is not None and done >= max_shards:
+            break
+        if should_stop is not None and should_stop():
+            break
+        out, lock = _shard_path(root, k), _lock_path(root, k)
+        if out.exists():
+            continue
+        token = _try_claim(lock, owner, stale_after)
+        if token is None:
+            continue
+        try:
+            if out.exists():                 # finished between check and claim
+                continue
+            with _Heartbeat(lock, token, stale_after / 4):
+                table = _solve_shard(spec, k)
+            # even if the lock was taken over meanwhile, the shard content is
+            # identical and the write atomic, so finishing it is harmless
+            _write_shard(out, table)
+            done += 1
+        finally:
+            _release(lock, token)
+    return done
+
+
+def sweep_status(directory: PathLike) -> Dict[str, Any]:
+    """``{"n_shards", "done", "running", "complete"}`` for a sweep directory."""
+    root = Path(directory)
+    manifest = _read_manifest(root)
+    n = manifest["n_shards"]
+    done = sum(_shard_path(root, k).exists() for k in range(n))
+    running = sum(_lock_path(root, k).exists() for k in range(n))
+    return {"n_shards": n, "done": done, "running": running, "complete": done == n}
+
+
+def iter_shards(directory: PathLike, *, allow_partial: bool = False) -> Iterator[PlanTable]:
+    """Yield finished shards in scenario order, one at a time."""
+    root = Path(directory)
+    n = _read_manifest(root)["n_shards"]
+    for k in range(n):
+        path = _shard_path(root, k)
+        if not path.exists():
+            if allow_partial:
+                continue
+            raise FileNotFoundError(f"shard {k} of {n} is not finished yet")
+        yield _load_shard(path)
+
+
+def merge_sweep(
+    directory: PathLike, out_path: PathLike, *, allow_partial: bool = False
+) -> int:
+    """
+    Stream all shards into one ``.parquet`` or ``.csv`` file (by suffix);
+    only one shard is in memory at a time.  Returns the number of rows.
+    """
+    out_path = Path(out_path)
+    shards = iter_shards(directory, allow_partial=allow_partial)
+    rows = 0
+    if out_path.suffix == ".parquet":
+        with ParquetPlanWriter(out_path) as writer:
+            for table in shards:
+                writer.write(table)
+        return writer.rows
+    if out_path.suffix != ".csv":
+        raise ValueError("output must end in .parquet or .csv")
+    with open(out_path, "w", newline="") as fh:
+        for table in shards:
+            table.to_pandas().to_csv(fh, header=rows == 0, index=False)
+            rows += len(table)
+    return rows
+
+
+# ---------------------------------------------------------------------------#
+# CLI                                                                        #
+# ---------------------------------------------------------------------------#
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Checkpointed optimise_budget sweeps")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    run = sub.add_parser("run", help="Work on unfinished shards")
+    run.add_argument("spec", help="JSON file: {base: {...}, axes: {...}, shard_size}")
+    run.add_argument("directory")
+    run.add_argument("--stale-after", type=float, default=3600.0,
+                     help="Seconds before another host's lock is considered dead")
+    run.add_argument("--max-shards", type=int)
+    st = sub.add_parser("status")
+    st.add_argument("directory")
+    mg = sub.add_parser("merge")
+    mg.add_argument("directory")
+    mg.add_argument("output", help="*.parquet or *.csv")
+    mg.add_argument("--allow-partial", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "run":
+        spec = SweepSpec.from_json(json.loads(Path(args.spec).read_text()))
+        n = run_sweep(spec, args.directory, stale_after=args.stale_after,
+                      max_shards=args.max_shards)
+        print(f"completed {n} shard(s); {sweep_status(args.directory)}")
+    elif args.cmd == "status":
+        print(json.dumps(sweep_status(args.directory)))
+    else:
+        rows = merge_sweep(args.directory, args.output, allow_partial=args.allow_partial)
+        print(f"wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
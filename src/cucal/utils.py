@@ -3,7 +3,15 @@
 Utility functions for cost-utility calculator
 """
 
-from typing import List, Tuple
+from __future__ import annotations
+
+import io
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
 
 
 def parse_curve(cell: str) -> list[tuple[float, float]]:
@@ -31,3 +39,226 @@ def marginal_gain(x: List[float], y: List[float]) -> List[Tuple[float, float]]:
     return [
         (x[i + 1], (y[i + 1] - y[i]) / (x[i + 1] - x[i])) for i in range(len(x) - 1)
     ]
+
+
+# ---------------------------------------------------------------------------#
+# Array-backed parsing for large curve-point exports                         #
+# ---------------------------------------------------------------------------#
+@dataclass(slots=True)
+class CurveParseReport:
+    """
+    Summary of a bulk parse.
+
+    ``error_positions`` holds the 0-based index of every malformed segment
+    (counting non-empty segments across the whole input), ``error_samples``
+    the offending text of the first ``max_samples`` of them.
+    """
+    n_points: int = 0
+    n_errors: int = 0
+    error_positions: List[int] = field(default_factory=list)
+    error_samples: List[str] = field(default_factory=list)
+    max_samples: int = 100
+
+    @property
+    def ok(self) -> bool:
+        return self.n_errors == 0
+
+    def _add_errors(self, positions: np.ndarray, samples: List[str]) -> None:
+        self.n_errors += int(positions.size)
+        self.error_positions.extend(positions.tolist())
+        self.error_samples.extend(samples)
+
+
+_SEMI, _COLON, _NL = ord(";"), ord(":"), ord("\n")
+_WHITESPACE = np.array([ord(c) for c in " \t\r\v\f"], dtype=np.uint8)
+_TO_SPACE = bytes.maketrans(b":;\n", b"   ")
+
+
+def _fromstring(buf: bytes) -> np.ndarray | None:
+    """Parse whitespace-separated floats in C; ``None`` on unmatched data."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            return np.fromstring(buf.translate(_TO_SPACE), dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def _parse_tokens(segs: List[bytes]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Slow path: float() per token, only for chunks holding bad numbers."""
+    x = np.full(len(segs), np.nan)
+    y = np.full(len(segs), np.nan)
+    ok = np.zeros(len(segs), dtype=bool)
+    for i, seg in enumerate(segs):
+        x_str, _, y_str = seg.partition(b":")
+        try:
+            x[i], y[i] = float(x_str), float(y_str)
+            ok[i] = True
+        except ValueError:
+            continue
+    return x, y, ok
+
+
+def _parse_chunk(
+    buf: bytes, start: int, report: CurveParseReport
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Parse one chunk of ``x:y`` segments separated by ``;`` or newlines.
+
+    The segment structure (exactly one colon and one number on each side) is
+    validated with a byte-level scan, then all numbers are converted in a
+    single C call.  Returns ``(x, y, n_nonempty_segments)``.
+    """
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if b.size == 0:
+        return np.empty(0), np.empty(0), 0
+
+    is_semi = (b == _SEMI) | (b == _NL)
+    is_colon = b == _COLON
+    is_char = ~(is_semi | is_colon | np.isin(b, _WHITESPACE))
+    starts = is_char.copy()            # first byte of every token
+    starts[1:] &= ~is_char[:-1]
+
+    # work on the (few) separator / token-start events, not on every byte
+    ev_pos = np.flatnonzero(is_semi | is_colon | starts)
+    ev_semi = is_semi[ev_pos]
+    ev_colon = is_colon[ev_pos]
+    ev_seg = np.cumsum(ev_semi, dtype=np.int64)
+    ev_field = np.cumsum(ev_semi | ev_colon, dtype=np.int64)
+    ev_start = ~(ev_semi | ev_colon)
+
+    semi_pos = ev_pos[ev_semi]
+    n_seg = semi_pos.size + 1
+    lo = np.concatenate(([0], semi_pos + 1))
+    hi = np.concatenate((semi_pos, [b.size]))
+
+    tok_seg = ev_seg[ev_start]
+    tokens = np.bincount(tok_seg, minlength=n_seg)
+    colons = np.bincount(ev_seg[ev_colon], minlength=n_seg)
+    crowded = np.diff(ev_field[ev_start], prepend=-1) == 0   # 2 tokens, 1 field
+
+    nonempty = (tokens > 0) | (colons > 0)
+    good = (colons == 1) & (tokens == 2)
+    good[tok_seg[crowded]] = False
+    n_good = int(good.sum())
+
+    if n_good == int(nonempty.sum()):
+        body = buf
+    else:
+        body = b"\n".join(buf[lo[i]:hi[i]] for i in np.flatnonzero(good))
+
+    values = _fromstring(body)
+    if values is not None and values.size == 2 * n_good:
+        x, y = values[0::2].copy(), values[1::2].copy()
+    else:
+        idx = np.flatnonzero(good)
+        x, y, ok = _parse_tokens([buf[lo[i]:hi[i]] for i in idx])
+        good[idx[~ok]] = False
+        x, y = x[ok], y[ok]
+
+    bad = np.flatnonzero(nonempty & ~good)
+    if bad.size:
+        rank = np.cumsum(nonempty) - 1
+        room = max(report.max_samples - len(report.error_samples), 0)
+        samples = [
+            buf[lo[i]:hi[i]].decode("utf-8", "replace").strip() for i in bad[:room]
+        ]
+        report._add_errors(rank[bad] + start, samples)
+    report.n_points += int(x.size)
+    return x, y, int(nonempty.sum())
+
+
+def _iter_chunks(read, chunk_size: int) -> Iterator[bytes]:
+    """Yield byte blocks that always end on a segment boundary."""
+    carry = b""
+    while True:
+        block = read(chunk_size)
+        if not block:
+            if carry:
+                yield carry
+            return
+        data = carry + block
+        cut = max(data.rfind(b";"), data.rfind(b"\n"))
+        if cut < 0:
+            carry = data
+            continue
+        carry = data[cut + 1:]
+        yield data[:cut]
+
+
+def _parse_stream(
+    read, chunk_size: int, report: CurveParseReport
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    seen = 0
+    for chunk in _iter_chunks(read, chunk_size):
+        x, y, n = _parse_chunk(chunk, seen, report)
+        seen += n
+        if x.size:
+            yield x, y
+
+
+def parse_curve_array(
+    cells: Union[str, Iterable[str]],
+    *,
+    report: CurveParseReport | None = None,
+    chunk_size: int = 1 << 22,
+) -> Tuple[np.ndarray, np.ndarray, CurveParseReport]:
+    """
+    Vectorised counterpart of :func:`parse_curve`.
+
+    Accepts one ``'x:y;x:y'`` string or a whole column of them and returns
+    float64 arrays ``(x, y)`` plus a :class:`CurveParseReport`.  Malformed
+    segments are dropped (like ``parse_curve``) but counted and located.
+    """
+    report = CurveParseReport() if report is None else report
+    if isinstance(cells, str):
+        cells = [cells]
+    data = ";".join(str(c) for c in cells).encode("utf-8")
+    parts = list(_parse_stream(io.BytesIO(data).read, chunk_size, report))
+    return _concat(parts) + (report,)
+
+
+def iter_curve_file(
+    path: Union[str, Path],
+    *,
+    chunk_size: int = 1 << 22,
+    report: CurveParseReport | None = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream ``(x, y)`` float64 chunks from a curve-point file.
+
+    Points are separated by ``;`` or newlines.  The file is read
+    ``chunk_size`` bytes at a time, so memory stays bounded no matter how
+    many points it holds.  Pass a :class:`CurveParseReport` to collect
+    error counts and positions while iterating.
+    """
+    report = CurveParseReport() if report is None else report
+    with open(path, "rb") as fh:
+        yield from _parse_stream(fh.read, chunk_size, report)
+
+
+def read_curve_file(
+    path: Union[str, Path], *, chunk_size: int = 1 << 22
+) -> Tuple[np.ndarray, np.ndarray, CurveParseReport]:
+    """Read a whole curve-point file into ``(x, y, report)``."""
+    report = CurveParseReport()
+    parts = list(iter_curve_file(path, chunk_size=chunk_size, report=report))
+    return _concat(parts) + (report,)
+
+
+def _concat(parts) -> Tuple[np.ndarray, np.ndarray]:
+    if not parts:
+        return np.empty(0), np.empty(0)
+    return (
+        np.concatenate([p[0] for p in parts]),
+        np.concatenate([p[1] for p in parts]),
+    )
+
+
+def marginal_gain_array(x, y) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised :func:`marginal_gain`: returns ``(x[1:], Δy/Δx)`` arrays.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return x[1:], np.diff(y) / np.diff(x)
@@ -2,20 +2,150 @@
 Module entry-point so you can run:
 
     python -m cucal.validate dragut --budget 1500 --time 24
+    python -m cucal.validate all [--points CSV] [--report out.json] [--workers N]
 
-It simply dispatches to the corresponding script and forwards CLI flags.
+``dragut`` dispatches to the original script and forwards CLI flags.
+``all`` checks every published reference point in
+``data/validation_points.csv`` (case, budget, time, efficiency, γ, reported
+accuracy, tolerance) in parallel and writes a JSON regression report with
+per-point deltas and timings; the exit code is 1 if any point fails.
 """
 from __future__ import annotations
 
+import argparse
+import csv
+import json
+import os
 import runpy
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .curves import _curves
+from .data import DATA_DIR
+from .optimizer import optimise_budget
+
+POINTS_PATH = DATA_DIR / "validation_points.csv"
+
+
+@dataclass(slots=True, frozen=True)
+class ValidationPoint:
+    """One published (case, budget, time) → accuracy reference."""
+    case: str
+    budget: float
+    time_hours: Optional[float]
+    efficiency: float           # 0–1, as ``--eff`` of the dragut script
+    gamma: float
+    reported_accuracy: float
+    tolerance: float
+    source: str = ""
+
+
+def load_points(path: Optional[Path] = None) -> List[ValidationPoint]:
+    """Read the reference table (empty ``time_hours`` = no wall-clock cap)."""
+    points = []
+    with open(path or POINTS_PATH, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            points.append(ValidationPoint(
+                case=row["case"],
+                budget=float(row["budget"]),
+                time_hours=float(row["time_hours"]) if row["time_hours"] else None,
+                efficiency=float(row["efficiency"]),
+                gamma=float(row["gamma"]),
+                reported_accuracy=float(row["reported_accuracy"]),
+                tolerance=float(row["tolerance"]),
+                source=row.get("source", ""),
+            ))
+    return points
+
+
+def validate_point(point: ValidationPoint) -> Dict[str, Any]:
+    """Simulate one reference point; curves come from the cached loader."""
+    t0 = time.perf_counter()
+    curves = _curves()
+    lbl, gpu = curves[f"{point.case}-label"], curves[f"{point.case}-gpu"]
+    plan = optimise_budget(
+        label_cost=lbl["cost_per_unit"],
+        gpu_cost=gpu["cost_per_unit"],
+        budget=point.budget,
+        curve_label=lbl["label_curve"],
+        curve_gpu=gpu["gpu_curve"],
+        wall_clock_limit_hours=point.time_hours,
+        cluster_efficiency_pct=point.efficiency * 100,
+        gamma=point.gamma,
+    )
+    out: Dict[str, Any] = asdict(point)
+    if plan is None:
+        out.update(simulated_accuracy=None, delta=None, passed=False,
+                   label_dollars=None, gpu_dollars=None)
+    else:
+        delta = float(plan["accuracy"]) - point.reported_accuracy
+        out.update(
+            simulated_accuracy=float(plan["accuracy"]),
+            delta=delta,
+            passed=abs(delta) < point.tolerance,
+            label_dollars=plan["label_dollars"],
+            gpu_dollars=plan["gpu_dollars"],
+        )
+    out["seconds"] = time.perf_counter() - t0
+    return out
+
+
+def run_validation(
+    points: Sequence[ValidationPoint], *, workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Validate all *points* (in a process pool when ``workers`` > 1) and
+    return ``{"points": [...], "summary": {...}}``; order follows *points*.
+    """
+    t0 = time.perf_counter()
+    workers = min(workers or os.cpu_count() or 1, len(points))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_point, points,
+                                    chunksize=max(1, len(points) // (4 * workers))))
+    else:
+        results = [validate_point(p) for p in points]
+    deltas = [abs(r["delta"]) for r in results if r["delta"] is not None]
+    summary = {
+        "n_points": len(results),
+        "passed": sum(r["passed"] for r in results),
+        "failed": sum(not r["passed"] for r in results),
+        "max_abs_delta": max(deltas, default=None),
+        "workers": workers,
+        "seconds": time.perf_counter() - t0,
+    }
+    return {"points": results, "summary": summary}
+
+
+def _run_all(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(prog="python -m cucal.validate all")
+    ap.add_argument("--points", type=Path, help="Reference table (CSV)")
+    ap.add_argument("--report", type=Path, help="Write the JSON report here")
+    ap.add_argument("--workers", type=int, help="Processes (default: CPUs)")
+    args = ap.parse_args(argv)
+
+    report = run_validation(load_points(args.points), workers=args.workers)
+    for r in report["points"]:
+        sim = "infeasible" if r["delta"] is None else (
+            f"{r['simulated_accuracy']:.3f} (Δ {r['delta']:+.3f})")
+        print(f"{'PASS' if r['passed'] else 'FAIL'}  {r['case']:<14} "
+              f"${r['budget']:<8g} reported {r['reported_accuracy']:.3f}  sim {sim}")
+    s = report["summary"]
+    print(f"{s['passed']}/{s['n_points']} passed in {s['seconds']:.2f}s")
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2))
+    return 0 if s["failed"] == 0 else 1
 
 
 def _usage() -> None:
     print(
         "Usage: python -m cucal.validate <case> [--budget ... --time ... --eff ...]\n"
-        "Currently supported cases:  dragut"
+        "       python -m cucal.validate all [--points CSV] [--report JSON] [--workers N]\n"
+        "Currently supported cases:  dragut, all"
     )
     sys.exit(1)
 
@@ -26,6 +156,9 @@ def main() -> None:  # noqa: D401  (simple main wrapper)
 
     case = sys.argv[1].lower()
 
+    if case == "all":
+        sys.exit(_run_all(sys.argv[2:]))
+
     if case == "dragut":
         # Remove the case token so validate_dragut.py sees only its own flags
         sys.argv = [sys.argv[0]] + sys.argv[2:]
@@ -0,0 +1,109 @@
+"""
+Calendar-time model for a label-and-train pipeline.
+
+The optimiser's built-in formula is strictly sequential with a single
+annotator stream::
+
+    wall = gpu_hours / cluster_eff + labels / gamma
+
+:class:`WallClockModel` generalises it:
+
+* ``annotators`` parallel labelling streams of ``gamma`` instances/hour each;
+* ``gpus`` devices whose speed-up follows Amdahl's law
+  (``parallel_fraction``) or a custom per-device efficiency ``scaling(n)``;
+* ``overlap`` ∈ [0, 1] – the share of the shorter stage that runs
+  concurrently with the longer one (training on partial data while
+  labelling continues)::
+
+      wall = T_label + T_train − overlap · min(T_label, T_train)
+
+  ``overlap=0`` is fully sequential, ``overlap=1`` a perfect pipeline
+  (``max`` of the two stages).
+
+Scaling inefficiency is charged, not free.  Throughout the optimiser
+``gpu_hours`` means *effective compute*: single-device hours, which the GPU
+accuracy curve and ``max_gpu_hours`` see.  With ``gpus`` devices at
+speed-up ``s`` the cluster bills ``gpus / s`` device-hours per effective
+hour (:meth:`WallClockModel.device_hours`), so one GPU dollar buys
+``s / gpus`` effective hours (:meth:`WallClockModel.compute_share`).
+Under linear scaling this is 1 and nothing changes.
+
+``WallClockModel()`` reproduces the built-in formula exactly.  Pass one as
+``optimise_budget(..., wall_clock_model=...)``; all terms are monotone in
+labels and GPU-hours, so the feasible region keeps the shape the grid
+searches rely on.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+import numpy as np
+
+__all__ = ["WallClockModel", "as_wall_clock_model"]
+
+
+@dataclass(slots=True, frozen=True)
+class WallClockModel:
+    annotators: int = 1
+    gpus: int = 1
+    parallel_fraction: float = 1.0                    # Amdahl p; 1 = linear scaling
+    scaling: Optional[Callable[[int], float]] = None  # per-device efficiency e(n) ∈ (0, 1]
+    overlap: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.annotators < 1 or self.gpus < 1:
+            raise ValueError("annotators and gpus must be >= 1")
+        if not 0.0 <= self.overlap <= 1.0:
+            raise ValueError("overlap must be in [0, 1]")
+        if not 0.0 <= self.parallel_fraction <= 1.0:
+            raise ValueError("parallel_fraction must be in [0, 1]")
+
+    def speedup(self) -> float:
+        """Training speed-up of ``gpus`` devices over one."""
+        n = self.gpus
+        if n == 1:
+            return 1.0
+        if self.scaling is not None:
+            return n * float(self.scaling(n))
+        p = self.parallel_fraction
+        return 1.0 / ((1.0 - p) + p / n)
+
+    def compute_share(self) -> float:
+        """Effective GPU-hours per billed device-hour: ``speedup() / gpus``."""
+        return self.speedup() / self.gpus
+
+    def device_hours(self, gpu_hours):
+        """Billed device-hours for *gpu_hours* of effective compute."""
+        return gpu_hours / self.compute_share()
+
+    def stage_hours(self, labels, gpu_hours, gamma: float, efficiency: float):
+        """
+        ``(T_label, T_train)`` in hours for *gpu_hours* of effective compute;
+        scalars or broadcastable arrays.
+        """
+        label_hours = labels / (gamma * self.annotators)
+        train_hours = gpu_hours / efficiency
+        if self.gpus != 1:
+            train_hours = train_hours / self.speedup()
+        return label_hours, train_hours
+
+    def hours(self, labels, gpu_hours, gamma: float, efficiency: float):
+        """Calendar hours of the whole pipeline."""
+        t_label, t_train = self.stage_hours(labels, gpu_hours, gamma, efficiency)
+        wall = t_train + t_label
+        if self.overlap:
+            wall = wall - self.overlap * np.minimum(t_label, t_train)
+        return wall
+
+
+def as_wall_clock_model(
+    value: Union[None, WallClockModel, Mapping[str, Any]]
+) -> Optional[WallClockModel]:
+    """Accept a model, ``None`` or a JSON-style dict of its fields."""
+    if value is None or isinstance(value, WallClockModel):
+        return value
+    fields: Dict[str, Any] = dict(value)
+    if "scaling" in fields:
+        raise ValueError("'scaling' cannot be given as data; use parallel_fraction")
+    return WallClockModel(**fields)
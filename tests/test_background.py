@@ -0,0 +1,59 @@
+import time
+
+from cucal.background import BackgroundSolver, coarse_granularity, result_or_none
+from cucal.optimizer import optimise_budget
+
+PARAMS = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    budget=200,
+    curve_label={"a": 0.73, "b": 0.48},
+    curve_gpu={"a": 0.69, "b": 0.44},
+)
+
+
+def test_progressive_results_match_direct_calls():
+    solver = BackgroundSolver(max_workers=2)
+    coarse, fine = solver.submit("s1", PARAMS, (coarse_granularity(200), 1))
+    assert result_or_none(coarse, 30) == optimise_budget(**PARAMS, granularity=4)
+    assert result_or_none(fine, 30) == optimise_budget(**PARAMS)
+    # finished plans are served from the cache without a new job
+    (again,) = solver.submit("s2", PARAMS, (1,))
+    assert again.done() and again.result() == fine.result()
+    solver.shutdown()
+
+
+def test_superseded_job_is_cancelled():
+    solver = BackgroundSolver(max_workers=1)
+    # another session's huge search keeps the only full-grid worker busy
+    (blocker,) = solver.submit("other", {**PARAMS, "budget": 200_000}, (1,))
+    (old,) = solver.submit("s1", {**PARAMS, "budget": 5000}, (1,))
+    (new,) = solver.submit("s1", PARAMS, (10,))      # same owner → old released
+    solver.release("other")
+    assert result_or_none(blocker, 30) is None
+    assert result_or_none(old, 30) is None
+    assert result_or_none(new, 30) is not None
+    solver.shutdown()
+
+
+def test_previews_are_not_queued_behind_full_searches():
+    solver = BackgroundSolver(max_workers=1, preview_workers=1)
+    (blocker,) = solver.submit("other", {**PARAMS, "budget": 200_000}, (1,))
+    coarse, fine = solver.submit("s1", PARAMS, (coarse_granularity(200), 1))
+    assert result_or_none(coarse, 30) == optimise_budget(**PARAMS, granularity=4)
+    assert not fine.done()
+    solver.release("other")
+    assert result_or_none(fine, 30) == optimise_budget(**PARAMS)
+    solver.shutdown()
+
+
+def test_owners_are_forgotten_once_their_jobs_finish():
+    solver = BackgroundSolver(max_workers=2)
+    for owner in range(20):
+        for job in solver.submit(owner, {**PARAMS, "budget": 50 + owner}, (5, 1)):
+            result_or_none(job, 30)
+    deadline = time.monotonic() + 5                  # done-callbacks run after result()
+    while solver.active_owners and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert solver.active_owners == 0
+    solver.shutdown()
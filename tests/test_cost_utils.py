@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cucal.cost_utils import (
+    as_hourly,
+    as_per_instance,
+    inst_per_hour,
+    load_conversions,
+    to_hourly,
+    to_per_unit,
+)
+
+
+def test_as_hourly_scalar_and_array():
+    assert as_hourly(0.1) == pytest.approx(0.5)
+    np.testing.assert_allclose(as_hourly([0.1, 0.2], [5, 10]), [0.5, 2.0])
+    np.testing.assert_allclose(as_per_instance(as_hourly([0.1, 0.2], 20), 20), [0.1, 0.2])
+
+
+def test_table_read_from_csv():
+    table = load_conversions()
+    assert table.hours_per_unit("Dragut2019") == pytest.approx(0.2)
+    # base names with dashes (curves.json style) resolve to the same row
+    assert inst_per_hour("Dragut-2019") == pytest.approx(5.0)
+    with pytest.raises(KeyError):
+        table.hours_per_unit("NoSuchPaper", default=None)
+
+
+def test_column_conversion_per_paper():
+    costs = np.array([0.1, 0.1, 0.1])
+    papers = ["Kang2023", "Stiennon2021", "Kang2023"]
+    hourly = to_hourly(costs, papers)
+    np.testing.assert_allclose(hourly, [0.5, 0.1 / 0.1667, 0.5])
+    np.testing.assert_allclose(to_per_unit(hourly, papers), costs)
+
+
+def test_every_case_has_a_conversion_and_unknown_papers_are_loud():
+    from cucal.curves import load_curves
+
+    for base in {key.rsplit("-", 1)[0] for key in load_curves()}:
+        load_conversions().hours_per_unit(base, default=None)
+    assert inst_per_hour("Stiennon2021") == pytest.approx(1 / 0.1667)
+    with pytest.warns(UserWarning, match="Typo2019"):
+        assert inst_per_hour("Typo2019") == pytest.approx(5.0)
+    with pytest.raises(KeyError, match="Typo2019"):
+        to_hourly([0.1], ["Typo2019"])
+    with pytest.raises(KeyError):
+        to_per_unit(1.0, "Typo2019")
+
+
+@pytest.mark.parametrize("gamma", ["0", "-3"])
+def test_cli_rejects_non_positive_gamma(gamma, monkeypatch, capsys):
+    from cucal.__main__ import main
+
+    monkeypatch.setattr("sys.argv", ["cucal", "--budget", "100", "--gamma", gamma, "Kang2023"])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2 and "--gamma must be > 0" in capsys.readouterr().err
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from cucal.curve_models import CurveModel, curve_model, model_names
+from cucal.optimizer import _eval_curve, budget_frontier, optimise_budget
+
+POINTS = {"x": [0, 50, 200, 800, 3000], "y": [0.0, 0.35, 0.6, 0.72, 0.75]}
+CURVES = [
+    {"a": 0.7, "b": 0.01},
+    {"model": "log1p", "a": 0.1, "b": 0.05},
+    {"model": "piecewise_linear", **POINTS},
+    {"model": "pchip", **POINTS},
+]
+
+
+def test_registry_and_default():
+    assert {"saturating_exp", "log1p", "piecewise_linear", "pchip"} <= set(model_names())
+    x = np.linspace(0, 500, 11)
+    assert np.array_equal(curve_model({"a": 0.7, "b": 0.01}).evaluate(x),
+                          _eval_curve(0.7, 0.01, x))
+    with pytest.raises(KeyError):
+        curve_model({"model": "nope"})
+    with pytest.raises(ValueError):
+        curve_model({"model": "pchip", "x": [0, 1], "y": [0.5, 0.4]})
+    with pytest.raises(TypeError):
+        CurveModel()
+
+
+@pytest.mark.parametrize("model", ["piecewise_linear", "pchip"])
+def test_inverse_takes_first_x_on_a_plateau(model):
+    flat = {"model": model, "x": [0, 10, 20, 30, 40], "y": [0.0, 0.5, 0.5, 0.5, 0.8]}
+    m = curve_model(flat)
+    x = m.inverse(np.array([0.0, 0.25, 0.5, 0.65, 0.8, 0.9]))
+    assert x[0] == 0.0 and x[-1] == np.inf
+    assert x[2] == pytest.approx(10.0, abs=0.05)            # left end of the plateau
+    np.testing.assert_allclose(m.evaluate(x[1:5]), [0.25, 0.5, 0.65, 0.8], atol=1e-3)
+    if model == "piecewise_linear":
+        np.testing.assert_allclose(x[1:5], [5.0, 10.0, 35.0, 40.0])
+
+
+@pytest.mark.parametrize("curve", CURVES, ids=lambda c: c.get("model", "default"))
+def test_inverse_and_derivative(curve):
+    model = curve_model(curve)
+    x = np.linspace(1, 2500, 400)
+    y = model.evaluate(x)
+    assert np.all(np.diff(y) >= -1e-12)                     # monotone
+    back = model.inverse(y)
+    np.testing.assert_allclose(model.evaluate(back), y, atol=1e-6)
+    h = 1e-3
+    numeric = (model.evaluate(x + h) - model.evaluate(x - h)) / (2 * h)
+    np.testing.assert_allclose(model.derivative(x), numeric, atol=2e-3)
+    if curve.get("model") != "log1p":                        # log1p is unbounded
+        assert model.inverse(np.array([10.0]))[0] == np.inf
+
+
+def test_pchip_matches_scipy_and_plateaus():
+    from scipy.interpolate import PchipInterpolator
+
+    model = curve_model({"model": "pchip", **POINTS})
+    x = np.linspace(0, 3000, 1001)
+    np.testing.assert_allclose(model.evaluate(x), PchipInterpolator(POINTS["x"], POINTS["y"])(x),
+                               atol=1e-4)
+    assert model.evaluate(np.array([1e6]))[0] == pytest.approx(0.75)
+
+
+def test_optimiser_uses_empirical_models():
+    kw = dict(label_cost=0.05, gpu_cost=1.0,
+              curve_label={"model": "pchip", **POINTS},
+              curve_gpu={"model": "piecewise_linear", "x": [0, 10, 100], "y": [0, 0.3, 0.5]})
+    plan = optimise_budget(**kw, budget=120)
+    lab = curve_model(kw["curve_label"]).evaluate(plan["labels"])
+    gpu = curve_model(kw["curve_gpu"]).evaluate(plan["gpu_hours"])
+    assert plan["accuracy"] == pytest.approx(1 - (1 - lab) * (1 - gpu))
+    assert budget_frontier([60, 120], **kw)[1] == plan
@@ -25,3 +25,73 @@ def test_fit_log_curve():
     assert rmse < 0.05, "RMSE should be very small"
     assert abs(a_hat - 2) < 0.1
     assert abs(b_hat - 0.05) < 0.01
+
+
+def test_online_fit_converges_and_forgets():
+    from cucal.curves import OnlineCurveFit
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1, 2000, 400)
+    y = 0.7 * (1 - np.exp(-0.004 * x)) + rng.normal(0, 0.01, size=x.size)
+
+    fit = OnlineCurveFit(a=0.5, b=0.01)
+    fit.update_many(x, y)
+    assert abs(fit.a - 0.7) < 0.03 and abs(fit.b - 0.004) < 0.001
+    assert fit.rmse < 0.02 and fit.n_points == 400
+
+    # the process drifts: a forgetting estimator follows, a plain one lags
+    y2 = 0.8 * (1 - np.exp(-0.004 * x)) + rng.normal(0, 0.01, size=x.size)
+    fading = OnlineCurveFit.from_curve(fit.curve, forgetting=0.97)
+    fading.update_many(x[:200], y[:200])
+    fading.update_many(x, y2)
+    plain = OnlineCurveFit.from_curve(fit.curve)
+    plain.update_many(x[:200], y[:200])
+    plain.update_many(x, y2)
+    assert abs(fading.a - 0.8) < 0.03
+    assert abs(plain.a - 0.8) > 2 * abs(fading.a - 0.8)
+
+
+def test_update_curve_writes_back(tmp_path, monkeypatch):
+    import json
+
+    import cucal.curves as cv
+    from cucal.data import watch
+
+    path = tmp_path / "curves.json"
+    path.write_text(cv._CURVES_PATH.read_text())
+    monkeypatch.setattr(cv, "_CURVES_PATH", path)
+    monkeypatch.setattr(cv, "_CURVES", watch(path, json.loads))
+    before = cv.get_curves("Kang2023")[1]
+    fit = cv.OnlineCurveFit.from_curve(before)
+    fit.update_many([100, 200, 400], [0.9, 0.95, 0.97])
+    cv.update_curve("Kang2023-gpu", fit)
+    assert cv.get_curves("Kang2023")[1]["a"] == fit.a
+    entry = json.loads(path.read_text())["Kang2023-gpu"]
+    assert entry["rmse"] == fit.rmse and entry["cost_per_unit"] == 1.4
+
+
+def test_update_curve_keeps_layout_and_serialises_writers(tmp_path):
+    import json
+    import threading
+
+    import cucal.curves as cv
+
+    path = tmp_path / "curves.json"
+    original = cv._CURVES_PATH.read_text()
+    path.write_text(original)
+    same = json.loads(original)["Kang2023-gpu"]["gpu_curve"]
+    cv.update_curve("Kang2023-gpu", {"a": same["a"], "b": same["b"]}, path=path)
+    assert path.read_text() == original              # nothing changed, nothing moved
+
+    resources = [k for k in json.loads(original)]
+    writers = [threading.Thread(target=cv.update_curve,
+                                args=(r, {"a": 0.5 + i / 100, "b": 0.01}, path))
+               for i, r in enumerate(resources)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    data = json.loads(path.read_text())
+    for i, r in enumerate(resources):                # no update was lost
+        assert data[r].get("label_curve", data[r].get("gpu_curve"))["a"] == 0.5 + i / 100
+    assert not (tmp_path / "curves.json.lock").exists()
@@ -2,6 +2,8 @@ import json
 import pathlib
 import pytest
 
+from cucal.curve_models import curve_model, model_names
+
 CURVES = json.loads((pathlib.Path("data") / "curves.json").read_text())
 
 
@@ -16,7 +18,14 @@ def test_schema_keys(task):
     )
 
     curve_key = "label_curve" if has_label else "gpu_curve"
-    assert "a" in entry[curve_key] and "b" in entry[curve_key]
+    curve = entry[curve_key]
+    # every curve records the model used to evaluate it
+    assert curve.get("model") in model_names()
+    if curve["model"] in ("saturating_exp", "log1p"):
+        assert "a" in curve and "b" in curve
+    else:
+        assert len(curve["x"]) == len(curve["y"]) >= 2
+    curve_model(curve)              # builds without error
 
     # rmse is optional but must be a float when presentif "rmse" in entry:
     if "rmse" in entry:
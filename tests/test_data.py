@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+
+import pytest
+
+import cucal.data as data
+from cucal.data import DataFile, invalidate, load_resources, versions, watch
+
+
+def _counting_parser():
+    calls = []
+
+    def parse(raw):
+        calls.append(raw)
+        return json.loads(raw)
+    return parse, calls
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_on_change_only(tmp_path):
+    path = tmp_path / "f.json"
+    path.write_text('{"a": 1}')
+    parse, calls = _counting_parser()
+    handle = DataFile(path, parse, check_interval=0)
+
+    assert handle.get() == {"a": 1} and handle.version == 1
+    assert handle.get() is handle.get() and len(calls) == 1
+
+    _bump_mtime(path)                          # touched, same bytes: no reparse
+    assert handle.get() == {"a": 1} and len(calls) == 1 and handle.version == 1
+
+    path.write_text('{"a": 2}')
+    _bump_mtime(path)
+    assert handle.get() == {"a": 2} and handle.version == 2 and len(calls) == 2
+
+
+def test_throttle_and_invalidate(tmp_path):
+    path = tmp_path / "f.json"
+    path.write_text('{"a": 1}')
+    handle = DataFile(path, json.loads, check_interval=3600)
+    handle.get()
+    path.write_text('{"a": 9}')                # same size, maybe same mtime tick
+    assert handle.get() == {"a": 1}            # within the interval: no I/O
+    invalidate(path)                           # not registered: no effect
+    assert handle.get() == {"a": 1}
+    handle.invalidate()                        # hash is compared regardless of stat
+    assert handle.get() == {"a": 9} and handle.version == 2
+
+
+def test_bad_edit_keeps_last_good_value(tmp_path):
+    path = tmp_path / "f.json"
+    path.write_text('{"a": 1}')
+    handle = DataFile(path, json.loads, check_interval=0)
+    handle.get()
+    path.write_text('{"a": ')                  # half-written by an editor
+    assert handle.get() == {"a": 1} and handle.version == 1
+    path.write_text('{"a": 3}')
+    _bump_mtime(path)
+    assert handle.get() == {"a": 3}
+    with pytest.raises(FileNotFoundError):
+        DataFile(tmp_path / "missing.json", json.loads).get()
+
+
+def test_registry_shares_handles(tmp_path, monkeypatch):
+    path = tmp_path / "f.json"
+    path.write_text("[1]")
+    monkeypatch.setattr(data, "CHECK_INTERVAL", 3600.0)
+    a = watch(path, json.loads, name="test-file")
+    try:
+        assert watch(str(path), json.loads) is a
+        assert a.get() == [1]
+        path.write_text("[2]")
+        invalidate(path)
+        assert a.get() == [2] and versions()["test-file"] == 2
+    finally:
+        data._NAMES.pop("test-file")
+    assert {"curves", "hardware", "resources", "conversions"} <= set(versions())
+    assert {r["name"] for r in load_resources()} >= {"labeling", "gpu_compute"}
+
+
+def test_concurrent_readers_see_whole_snapshots(tmp_path):
+    path = tmp_path / "f.json"
+    path.write_text(json.dumps({"v": 0, "w": 0}))
+    handle = DataFile(path, json.loads, check_interval=0)
+    torn = []
+
+    def read():
+        for _ in range(300):
+            value = handle.get()
+            if value["v"] != value["w"]:
+                torn.append(value)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    for i in range(1, 50):
+        tmp = tmp_path / "f.tmp"
+        tmp.write_text(json.dumps({"v": i, "w": i}))
+        os.replace(tmp, path)
+    for t in readers:
+        t.join()
+    assert not torn
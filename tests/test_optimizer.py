@@ -23,3 +23,17 @@ def test_optimise_budget_dragut_smoke() -> None:
     ci_lo, ci_hi = res["accuracy_ci"]
     assert ci_lo <= res["accuracy"] <= ci_hi
     assert res["label_dollars"] + res["gpu_dollars"] == 100
+
+
+def test_negative_budget_is_infeasible_not_an_error() -> None:
+    """A negative budget buys nothing: ``None`` / an infeasible row."""
+    from cucal.optimizer import budget_frontier, budget_frontier_table
+    from cucal.risk import risk_adjusted_plan
+
+    kw = dict(label_cost=0.05, gpu_cost=1.0,
+              curve_label={"a": 0.73, "b": 0.48}, curve_gpu={"a": 0.69, "b": 0.44})
+    assert optimise_budget(**kw, budget=-1) is None
+    plans = budget_frontier([-5, 50], **kw)
+    assert plans[0] is None and plans[1] == optimise_budget(**kw, budget=50)
+    assert not budget_frontier_table([-5], **kw)["feasible"].any()
+    assert risk_adjusted_plan(**kw, budget=-1, draws=100) is None
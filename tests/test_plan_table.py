@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from cucal.model_types import AllocationPlan, BudgetPlan
+from cucal.optimizer import budget_frontier, budget_frontier_table, optimise_budget
+from cucal.plan_table import PLAN_COLUMNS, PlanTable
+
+BASE = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    curve_label={"a": 0.73, "b": 0.048},
+    curve_gpu={"a": 0.69, "b": 0.044, "rmse": 0.01},
+    wall_clock_limit_hours=60,
+)
+
+
+def test_budget_plan_is_a_slotted_mapping():
+    plan = optimise_budget(**BASE, budget=150)
+    assert isinstance(plan, BudgetPlan) and not hasattr(plan, "__dict__")
+    assert "spent" not in plan
+    assert dict(plan) == plan.as_dict() and plan == plan.as_dict()
+    assert json.loads(json.dumps(plan.as_dict()))["label_dollars"] == plan.label_dollars
+    with pytest.raises(KeyError):
+        plan["spent"]
+
+
+def test_single_allocation_plan_type():
+    from cucal import optimizer
+
+    assert optimizer.AllocationPlan is AllocationPlan
+    assert AllocationPlan({"a": 1.0}, 2.0).accuracy is None
+
+
+def test_frontier_table_matches_scalar_plans():
+    budgets = [0, 10, 75, 150, 400]
+    plans = budget_frontier(budgets, **BASE, target_accuracy=0.5)
+    table = budget_frontier_table(budgets, **BASE, target_accuracy=0.5)
+    assert len(table) == len(budgets)
+    assert table["budget"].tolist() == budgets
+    for plan, row in zip(plans, table):
+        if plan is None:
+            assert row is None
+        else:
+            assert row.accuracy == pytest.approx(plan.accuracy)
+            assert row.accuracy_ci == pytest.approx(plan.accuracy_ci)
+            assert row.label_dollars == plan.label_dollars
+    again = PlanTable.from_plans(plans, budget=budgets)
+    np.testing.assert_allclose(again["accuracy"], table["accuracy"], equal_nan=True)
+
+
+def test_zero_copy_pandas_and_concat():
+    table = budget_frontier_table(range(0, 500, 50), **BASE)
+    df = table.to_pandas()
+    assert set(PLAN_COLUMNS) <= set(df.columns)
+    assert np.shares_memory(df["accuracy"].to_numpy(), table["accuracy"])
+    both = PlanTable.concat([table, table])
+    assert len(both) == 2 * len(table)
+    assert both.records()[0]["budget"] == 0
+
+
+def test_parquet_streaming(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from cucal.plan_table import ParquetPlanWriter
+
+    path = tmp_path / "plans.parquet"
+    with ParquetPlanWriter(path) as writer:
+        for lo in (0, 100):
+            writer.write(budget_frontier_table(range(lo, lo + 100, 10), **BASE))
+    assert pq.read_table(path).num_rows == writer.rows == 20
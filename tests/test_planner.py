@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from cucal.optimizer import optimise_budget
+from cucal.planner import Planner
+
+BASE = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    budget=120,
+    curve_label={"a": 0.73, "b": 0.48},
+    curve_gpu={"a": 0.69, "b": 0.44},
+    granularity=2,
+)
+
+
+def test_budget_increase_is_incremental():
+    planner = Planner(**BASE)
+    assert planner.solve() == optimise_budget(**BASE)
+    assert planner.solve(budget=160) == optimise_budget(**{**BASE, "budget": 160})
+    assert planner.last_mode == "incremental"
+    planner.solve(label_rmse=0.03)
+    assert planner.last_mode == "reuse"
+
+
+@pytest.mark.parametrize("target", [None, 0.9])
+def test_random_knob_walk_matches_full_solve(target):
+    rng = random.Random(7)
+    params = {**BASE, "target_accuracy": target}
+    planner = Planner(**params)
+    knobs = {
+        "budget": [40, 80, 120, 200],
+        "max_gpu_hours": [None, 5, 20, 60],
+        "wall_clock_limit_hours": [None, 3, 10, 40],
+        "cluster_efficiency_pct": [50, 90],
+        "gpu_cost": [1.0, 2.0],
+        "label_rmse": [0.0, 0.02],
+    }
+    for _ in range(60):
+        key = rng.choice(sorted(knobs))
+        params[key] = rng.choice(knobs[key])
+        assert planner.solve(**{key: params[key]}) == optimise_budget(**params)
+    assert planner.stats["reuse"] + planner.stats["incremental"] > 0
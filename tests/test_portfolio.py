@@ -0,0 +1,66 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from cucal.optimizer import optimise_budget
+from cucal.portfolio import Project, optimise_portfolio, projects_from_cases
+
+CASES = ["Dragut-2019", "Kang2023", "Stiennon2021"]
+
+
+def _random_projects(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        Project(
+            name=f"p{i}",
+            curve_label={"a": rng.uniform(0.4, 0.9), "b": rng.uniform(0.001, 0.05)},
+            curve_gpu={"a": rng.uniform(0.4, 0.9), "b": rng.uniform(0.01, 0.5)},
+            label_cost=rng.uniform(0.01, 0.2),
+            gpu_cost=rng.uniform(0.5, 3.0),
+            weight=rng.uniform(0.5, 2.0),
+        )
+        for i in range(n)
+    ]
+
+
+def test_respects_budget_and_beats_even_split():
+    projects = projects_from_cases(CASES)
+    res = optimise_portfolio(projects, 3000, step=1)
+    assert res.spent <= 3000 + 1e-9
+    even = sum(
+        optimise_budget(label_cost=p.label_cost, gpu_cost=p.gpu_cost, budget=1000,
+                        curve_label=p.curve_label, curve_gpu=p.curve_gpu)["accuracy"]
+        for p in projects
+    )
+    assert res.objective >= even - 1e-6
+    assert [r["project"] for r in res.records()] == CASES
+
+
+def test_single_project_matches_grid_search():
+    (p,) = projects_from_cases(CASES[:1])
+    res = optimise_portfolio([p], 400, step=1)
+    ref = optimise_budget(label_cost=p.label_cost, gpu_cost=p.gpu_cost, budget=400,
+                          curve_label=p.curve_label, curve_gpu=p.curve_gpu)
+    assert res.accuracy[0] == pytest.approx(ref["accuracy"], abs=1e-4)
+
+
+def test_caps_and_gpu_pool():
+    projects = _random_projects(50, seed=1)
+    projects[0].max_gpu_hours = 3.0
+    projects[1].wall_clock_limit_hours = 10.0
+    res = optimise_portfolio(projects, 5000, gpu_hour_pool=400)
+    assert res.gpu_hours.sum() <= 400 + 1e-9
+    assert res.gpu_hours[0] <= 3.0 + 1e-9
+    assert res.wall_clock_hours[1] <= 10.0 + 1e-9
+    assert np.all(res.label_dollars >= 0) and np.all(res.gpu_dollars >= 0)
+
+
+def test_ten_thousand_projects_are_fast():
+    projects = _random_projects(10_000)
+    t0 = time.perf_counter()
+    res = optimise_portfolio(projects, 2_000_000, gpu_hour_pool=200_000)
+    assert time.perf_counter() - t0 < 15
+    assert res.spent <= 2_000_000 + 1e-6
+    assert len(res.names) == 10_000
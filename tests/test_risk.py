@@ -0,0 +1,53 @@
+import math
+import time
+
+import pytest
+
+from cucal.optimizer import optimise_budget
+from cucal.risk import Dist, risk_adjusted_plan, simulate_plan, simulate_plans
+
+CURVES = dict(curve_label={"a": 0.73, "b": 0.0048}, curve_gpu={"a": 0.69, "b": 0.044})
+UNCERTAIN = dict(
+    label_cost=Dist.normal(0.05, 0.01),
+    gpu_cost=Dist.lognormal(1.0, 0.2),
+    gamma=Dist.triangular(3, 5, 9),
+    cluster_efficiency_pct=Dist.uniform(60, 95),
+)
+
+
+def test_fixed_inputs_are_deterministic():
+    report = simulate_plans([1000, 1000], [10, 10], label_cost=0.05, gpu_cost=1.0,
+                            gamma=5, cluster_efficiency_pct=100,
+                            budget=60, wall_clock_limit_hours=209, draws=1000)
+    # cost 60 ≤ 60, wall 210 > 209
+    assert report.p_over_budget.tolist() == [0.0, 0.0]
+    assert report.p_over_time.tolist() == [1.0, 1.0]
+    assert report.expected_time_overrun[0] == pytest.approx(1.0)
+
+
+def test_matches_normal_tail_probability():
+    # cost = 1000 · N(0.05, 0.01): P(cost > 60) = P(Z > 1)
+    row = simulate_plan({"labels": 1000, "gpu_hours": 0}, label_cost=Dist.normal(0.05, 0.01),
+                        gpu_cost=1.0, budget=60, draws=400_000, seed=3)
+    assert row["p_over_budget"] == pytest.approx(0.5 * math.erfc(1 / math.sqrt(2)), abs=3e-3)
+    assert row["mean_cost"] == pytest.approx(50, rel=1e-3)
+
+
+def test_seeded_and_fast():
+    plan = optimise_budget(label_cost=0.05, gpu_cost=1.0, budget=300,
+                           wall_clock_limit_hours=200, **CURVES)
+    kw = dict(UNCERTAIN, budget=300, wall_clock_limit_hours=200)
+    t0 = time.perf_counter()
+    first = simulate_plan(plan, draws=1_000_000, seed=7, **kw)
+    assert time.perf_counter() - t0 < 3.0
+    assert first == simulate_plan(plan, draws=1_000_000, seed=7, **kw)
+    assert 0.0 < first["p_over_time"] < 1.0          # the nominal plan sits on the cap
+
+
+def test_risk_adjusted_plan_respects_chance_constraint():
+    kw = dict(UNCERTAIN, budget=300, wall_clock_limit_hours=200, **CURVES)
+    safe = risk_adjusted_plan(max_exceed_prob=0.01, **kw)
+    assert safe["p_over_any"] <= 0.01
+    expected = risk_adjusted_plan(**kw)
+    assert expected["score"] == pytest.approx(expected["accuracy"] * (1 - expected["p_over_any"]))
+    assert risk_adjusted_plan(max_exceed_prob=-1, **kw) is None
@@ -0,0 +1,95 @@
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from cucal.optimizer import optimise_budget
+from cucal.sequential import _forward_max, plan_rounds
+
+BASE = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    curve_label={"a": 0.73, "b": 0.048},
+    curve_gpu={"a": 0.69, "b": 0.044},
+)
+
+
+def _brute(budget, rounds, step, weights, cap_l=None, cap_g=None, wall=None):
+    """Enumerate every per-round (label, GPU) increment sequence."""
+    n = int(budget // step)
+    cl = n if cap_l is None else int(cap_l // step)
+    cg = n if cap_g is None else int(cap_g // step)
+    moves = [(a, b) for a in range(cl + 1) for b in range(cg + 1)]
+    best = -np.inf
+    for seq in itertools.product(moves, repeat=rounds):
+        i = j = 0
+        score = 0.0
+        for w, (a, b) in zip(weights, seq):
+            i, j = i + a, j + b
+            if i + j > n:
+                break
+            lab, gpu = i * step, j * step
+            labels, gpu_h = lab / BASE["label_cost"], gpu / BASE["gpu_cost"]
+            if wall is not None and gpu_h / 0.9 + labels / 5 > wall:
+                break
+            acc = 1 - (1 - 0.73 * (1 - np.exp(-0.048 * labels))) * (
+                1 - 0.69 * (1 - np.exp(-0.044 * gpu_h)))
+            score += w * acc
+        else:
+            best = max(best, score)
+    return best
+
+
+def test_forward_max_matches_naive():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(7, 9))
+    for width in [None, 0, 1, 2, 3, 5, 20]:
+        got = _forward_max(values, 1, width)
+        for j in range(9):
+            hi = 9 if width is None else j + width + 1
+            assert np.allclose(got[:, j], values[:, j:hi].max(axis=1))
+
+
+@pytest.mark.parametrize("caps", [(None, None, None), (2.0, 1.0, None), (None, None, 60.0)])
+def test_matches_brute_force(caps):
+    cap_l, cap_g, wall = caps
+    weights = [0.5, 1.0, 2.0]
+    plan = plan_rounds(**BASE, budget=5, rounds=3, round_weights=weights, step=1,
+                       max_label_dollars_per_round=cap_l, max_gpu_dollars_per_round=cap_g,
+                       wall_clock_limit_hours=wall, cluster_efficiency_pct=90)
+    assert plan.objective == pytest.approx(_brute(5, 3, 1, weights, cap_l, cap_g, wall))
+    for row in plan.rounds:
+        if cap_l is not None:
+            assert row["label_dollars"] <= cap_l
+        if cap_g is not None:
+            assert row["gpu_dollars"] <= cap_g
+        if wall is not None:
+            assert row["wall_clock_hours"] <= wall
+    assert plan.final["cum_label_dollars"] + plan.final["cum_gpu_dollars"] <= 5
+
+
+def test_final_only_weight_reduces_to_static_split():
+    plan = plan_rounds(**BASE, budget=200, rounds=4, round_weights=[0, 0, 0, 1], step=1)
+    static = optimise_budget(**BASE, budget=200)
+    assert plan.final["accuracy"] == pytest.approx(static["accuracy"])
+
+
+def test_zero_budget_spends_nothing():
+    plan = plan_rounds(**BASE, budget=0, rounds=3)
+    assert len(plan.rounds) == 3 and plan.objective == 0.0
+    for row in plan.rounds:
+        assert row["label_dollars"] == row["gpu_dollars"] == 0.0
+        assert row["labels"] == row["gpu_hours"] == row["accuracy"] == 0.0
+    with pytest.raises(ValueError, match="budget"):
+        plan_rounds(**BASE, budget=-1, rounds=3)
+
+
+def test_twenty_rounds_ten_thousand_dollars_is_fast():
+    t0 = time.perf_counter()
+    plan = plan_rounds(**BASE, budget=10_000, rounds=20, max_label_dollars_per_round=800,
+                       wall_clock_limit_hours=5_000)
+    assert time.perf_counter() - t0 < 1.0
+    assert len(plan.rounds) == 20
+    spent = [r["cum_label_dollars"] + r["cum_gpu_dollars"] for r in plan.rounds]
+    assert spent == sorted(spent) and spent[-1] <= 10_000 + 1e-6
@@ -0,0 +1,137 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cucal.optimizer import optimise_budget
+from cucal.serve import _MAX_BODY, normalise, run_batch, start_server
+
+PARAMS = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    curve_label={"a": 0.73, "b": 0.48},
+    curve_gpu={"a": 0.69, "b": 0.44},
+)
+
+
+async def _post(port, path, payload):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+async def _raw(port, request):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    data = await reader.read()
+    writer.close()
+    return int(data.split()[1])
+
+
+def test_batch_groups_budgets_into_one_frontier():
+    items = [("optimise", {**PARAMS, "budget": b}) for b in (50, 100, 150)]
+    for (ok, plan), b in zip(run_batch(items), (50, 100, 150)):
+        assert ok and plan == optimise_budget(**PARAMS, budget=b)
+
+
+def test_service_coalesces_and_validates():
+    async def scenario():
+        server, app = await start_server(
+            port=0, executor=ThreadPoolExecutor(2), window=0.02
+        )
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            answers = await asyncio.gather(
+                *[_post(port, "/optimise", {**PARAMS, "budget": 100}) for _ in range(5)],
+                _post(port, "/optimise", {**PARAMS, "budget": 60}),
+                _post(port, "/optimise", {"bogus": 1}),
+            )
+        return answers, app.batcher.stats
+
+    answers, stats = asyncio.run(scenario())
+    expected = optimise_budget(**PARAMS, budget=100)
+    for status, plan in answers[:5]:
+        assert status == 200 and plan["accuracy"] == expected["accuracy"]
+    assert answers[5][0] == 200
+    assert answers[6][0] == 400
+    assert stats["coalesced"] == 4
+    assert stats["batches"] == 1
+
+
+def test_failed_group_is_logged_and_retried_singly(caplog):
+    items = [("optimise", {**PARAMS, "budget": b}) for b in (50, "lots")]
+    with caplog.at_level("WARNING", logger="cucal.serve"):
+        (ok_good, plan), (ok_bad, err) = run_batch(items)
+    assert ok_good and plan == optimise_budget(**PARAMS, budget=50)
+    assert not ok_bad and isinstance(err, str)
+    assert "solving them singly" in caplog.text
+
+
+def test_status_codes_separate_client_and_server_faults():
+    async def scenario():
+        broken = ThreadPoolExecutor(1)
+        broken.shutdown()                               # every submit now fails
+        server, _ = await start_server(port=0, executor=broken, window=0.001)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(
+                _post(port, "/optimise", {"label_cost": 0.05, "gpu_cost": 1.0}),
+                _post(port, "/frontier", {**PARAMS}),
+                _raw(port, b"POST /optimise HTTP/1.1\r\nContent-Length: ten\r\n\r\n"),
+                _post(port, "/optimise", {**PARAMS, "budget": 100}),
+            )
+
+    (missing, _), (no_budgets, _), bad_length, (crashed, body) = asyncio.run(scenario())
+    assert missing == 400 and no_budgets == 400 and bad_length == 400
+    assert crashed == 500 and "RuntimeError" in body["error"]
+
+
+def test_negative_budget_answers_null():
+    items = [("optimise", {**PARAMS, "budget": -1}), ("frontier", {**PARAMS, "budgets": [-5]})]
+    (ok_one, plan), (ok_many, plans) = run_batch(items)
+    assert ok_one and plan is None
+    assert ok_many and plans == [None]
+
+
+@pytest.mark.parametrize("kind, field, value", [
+    ("optimise", "budget", "lots"),
+    ("optimise", "gamma", 0),
+    ("optimise", "granularity", 2.5),
+    ("optimise", "label_cost", None),
+    ("optimise", "curve_gpu", [0.69, 0.44]),
+    ("frontier", "budgets", [10, "x"]),
+    ("allocate", "demand", "much"),
+])
+def test_field_types_are_checked_up_front(kind, field, value):
+    payload = {**PARAMS, "budget": 100, "budgets": [100]} if kind != "allocate" else \
+        {"demand": 5, "resource_ids": ["gpu"], "capacities": {"gpu": 10}}
+    payload.pop("budget" if kind == "frontier" else "budgets", None)
+    payload[field] = value
+    with pytest.raises(ValueError, match=field):
+        normalise(kind, payload)
+    assert normalise("optimise", {**PARAMS, "budget": "100"})["budget"] == 100.0
+
+
+def test_oversized_lines_are_rejected_and_closed():
+    async def scenario():
+        server, _ = await start_server(port=0, executor=ThreadPoolExecutor(1))
+        port = server.sockets[0].getsockname()[1]
+        long = b"x" * (_MAX_BODY + 1)
+        async with server:
+            return await asyncio.gather(
+                _raw(port, b"GET /" + long + b" HTTP/1.1\r\n\r\n"),
+                _raw(port, b"GET /health HTTP/1.1\r\nX-Big: " + long + b"\r\n\r\n"),
+                _post(port, "/optimise", {**PARAMS, "budget": "lots"}),
+            )
+
+    line, header, (bad_type, body) = asyncio.run(scenario())
+    assert line == 400 and header == 431
+    assert bad_type == 400 and "budget" in body["error"]
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from cucal.optimizer import budget_frontier_table
+from cucal.store import ResultStore, ingest_sweep
+from cucal.sweep import SweepSpec, run_sweep
+
+CURVES = dict(curve_label={"a": 0.73, "b": 0.048}, curve_gpu={"a": 0.69, "b": 0.044})
+WHERE = [("wall_clock_hours", "<", 48), ("accuracy", ">", 0.6)]
+
+
+def _random(n, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "budget": rng.uniform(0, 5000, n),
+        "accuracy": rng.uniform(0, 1, n),
+        "wall_clock_hours": rng.uniform(0, 100, n),
+        "labels": rng.integers(0, 10_000, n),
+    }
+
+
+def test_query_matches_brute_force(tmp_path):
+    store = ResultStore(tmp_path, budget_bucket=1000)
+    data = {c: _random(20_000, seed) for seed, c in enumerate(("a", "b"))}
+    for case, cols in data.items():
+        assert store.append(cols, case=case) == 20_000
+    assert len(store) == 40_000 and store.cases() == ["a", "b"]
+    assert len(list(tmp_path.glob("case=a/bucket=*"))) == 5
+
+    where = WHERE + [("budget", ">=", 3500)]
+    got = store.query(["accuracy", "labels"], where, chunk_rows=4096)
+    assert set(got) == {"accuracy", "labels", "case"}
+    expected = sum(
+        int(np.count_nonzero((d["wall_clock_hours"] < 48) & (d["accuracy"] > 0.6)
+                             & (d["budget"] >= 3500)))
+        for d in data.values()
+    )
+    assert got["accuracy"].size == expected == store.count(where)
+    assert np.all(got["accuracy"] > 0.6)
+
+    best = store.best_per_case(WHERE, chunk_rows=4096)
+    for case, d in data.items():
+        mask = (d["wall_clock_hours"] < 48) & (d["accuracy"] > 0.6)
+        i = np.flatnonzero(mask)[np.argmax(d["accuracy"][mask])]
+        assert best[case]["accuracy"] == d["accuracy"][i]
+        assert best[case]["labels"] == d["labels"][i]
+
+
+def test_pruning_skips_parts_by_partition_and_stats(tmp_path):
+    store = ResultStore(tmp_path, budget_bucket=100)
+    store.append({"budget": np.arange(0, 300.0), "accuracy": np.linspace(0, 0.9, 300)},
+                 case="x")
+    assert len(list(store._candidates([("budget", "<", 100)], None))) == 1
+    assert len(list(store._candidates([("accuracy", ">", 0.85)], None))) == 1
+    assert list(store._candidates([], ["y"])) == []
+    empty = store.query(where=[("accuracy", ">", 2)])
+    assert set(empty) == {"budget", "accuracy", "case"}
+    assert all(v.size == 0 for v in empty.values())
+    assert empty["accuracy"].dtype == np.float64 and empty["case"].dtype.kind == "U"
+    with pytest.raises(ValueError):
+        store.query(where=[("accuracy", "~", 1)])
+
+
+def test_plan_tables_and_sweeps_round_trip(tmp_path):
+    budgets = list(range(0, 400, 10))
+    table = budget_frontier_table(budgets, label_cost=0.05, gpu_cost=1.0, **CURVES)
+    store = ResultStore(tmp_path / "store", budget_bucket=100)
+    store.append(table, case="demo")
+    best = store.best_per_case([("budget", "<=", 200)])["demo"]
+    ref = table.columns["accuracy"][:21]
+    assert best["accuracy"] == np.nanmax(ref)
+
+    spec = SweepSpec(base={"label_cost": 0.05, "case": "Dragut-2019"},
+                     axes={"gpu_cost": [1.0, 2.0], "budget": budgets}, shard_size=16)
+    run_sweep(spec, tmp_path / "sweep")
+    assert ingest_sweep(tmp_path / "sweep", store) == spec.size
+    assert store.cases() == ["Dragut-2019", "demo"]
+    got = store.query(["gpu_cost", "scenario"], cases=["Dragut-2019"])
+    assert sorted(got["scenario"].tolist()) == list(range(spec.size))
+
+    # plan-table parts lack the sweep's axis columns: NaN-filled, equal lengths
+    mixed = store.query(where=[("budget", "<", 100)])
+    assert {"gpu_cost", "scenario", "accuracy", "case"} <= set(mixed)
+    assert len({v.size for v in mixed.values()}) == 1
+    demo = mixed["case"] == "demo"
+    assert demo.sum() == 10 and np.isnan(mixed["gpu_cost"][demo]).all()
+    assert not np.isnan(mixed["gpu_cost"][~demo]).any()
+    assert store.count([("gpu_cost", ">", 0)]) == spec.size
+    assert set(store.best_per_case(columns=["gpu_cost"])) == {"Dragut-2019", "demo"}
+    with pytest.raises(ValueError, match="nope"):
+        store.query(["accuracy", "nope"])
+
+
+def test_large_budgets_keep_exact_partition_bounds(tmp_path):
+    store = ResultStore(tmp_path, budget_bucket=1)
+    budgets = np.array([1_000_001.0, 1_000_002.0, 123_456_789.0])
+    store.append({"budget": budgets, "accuracy": [0.5, 0.6, 0.7]}, case="big")
+    assert len(list(tmp_path.glob("case=big/bucket=*"))) == 3
+    assert store.count([("budget", ">=", 1_000_001)]) == 3
+    assert store.count([("budget", "==", 1_000_002)]) == 1
+    assert store.count([("budget", "<", 1_000_002)]) == 1
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from cucal.optimizer import optimise_budget
+import cucal.sweep as sweep
+from cucal.sweep import SweepSpec, _lock_path, iter_shards, merge_sweep, run_sweep, sweep_status
+
+BASE = dict(
+    label_cost=0.05,
+    curve_label={"a": 0.73, "b": 0.048},
+    curve_gpu={"a": 0.69, "b": 0.044},
+)
+
+
+def _spec(**kw):
+    axes = {"gpu_cost": [1.0, 2.0], "wall_clock_limit_hours": [None, 40],
+            "budget": list(range(0, 200, 20))}
+    return SweepSpec(base=BASE, axes=axes, shard_size=kw.pop("shard_size", 7), **kw)
+
+
+def test_scenarios_are_deterministic():
+    spec = _spec()
+    assert spec.size == 40 and spec.n_shards == 6
+    assert spec.scenario(0) == {"gpu_cost": 1.0, "wall_clock_limit_hours": None, "budget": 0}
+    assert spec.scenario(39) == {"gpu_cost": 2.0, "wall_clock_limit_hours": 40, "budget": 180}
+    assert _spec().digest() == spec.digest()
+
+
+def test_resume_and_merge(tmp_path):
+    spec = _spec()
+    assert run_sweep(spec, tmp_path, max_shards=2) == 2          # "pre-empted"
+    assert sweep_status(tmp_path)["done"] == 2
+    assert run_sweep(spec, tmp_path) == 4                          # restart skips work
+    assert run_sweep(spec, tmp_path) == 0
+    assert sweep_status(tmp_path)["complete"]
+
+    rows = merge_sweep(tmp_path, tmp_path / "out.csv")
+    df = pd.read_csv(tmp_path / "out.csv")
+    assert rows == len(df) == spec.size
+    assert df["scenario"].tolist() == list(range(spec.size))
+    for i in (0, 13, 27, 39):
+        sc = spec.scenario(i)
+        plan = optimise_budget(**BASE, **sc)
+        row = df.iloc[i]
+        if plan is None:
+            assert not row["feasible"]
+        else:
+            assert row["accuracy"] == pytest.approx(plan["accuracy"])
+            assert row["label_dollars"] == plan["label_dollars"]
+
+
+def test_concurrent_workers_share_directory(tmp_path):
+    spec = _spec(shard_size=3)
+    counts = []
+    workers = [
+        threading.Thread(target=lambda i=i: counts.append(
+            run_sweep(spec, tmp_path, worker_id=f"w{i}")))
+        for i in range(4)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert sum(counts) == spec.n_shards
+    assert sum(len(t) for t in iter_shards(tmp_path)) == spec.size
+    assert not os.listdir(tmp_path / "locks")
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    spec = _spec()
+    run_sweep(spec, tmp_path, max_shards=0)
+    lock = _lock_path(tmp_path, 0)
+    lock.write_text("dead-host 0\n")
+    assert run_sweep(spec, tmp_path, stale_after=3600) == spec.n_shards - 1
+    old = time.time() - 7200
+    os.utime(lock, (old, old))
+    assert run_sweep(spec, tmp_path, stale_after=3600) == 1
+    assert sweep_status(tmp_path)["complete"]
+
+
+def test_long_shard_keeps_its_lock_fresh(tmp_path, monkeypatch):
+    spec = _spec(shard_size=100)                                # a single shard
+    solve = sweep._solve_shard
+    started = threading.Event()
+
+    def slow_solve(spec, k):
+        started.set()
+        time.sleep(0.8)                                         # >> stale_after
+        return solve(spec, k)
+
+    monkeypatch.setattr(sweep, "_solve_shard", slow_solve)
+    worker = threading.Thread(target=run_sweep, args=(spec, tmp_path),
+                              kwargs={"worker_id": "slow", "stale_after": 0.2})
+    worker.start()
+    started.wait()
+    time.sleep(0.5)
+    assert not sweep._try_claim(_lock_path(tmp_path, 0), "other", 0.2)
+    worker.join()
+    assert sweep_status(tmp_path)["complete"]
+
+
+def test_refuses_other_spec_in_same_directory(tmp_path):
+    run_sweep(_spec(), tmp_path, max_shards=1)
+    with pytest.raises(ValueError, match="different sweep"):
+        run_sweep(_spec(shard_size=5), tmp_path)
+
+
+def test_parquet_merge(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    spec = _spec()
+    run_sweep(spec, tmp_path)
+    assert merge_sweep(tmp_path, tmp_path / "out.parquet") == spec.size
+    assert pq.read_table(tmp_path / "out.parquet").num_rows == spec.size
+
+
+def test_stalled_worker_cannot_refresh_or_release_a_taken_over_lock(tmp_path):
+    lock = tmp_path / "shard.lock"
+    old = sweep._try_claim(lock, "stalled", 3600)
+    past = time.time() - 7200
+    os.utime(lock, (past, past))                          # holder went quiet
+    new = sweep._try_claim(lock, "successor", 3600)
+    assert old and new and new != old
+
+    with sweep._Heartbeat(lock, old, 0.01) as beat:
+        time.sleep(0.1)
+    assert beat.lost
+    sweep._release(lock, old)                             # the stalled worker's finally
+    assert lock.read_text() == new                        # successor still holds it
+    assert sweep._try_claim(lock, "third", 3600) is None
+    sweep._release(lock, new)
+    assert os.listdir(tmp_path) == []
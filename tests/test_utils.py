@@ -0,0 +1,39 @@
+import numpy as np
+
+from cucal.utils import (
+    marginal_gain,
+    marginal_gain_array,
+    parse_curve,
+    parse_curve_array,
+    read_curve_file,
+)
+
+
+def test_parse_curve_array_matches_scalar_parser():
+    cell = "0:0.58; 30:0.72 ;;60:0.80"
+    x, y, report = parse_curve_array(cell)
+    assert list(zip(x, y)) == parse_curve(cell)
+    assert report.ok and report.n_points == 3
+
+
+def test_parse_curve_array_reports_bad_segments():
+    x, y, report = parse_curve_array(["0:0.5;oops;2:x", "3:0.9;4:1:2"])
+    np.testing.assert_array_equal(x, [0.0, 3.0])
+    assert report.n_errors == 3
+    assert report.error_positions == [1, 2, 4]
+    assert report.error_samples == ["oops", "2:x", "4:1:2"]
+
+
+def test_read_curve_file_streams_across_chunks(tmp_path):
+    path = tmp_path / "points.txt"
+    path.write_text("0:0.1;10:0.2\n20:0.3;bad\n30:0.4;")
+    x, y, report = read_curve_file(path, chunk_size=5)
+    np.testing.assert_array_equal(x, [0, 10, 20, 30])
+    np.testing.assert_array_equal(y, [0.1, 0.2, 0.3, 0.4])
+    assert report.n_errors == 1 and report.error_positions == [3]
+
+
+def test_marginal_gain_array_matches_list_version():
+    x, y = [0.0, 10.0, 30.0], [0.5, 0.6, 0.7]
+    xs, gains = marginal_gain_array(x, y)
+    assert list(zip(xs, gains)) == marginal_gain(x, y)
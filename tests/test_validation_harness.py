@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+
+from cucal.validate import load_points, run_validation
+
+HEADER = "case,budget,time_hours,efficiency,gamma,reported_accuracy,tolerance,source\n"
+
+
+def test_bundled_points_pass():
+    points = load_points()
+    assert any(p.case == "Dragut-2019" for p in points)
+    report = run_validation(points, workers=1)
+    assert report["summary"]["failed"] == 0
+
+
+def test_parallel_report_keeps_order_and_flags_failures(tmp_path):
+    rows = [
+        "Dragut-2019,1500,24,1.0,15,0.785,0.15,",
+        "Kang2023,800,,0.9,5,0.10,0.01,deliberately wrong",
+        "Stiennon2021,300,48,1.0,5,0.85,0.2,",
+        "Dragut-2019,1500,0,1.0,15,0.785,0.15,zero time",
+    ]
+    path = tmp_path / "points.csv"
+    path.write_text(HEADER + "\n".join(rows) + "\n")
+    report = run_validation(load_points(path), workers=2)
+    cases = [r["case"] for r in report["points"]]
+    assert cases == ["Dragut-2019", "Kang2023", "Stiennon2021", "Dragut-2019"]
+    assert report["points"][0]["passed"]
+    assert not report["points"][1]["passed"] and report["points"][1]["delta"] > 0
+    assert report["points"][1]["time_hours"] is None
+    assert report["summary"]["n_points"] == 4
+    assert all(r["seconds"] >= 0 for r in report["points"])
+    json.dumps(report)                                   # machine-readable
+
+
+def test_cli_all_writes_report(tmp_path):
+    out = tmp_path / "report.json"
+    result = subprocess.run(
+        [sys.executable, "-m", "cucal.validate", "all", "--workers", "1", "--report", str(out)],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert json.loads(out.read_text())["summary"]["passed"] >= 1
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from cucal.optimizer import budget_frontier, optimise_budget
+from cucal.planner import Planner
+from cucal.serve import normalise
+from cucal.wall_clock import WallClockModel
+
+BASE = dict(
+    label_cost=0.05,
+    gpu_cost=1.0,
+    curve_label={"a": 0.73, "b": 0.0048},
+    curve_gpu={"a": 0.69, "b": 0.044},
+    gamma=5,
+)
+
+
+def test_default_model_reproduces_sequential_formula():
+    rng = random.Random(1)
+    for _ in range(20):
+        kw = dict(BASE, budget=rng.randint(10, 300),
+                  wall_clock_limit_hours=rng.choice([None, 20, 80, 200]),
+                  cluster_efficiency_pct=rng.choice([50, 90, 100]))
+        assert optimise_budget(**kw, wall_clock_model=WallClockModel()) == optimise_budget(**kw)
+
+
+def test_stage_formula():
+    m = WallClockModel(annotators=2, gpus=4, parallel_fraction=0.9, overlap=1.0)
+    t_label, t_train = m.stage_hours(100, 10, gamma=5, efficiency=0.5)
+    assert t_label == 10
+    assert t_train == pytest.approx(20 / (1 / (0.1 + 0.9 / 4)))
+    assert m.hours(100, 10, 5, 0.5) == pytest.approx(max(t_label, t_train))
+    half = WallClockModel(overlap=0.5)
+    assert half.hours(100, 10, 5, 1.0) == pytest.approx(20 + 10 - 5)
+    assert WallClockModel(gpus=8, scaling=lambda n: 0.75).speedup() == 6
+    with pytest.raises(ValueError):
+        WallClockModel(overlap=1.5)
+
+
+def test_parallel_pipeline_unlocks_shorter_calendar_plans():
+    kw = dict(BASE, budget=300, wall_clock_limit_hours=60)
+    sequential = optimise_budget(**kw)
+    model = WallClockModel(annotators=4, gpus=2, overlap=0.8)
+    parallel = optimise_budget(**kw, wall_clock_model=model)
+    assert parallel["accuracy"] > sequential["accuracy"]
+    assert parallel["wall_clock_hours"] <= 60
+    # …and the chosen plan is one the sequential formula rules out
+    seq_hours = parallel["gpu_hours"] / 0.9 + parallel["labels"] / 5
+    assert seq_hours > 60
+    kw.pop("budget")
+    assert budget_frontier([300], **kw, wall_clock_model=model) == [parallel]
+
+
+def test_planner_and_service_accept_model():
+    model = WallClockModel(annotators=3, overlap=0.5)
+    kw = dict(BASE, budget=200, wall_clock_limit_hours=50)
+    planner = Planner(**kw)
+    planner.solve()
+    assert planner.solve(wall_clock_model=model) == optimise_budget(**kw, wall_clock_model=model)
+    assert planner.last_mode == "full"
+    params = normalise("optimise", {**kw, "wall_clock_model": {"annotators": 3, "overlap": 0.5}})
+    assert params["wall_clock_model"] == model
+
+
+def test_sublinear_scaling_is_charged_not_free():
+    kw = dict(BASE, budget=200)
+    linear = optimise_budget(**kw, wall_clock_model=WallClockModel(gpus=4))
+    amdahl = WallClockModel(gpus=4, parallel_fraction=0.9)
+    lossy = optimise_budget(**kw, wall_clock_model=amdahl)
+    plain = optimise_budget(**kw)                          # linear scaling costs nothing
+    for key in ("accuracy", "gpu_hours", "label_dollars", "gpu_dollars"):
+        assert linear[key] == plain[key]
+    share = amdahl.speedup() / 4
+    assert lossy["gpu_hours"] == pytest.approx(lossy["gpu_dollars"] / BASE["gpu_cost"] * share)
+    assert amdahl.device_hours(lossy["gpu_hours"]) == pytest.approx(lossy["gpu_dollars"])
+    assert lossy["accuracy"] < linear["accuracy"]
+    # the GPU-hour cap is on effective compute, so it takes more dollars to hit
+    capped = optimise_budget(**kw, max_gpu_hours=10, wall_clock_model=amdahl)
+    assert capped["gpu_hours"] <= 10 + 1e-9 and capped["gpu_dollars"] > 10